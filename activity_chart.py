@@ -0,0 +1,257 @@
+import matplotlib.style
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator, FuncFormatter
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from chart_data import BarIndex
+
+# --- Colors for Graph ---
+CARD_COLOR = "#1C1C1E"
+GRID_COLOR = "#3A3A3C"
+LABEL_COLOR = "#8E8E93"
+ACCENT_COLORS = ["#5E81AC", "#88C0D0", "#A3BE8C", "#EBCB8B", "#D08770", "#B48EAD"] # Nord Palette (Soft Blue, Cyan, Green, Yellow, Orange, Purple)
+
+BAR_WIDTH = 0.5
+MAX_TICKS = 12
+MIN_VISIBLE_BARS = 3 # Zoom-in limit
+ZOOM_STEP = 0.8
+
+class ActivityChart:
+    """Stacked "minutes per day" bar chart, built once and updated in place.
+
+    Uses the object-oriented Figure API (no pyplot), so no figures pile up in
+    pyplot's global registry. `update` only moves existing bar artists and
+    relabels ticks; new artists are created when a day has more workouts than
+    any before it or the number of days changes. The wheel zooms and a drag
+    pans along the x axis.
+    """
+
+    def __init__(self, master):
+        self.figure = Figure(figsize=(5, 3), dpi=100)
+        self.figure.patch.set_facecolor(CARD_COLOR)
+
+        # --- Modern Graph Styling ---
+        with matplotlib.style.context('dark_background'):
+            self.ax = self.figure.add_subplot()
+        ax = self.ax
+        ax.set_facecolor(CARD_COLOR)
+        ax.set_xlabel("Date", fontsize=8, color=LABEL_COLOR)
+        ax.set_ylabel("Minutes", fontsize=8, color=LABEL_COLOR)
+        self.title = ax.set_title("Daily Activity", fontsize=10, color="white", fontweight="bold", pad=15)
+
+        # Grid
+        ax.grid(color=GRID_COLOR, linestyle=':', linewidth=0.5, axis='y', alpha=0.5)
+        ax.set_axisbelow(True)
+
+        # Spines
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_color(GRID_COLOR)
+        ax.spines['bottom'].set_color(GRID_COLOR)
+
+        ax.tick_params(axis='x', colors=LABEL_COLOR, rotation=0, labelsize=7)
+        ax.tick_params(axis='y', colors=LABEL_COLOR, labelsize=7)
+
+        # At most MAX_TICKS labelled bars, re-picked as the view zooms
+        self.labels = []
+        ax.xaxis.set_major_locator(MaxNLocator(nbins=MAX_TICKS, integer=True))
+        ax.xaxis.set_major_formatter(FuncFormatter(self._tick_label))
+
+        # --- Hover Annotation ---
+        self.annot = ax.annotate("", xy=(0, 0), xytext=(10, 10), textcoords="offset points",
+                                 bbox=dict(boxstyle="round", fc=CARD_COLOR, ec="white", alpha=0.9),
+                                 arrowprops=dict(arrowstyle="->", color="white"),
+                                 color="white", fontsize=9)
+        self.annot.set_visible(False)
+        self.hovered = None
+
+        self.layers = [] # One BarContainer per stack level ("WO 1", "WO 2", ...)
+        self.slots = 0 # Number of days (bars per layer)
+        self.depth = 0 # Stack levels in use
+        self.notes = [] # notes[layer][slot]
+        self.index = BarIndex([], [], BAR_WIDTH)
+        self.stacked = True
+        self.drag = None # (start x in pixels, xlim) while panning
+
+        # Embed in Tkinter
+        self.canvas = FigureCanvasTkAgg(self.figure, master=master)
+        self.widget = self.canvas.get_tk_widget()
+        self.canvas.mpl_connect("motion_notify_event", self._on_motion)
+        self.canvas.mpl_connect("scroll_event", self._on_scroll)
+        self.canvas.mpl_connect("button_press_event", self._on_press)
+        self.canvas.mpl_connect("button_release_event", self._on_release)
+
+    def update(self, days, labels=None, title="Daily Activity", stacked=True):
+        """Shows `days`: [(key, daily_rollup), ...] oldest first (see rollups.py, chart_data.range_series).
+
+        daily_rollup["workouts"]: [[duration_min, notes], ...]. Ticks show
+        `labels` (default: MM-DD from date keys). `stacked` bars are one
+        segment per workout ("WO1- notes" on hover); otherwise one total per bar.
+        """
+        if len(days) != self.slots:
+            self._reset_slots(len(days))
+
+        stacks = [row["workouts"] for _, row in days]
+        self.depth = max((len(w) for w in stacks), default=0)
+        while len(self.layers) < self.depth:
+            self._add_layer()
+
+        # Restack every layer; layers deeper than today's max are flattened to 0
+        bottom = [0.0] * self.slots
+        self.notes = []
+        for i, layer in enumerate(self.layers):
+            notes = []
+            for j, rect in enumerate(layer):
+                minutes, note = stacks[j][i] if i < len(stacks[j]) else (0, "")
+                rect.set_y(bottom[j])
+                rect.set_height(minutes)
+                bottom[j] += minutes
+                notes.append(note)
+            self.notes.append(notes)
+        self.index = BarIndex(range(self.slots), [[w[0] for w in day] for day in stacks], BAR_WIDTH)
+
+        ax = self.ax
+        self.labels = labels if labels is not None else [d[5:] for d, _ in days] # Show MM-DD
+        self.stacked = stacked
+        self.title.set_text(title)
+        ax.set_xlim(-0.5, self.slots - 0.5)
+        ax.set_ylim(0, max(bottom, default=0) * 1.05 or 1)
+        self._update_legend()
+
+        self._hide_annot()
+        self.figure.tight_layout()
+        self.canvas.draw_idle()
+
+    def add_to_last_day(self, minutes, notes):
+        """Stacks one more workout on the newest day, touching only that bar's artists."""
+        slot = self.slots - 1
+        level = len(self.index.tops[slot])
+        bottom = self.index.tops[slot][-1] if level else 0
+        if level == len(self.layers):
+            self._add_layer()
+
+        rect = self.layers[level][slot]
+        rect.set_y(bottom)
+        rect.set_height(minutes)
+        self.notes[level][slot] = notes
+        self.index.push(slot, minutes)
+
+        if level >= self.depth:
+            self.depth = level + 1
+            self._update_legend()
+        top = (bottom + minutes) * 1.05
+        if top > self.ax.get_ylim()[1]:
+            self.ax.set_ylim(0, top)
+
+        self._hide_annot()
+        self.canvas.draw_idle()
+
+    def _tick_label(self, x, pos):
+        i = int(round(x))
+        return self.labels[i] if i == x and 0 <= i < len(self.labels) else ""
+
+    def _update_legend(self):
+        # Remove legend to keep it clean if too many, or style it
+        legend = self.ax.get_legend()
+        if legend:
+            legend.remove()
+        if self.stacked and self.depth > 1:
+            self.ax.legend(handles=self.layers[:self.depth], frameon=False, fontsize=7, labelcolor=LABEL_COLOR)
+
+    def _reset_slots(self, slots):
+        for layer in self.layers:
+            layer.remove()
+        self.layers = []
+        self.slots = slots
+
+    def _add_layer(self):
+        i = len(self.layers)
+        color = ACCENT_COLORS[i % len(ACCENT_COLORS)]
+        zeros = [0] * self.slots
+        bars = self.ax.bar(range(self.slots), zeros, bottom=zeros, label=f'WO {i+1}', color=color,
+                           alpha=0.9, width=BAR_WIDTH, edgecolor=CARD_COLOR, linewidth=0.5)
+        self.layers.append(bars)
+        self.notes.append([""] * self.slots)
+
+    # --- Hover ---
+
+    def _hide_annot(self):
+        self.annot.set_visible(False)
+        self.hovered = None
+
+    def _update_annot(self, bar, notes, wo_idx):
+        x = bar.get_x() + bar.get_width() / 2.
+        y = bar.get_y() + bar.get_height() / 2.
+        self.annot.xy = (x, y)
+        self.annot.set_text(f"WO{wo_idx}- {notes}" if self.stacked else notes)
+
+        # Dynamic positioning to avoid cutoff:
+        # if we are in the right half of the graph, shift text to the left
+        x_min, x_max = self.ax.get_xlim()
+        if x > (x_min + (x_max - x_min) / 2):
+            self.annot.xyann = (-10, 10)
+            self.annot.set_horizontalalignment('right')
+        else:
+            self.annot.xyann = (10, 10)
+            self.annot.set_horizontalalignment('left')
+
+    def _on_motion(self, event):
+        if self.drag:
+            self._pan(event)
+        else:
+            self._hover(event)
+
+    def _hover(self, event):
+        found = None
+        if event.inaxes == self.ax:
+            # Which bar we are hovering over, as (layer, slot)
+            found = self.index.find(event.xdata, event.ydata)
+
+        if found:
+            # If it's a new bar, update the annotation; same bar needs nothing
+            if found != self.hovered:
+                i, j = found
+                self._update_annot(self.layers[i][j], self.notes[i][j], i + 1)
+                self.annot.set_visible(True)
+                self.hovered = found
+                self.canvas.draw_idle()
+        elif self.annot.get_visible():
+            self._hide_annot()
+            self.canvas.draw_idle()
+
+    # --- Zoom & Pan ---
+
+    def _set_view(self, left, width):
+        # Keep the view inside the bars and at least MIN_VISIBLE_BARS wide
+        full = self.slots
+        width = min(max(width, min(MIN_VISIBLE_BARS, full)), full)
+        left = min(max(left, -0.5), full - 0.5 - width)
+        if (left, left + width) == tuple(self.ax.get_xlim()):
+            return
+        self.ax.set_xlim(left, left + width)
+        self._hide_annot()
+        self.canvas.draw_idle()
+
+    def _on_scroll(self, event):
+        if event.inaxes != self.ax or not self.slots:
+            return
+        x_min, x_max = self.ax.get_xlim()
+        factor = ZOOM_STEP if event.button == "up" else 1 / ZOOM_STEP
+        width = (x_max - x_min) * factor
+        # Zoom around the cursor
+        left = event.xdata - (event.xdata - x_min) * factor
+        self._set_view(left, width)
+
+    def _on_press(self, event):
+        if event.inaxes == self.ax and event.button == 1:
+            self.drag = (event.x, self.ax.get_xlim())
+
+    def _on_release(self, event):
+        self.drag = None
+
+    def _pan(self, event):
+        start_x, (x_min, x_max) = self.drag
+        pixels = self.ax.bbox.width
+        if event.x is None or not pixels:
+            return
+        shift = (event.x - start_x) / pixels * (x_max - x_min)
+        self._set_view(x_min - shift, x_max - x_min)
@@ -0,0 +1,121 @@
+import datetime
+import numpy as np
+import storage
+import history_cache
+
+# Training analytics over the columnar history cache (history_cache.py).
+# Everything is a vectorized reduction over the typed columns, and results are
+# cached per profile until the history changes (next save, import or compaction).
+
+ROLLING_WEEKS = 4
+CONSISTENCY_WEEKS = 12
+
+# profile_name -> (history size, today, result)
+_cached = {}
+
+def _week_numbers(days):
+    # Monday-based week index; day 4 (1970-01-05) is the first Monday
+    return (days + 3) // 7
+
+def _week_start(week):
+    return datetime.date(1970, 1, 1) + datetime.timedelta(days=int(week) * 7 - 3)
+
+def _from_epoch(seconds):
+    return (datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=float(seconds))).isoformat()
+
+def _streaks(days, today_day):
+    """(current, longest) runs of consecutive days with at least one session."""
+    unique = np.unique(days[days <= today_day]) # Future-dated sessions (clock changes, imports) don't count
+    if unique.size == 0:
+        return 0, 0
+    # A new run starts wherever the gap to the previous active day isn't 1
+    breaks = np.flatnonzero(np.diff(unique) != 1) + 1
+    starts = np.concatenate(([0], breaks))
+    lengths = np.diff(np.concatenate((starts, [unique.size])))
+    # The last run is still "current" if it reaches today or yesterday
+    current = int(lengths[-1]) if unique[-1] >= today_day - 1 else 0
+    return current, int(lengths.max())
+
+def _weekly(columns, days, this_week):
+    """Minutes and sessions for every week from the first session to this one.
+
+    Sessions dated after this week are left out, so the series always ends at this week.
+    """
+    weeks = _week_numbers(days)
+    past = weeks <= this_week
+    weeks = weeks[past]
+    first = int(min(weeks.min(), this_week)) if weeks.size else this_week
+    index = weeks - first
+    size = this_week - first + 1
+    minutes = np.bincount(index, weights=columns["duration"][past] / 60.0, minlength=size)
+    sessions = np.bincount(index, minlength=size)
+    return first, minutes, sessions
+
+def _personal_bests(columns):
+    """Most rounds per (work, rest) setting, plus the longest session."""
+    work, rest, rounds = columns["work"], columns["rest"], columns["rounds"]
+    # Sort by setting, then rounds descending; the first row of each setting is its best
+    order = np.lexsort((-rounds, rest, work))
+    w, r = work[order], rest[order]
+    first = np.ones(order.size, dtype=bool)
+    first[1:] = (w[1:] != w[:-1]) | (r[1:] != r[:-1])
+
+    bests = {}
+    for i in order[first]:
+        bests[f"{work[i]}/{rest[i]}"] = {"rounds": int(rounds[i]), "start_time": _from_epoch(columns["start"][i])}
+
+    longest = int(np.argmax(columns["duration"]))
+    return bests, {"minutes": float(columns["duration"][longest]) / 60.0,
+                   "start_time": _from_epoch(columns["start"][longest])}
+
+def compute(profile_name="Default", today=None):
+    """Analytics for a profile.
+
+    Returns {"sessions", "weekly": [(monday_iso, minutes, sessions), ...],
+    "rolling_load": [avg minutes/week over the last ROLLING_WEEKS, per week],
+    "streak": {"current", "longest"} in days, "bests": {"work/rest": {"rounds", "start_time"}},
+    "longest_session": {"minutes", "start_time"} or None,
+    "consistency": % of the last CONSISTENCY_WEEKS weeks (or fewer, for new profiles) with a session}.
+    """
+    today = today or datetime.date.today()
+    size = storage.get_history_size(profile_name)
+    cached = _cached.get(profile_name)
+    if cached and cached[0] == size and cached[1] == today:
+        return cached[2]
+
+    columns = history_cache.load(profile_name)
+    days = history_cache.day_numbers(columns)
+    today_day = (today - datetime.date(1970, 1, 1)).days
+    this_week = int(_week_numbers(np.int64(today_day)))
+
+    result = {"sessions": int(days.size), "weekly": [], "rolling_load": [],
+              "streak": {"current": 0, "longest": 0}, "bests": {},
+              "longest_session": None, "consistency": 0.0}
+    if days.size:
+        first, minutes, sessions = _weekly(columns, days, this_week)
+        rolling = np.convolve(minutes, np.ones(ROLLING_WEEKS))[:minutes.size] / ROLLING_WEEKS
+        result["weekly"] = [(_week_start(first + i).isoformat(), float(m), int(s))
+                            for i, (m, s) in enumerate(zip(minutes, sessions))]
+        result["rolling_load"] = rolling.tolist()
+
+        current, longest = _streaks(days, today_day)
+        result["streak"] = {"current": current, "longest": longest}
+        result["bests"], result["longest_session"] = _personal_bests(columns)
+
+        recent = sessions[-CONSISTENCY_WEEKS:]
+        result["consistency"] = 100.0 * np.count_nonzero(recent) / recent.size
+
+    _cached[profile_name] = (size, today, result)
+    return result
+
+def summary(profile_name="Default", today=None):
+    """One-line dashboard text for the History tab."""
+    stats = compute(profile_name, today)
+    if not stats["sessions"]:
+        return ""
+    parts = [f"Streak: {stats['streak']['current']} days (best {stats['streak']['longest']})",
+             f"4-wk load: {stats['rolling_load'][-1]:.0f} min/wk",
+             f"Consistency: {stats['consistency']:.0f}%"]
+    if stats["longest_session"]:
+        parts.append(f"Longest: {stats['longest_session']['minutes']:.0f} min")
+    return "   ·   ".join(parts)
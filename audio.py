@@ -0,0 +1,255 @@
+import os
+import sys
+import wave
+import shutil
+import statistics
+import subprocess
+import threading
+import time
+
+# Workout cue sounds.
+# One AudioEngine lives for the whole app. It decodes the cue .wavs once on a
+# worker thread and plays them through a persistent output stream, mixing
+# overlapping cues in memory (audio_mixer.py), so a ding costs an append to a
+# queue rather than a thread and a process spawn.
+#
+# Output, in order of preference:
+#   StreamSink  - sounddevice (PortAudio), low-latency callback stream
+#   CommandSink - the old per-cue player (winsound / afplay / paplay / aplay)
+#   NullSink    - silent; used in tests and where no audio output exists
+
+CUE_NAMES = ("Glass", "Hero")
+SYNTH_CUES = {"Beep": (880, 0.12), "Halfway": (660, 0.3)} # name -> (Hz, seconds), generated at load
+REPEAT_GAP = 0.4 # seconds between repeated dings
+NULL_BLOCK_FRAMES = 480 # 10 ms at 48 kHz
+
+def sound_dir():
+    """Folder holding the cue .wavs (inside the bundle when frozen by PyInstaller)."""
+    base_path = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, "sounds")
+
+class _MixingSink:
+    """Base for sinks that play decoded cues through audio_mixer.Mixer."""
+    mixing = True
+
+    def __init__(self):
+        self.mixer = None
+
+    def start(self, sounds):
+        import audio_mixer
+        self.sounds = sounds
+        self.mixer = audio_mixer.Mixer()
+
+    def cue(self, name, delay, key=None):
+        self.mixer.add(self.sounds[name], delay, key)
+
+    def cancel(self, key):
+        self.mixer.cancel(key)
+
+    def onsets(self):
+        return list(self.mixer.onsets) if self.mixer else []
+
+    def close(self):
+        pass
+
+class StreamSink(_MixingSink):
+    """Mixer output through the default device via sounddevice."""
+
+    def start(self, sounds):
+        super().start(sounds)
+        import sounddevice # Optional dependency; ImportError selects another sink
+        self.stream = sounddevice.OutputStream(samplerate=self.mixer.sample_rate, channels=self.mixer.channels,
+                                               dtype="float32", latency="low", callback=self._callback)
+        self.stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        # outputBufferDacTime is when this block's first frame reaches the speaker
+        outdata[:] = self.mixer.mix(frames, time_info.outputBufferDacTime - time_info.currentTime)
+
+    def close(self):
+        self.stream.close()
+
+class NullSink(_MixingSink):
+    """Silent output. Clocked, it drains the mixer in real time on a thread;
+    otherwise the caller pulls blocks with `pull` (tests)."""
+
+    def __init__(self, clocked=True):
+        super().__init__()
+        self.clocked = clocked
+        self.stopped = threading.Event()
+
+    def start(self, sounds):
+        super().start(sounds)
+        if self.clocked:
+            threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        # Paced like a device clock: block k is due at start + k * period
+        period = NULL_BLOCK_FRAMES / self.mixer.sample_rate
+        due = time.perf_counter()
+        while True:
+            due += period
+            if self.stopped.wait(max(0.0, due - time.perf_counter())):
+                return
+            self.mixer.mix(NULL_BLOCK_FRAMES)
+
+    def pull(self, frames=NULL_BLOCK_FRAMES):
+        return self.mixer.mix(frames)
+
+    def close(self):
+        self.stopped.set()
+
+class CommandSink:
+    """Fallback without sounddevice: one platform player call per cue, no mixing."""
+    mixing = False
+
+    def __init__(self, directory, command=None):
+        self.directory = directory
+        self.command = command # e.g. ["afplay"]; None uses winsound
+        self.timers = {} # key -> [threading.Timer] not yet fired; unkeyed cues aren't tracked
+        self.lock = threading.Lock()
+
+    def start(self, sounds):
+        self.sounds = {name: os.path.join(self.directory, f"{name}.wav") for name in CUE_NAMES}
+
+    def cue(self, name, delay, key=None):
+        timer = threading.Timer(max(0.0, delay), self._fire, (key, self.sounds[name]))
+        timer.daemon = True
+        if key is not None:
+            with self.lock:
+                self.timers.setdefault(key, []).append(timer)
+        timer.start()
+
+    def cancel(self, key):
+        with self.lock:
+            timers = self.timers.pop(key, [])
+        for timer in timers:
+            timer.cancel()
+
+    def _fire(self, key, path):
+        if key is not None:
+            with self.lock:
+                timers = self.timers.get(key, [])
+                if threading.current_thread() in timers: # The Timer itself
+                    timers.remove(threading.current_thread())
+                if not timers:
+                    self.timers.pop(key, None)
+        self._play(path)
+
+    def _play(self, path):
+        try:
+            if self.command is None:
+                import winsound
+                winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            else:
+                subprocess.Popen(self.command + [path])
+        except Exception as e:
+            print(f"Error playing sound: {e}")
+
+    def onsets(self):
+        return [] # Not measurable: playback happens in another process
+
+    def close(self):
+        pass
+
+def _command_sink(directory):
+    if sys.platform == 'win32':
+        return CommandSink(directory)
+    for player in ("afplay", "paplay", "aplay"):
+        if shutil.which(player):
+            return CommandSink(directory, [player])
+    return None
+
+class AudioEngine:
+    """Plays workout cues. `play` is cheap and safe from any thread.
+
+    `start()` opens the output on a worker thread; cues requested before it is
+    ready are dropped (the first cue only comes when a workout starts).
+    """
+
+    def __init__(self, directory=None, sink=None):
+        self.directory = directory or sound_dir()
+        self.sink = sink # None picks the best available in start()
+        self.sounds = None # name -> decoded samples, loaded once
+        self.ready = threading.Event()
+        self.keys = set() # Keys of cues already queued, so each keyed cue plays once
+
+    def start(self):
+        threading.Thread(target=self._open, daemon=True).start()
+
+    def _open(self):
+        if self.sink is None:
+            for sink in (StreamSink(), _command_sink(self.directory), NullSink()):
+                if sink and self._try_start(sink):
+                    self.sink = sink
+                    break
+        elif not self._try_start(self.sink):
+            self.sink = NullSink()
+            self._try_start(self.sink)
+        print(f"Audio output: {type(self.sink).__name__}")
+        self.ready.set()
+
+    def _try_start(self, sink):
+        try:
+            if sink.mixing and self.sounds is None:
+                self.sounds = self._load_sounds()
+            sink.start(self.sounds)
+            return True
+        except Exception as e:
+            print(f"Audio output {type(sink).__name__} unavailable: {e}")
+            return False
+
+    def _load_sounds(self):
+        import audio_mixer
+        sounds = {}
+        for name in CUE_NAMES:
+            try:
+                sounds[name] = audio_mixer.load_wav(os.path.join(self.directory, f"{name}.wav"))
+            except (OSError, EOFError, ValueError, wave.Error) as e:
+                print(f"Error loading sound {name}: {e}")
+        for name, (frequency, seconds) in SYNTH_CUES.items():
+            sounds[name] = audio_mixer.tone(frequency, seconds)
+        return sounds
+
+    def play(self, name="Glass", count=1, delay=0.0, key=None):
+        """Plays a cue `count` times, REPEAT_GAP apart, starting `delay` seconds from now.
+
+        A cue with a `key` plays at most once until `cancel()`, so the same cue
+        can be scheduled ahead and requested again when it is due.
+        """
+        if not self.ready.is_set() or (key is not None and key in self.keys):
+            return
+        if name not in self.sink.sounds:
+            return # e.g. synthesized beeps on the system-player fallback
+        if key is not None:
+            self.keys.add(key)
+        for i in range(count):
+            self.sink.cue(name, delay + i * REPEAT_GAP, key)
+
+    def schedule(self, cues, base):
+        """Queues workout Cues whose offsets are relative to perf_counter time `base`."""
+        now = time.perf_counter()
+        for cue in cues:
+            self.play(cue.sound_name, cue.sound_count, base + cue.offset - now, cue.key)
+
+    def cancel(self):
+        """Drops every keyed cue that hasn't started (pause, reset)."""
+        if not self.ready.is_set():
+            return
+        for key in self.keys:
+            self.sink.cancel(key)
+        self.keys.clear()
+
+    def latency_ms(self):
+        """(median, worst) cue onset latency in ms over recent cues, or None if unmeasured."""
+        onsets = self.sink.onsets() if self.ready.is_set() else []
+        if not onsets:
+            return None
+        return statistics.median(onsets) * 1000, max(onsets) * 1000
+
+    def close(self):
+        if self.ready.is_set():
+            latency = self.latency_ms()
+            if latency:
+                print(f"Audio cue latency: median {latency[0]:.1f} ms, worst {latency[1]:.1f} ms")
+            self.sink.close()
@@ -0,0 +1,111 @@
+import wave
+import time
+import collections
+import numpy as np
+import instrumentation
+
+# In-memory cue mixing for audio.py.
+# Cues are decoded once into float32 arrays; the output callback sums every
+# active voice into each block, so overlapping cues need no extra threads or
+# processes. Imported by the audio worker thread, keeping numpy off startup.
+
+SAMPLE_RATE = 48000
+CHANNELS = 2
+
+def load_wav(path, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+    """Decodes a PCM .wav into a (frames, channels) float32 array in [-1, 1]."""
+    with wave.open(path, 'rb') as f:
+        width = f.getsampwidth()
+        file_channels = f.getnchannels()
+        file_rate = f.getframerate()
+        raw = f.readframes(f.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"unsupported sample width {width} in {path}")
+    samples = samples.reshape(-1, file_channels)
+
+    if file_channels != channels:
+        # Mono -> stereo by copying, anything else by averaging down to mono first
+        samples = np.repeat(samples.mean(axis=1, keepdims=True), channels, axis=1)
+    if file_rate != sample_rate:
+        # Linear resampling is fine for short notification sounds
+        count = int(round(len(samples) * sample_rate / file_rate))
+        src = np.arange(len(samples)) / file_rate
+        dst = np.arange(count) / sample_rate
+        samples = np.stack([np.interp(dst, src, samples[:, c]) for c in range(channels)], axis=1)
+    return np.ascontiguousarray(samples, dtype=np.float32)
+
+def tone(frequency, seconds, sample_rate=SAMPLE_RATE, channels=CHANNELS, volume=0.5):
+    """A sine beep with short fades (no clicks), as a (frames, channels) float32 array."""
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = volume * np.sin(2 * np.pi * frequency * t)
+    fade = min(len(t) // 2, int(0.005 * sample_rate))
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade)
+        signal[:fade] *= ramp
+        signal[-fade:] *= ramp[::-1]
+    return np.repeat(signal[:, None], channels, axis=1).astype(np.float32)
+
+class Mixer:
+    """Sums queued cues into output blocks.
+
+    `add` and `cancel` may be called from any thread; `mix` is called from
+    the output thread only. Cues are placed against time.perf_counter(), early
+    by the output latency the device reports, so they are heard on time.
+    Each cue's onset error (when it is heard minus when it was due) is
+    recorded in `onsets`, in seconds; for immediate cues that is the latency.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE, channels=CHANNELS):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.commands = collections.deque() # ("add", samples, due, key) / ("cancel", key), from other threads
+        self.voices = [] # [samples, position, due, key]; position < 0 means not started yet
+        self.onsets = collections.deque(maxlen=200)
+
+    def add(self, samples, delay=0.0, key=None):
+        """Queues a cue to be heard `delay` seconds from now."""
+        self.commands.append(("add", samples, time.perf_counter() + delay, key))
+
+    def cancel(self, key):
+        """Drops cues queued under `key` that haven't started playing."""
+        self.commands.append(("cancel", key))
+
+    def mix(self, frames, output_latency=0.0):
+        """Next `frames` of output; `output_latency` is how long until they are heard."""
+        now = time.perf_counter()
+        while self.commands:
+            command = self.commands.popleft()
+            if command[0] == "add":
+                _, samples, due, key = command
+                # Start early by the output latency; cues already due start at once
+                start = max(0, int(round((due - output_latency - now) * self.sample_rate)))
+                self.voices.append([samples, -start, due, key])
+            else:
+                self.voices = [v for v in self.voices if v[3] != command[1] or v[1] > 0]
+
+        out = np.zeros((frames, self.channels), dtype=np.float32)
+        active = []
+        for voice in self.voices:
+            samples, position, due, key = voice
+            offset = max(0, -position) # First output frame this voice writes to
+            if offset < frames:
+                begin = position + offset
+                count = min(frames - offset, len(samples) - begin)
+                out[offset:offset + count] += samples[begin:begin + count]
+                if begin == 0:
+                    heard = now + offset / self.sample_rate + output_latency
+                    self.onsets.append(heard - due)
+                    instrumentation.record("audio.onset", abs(heard - due))
+            voice[1] = position + frames
+            if voice[1] < len(samples):
+                active.append(voice)
+        self.voices = active
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
@@ -0,0 +1,117 @@
+import bisect
+import datetime
+import itertools
+
+# Plain-Python helpers behind the activity chart (no matplotlib needed).
+
+MAX_BARS = 60 # Upper bound on bars per layer, whatever the range
+
+# Chart ranges in calendar days; "Week" is the last 7 days with workouts, "All" starts at the first workout
+RANGE_DAYS = {"Week": None, "Month": 31, "Quarter": 92, "Year": 365, "All": None}
+
+def _bucket_keys(start, end, key):
+    keys = []
+    day = start
+    while day <= end:
+        k = key(day)
+        if not keys or keys[-1] != k:
+            keys.append(k)
+        day += datetime.timedelta(days=1)
+    return keys
+
+def _totals(keys, table):
+    days = []
+    for k in keys:
+        row = table.get(k)
+        if row and row["sessions"]:
+            sessions = row["sessions"]
+            note = f"{sessions} session{'s' if sessions != 1 else ''}, {row['minutes']:.0f} min"
+            days.append((k, {"workouts": [[row["minutes"], note]]}))
+        else:
+            days.append((k, {"workouts": []}))
+    return days
+
+def _yearly(monthly):
+    """Year totals summed from the monthly rollups."""
+    years = {}
+    for month, row in monthly.items():
+        year = years.setdefault(month[:4], {"sessions": 0, "minutes": 0.0})
+        year["sessions"] += row["sessions"]
+        year["minutes"] += row["minutes"]
+    return years
+
+def range_series(data, range_name, today):
+    """Buckets rollups (see rollups.py) for one chart range.
+
+    Picks the finest granularity (day, week, month, year) that fits in MAX_BARS
+    bars. Days keep one stacked segment per workout; weeks and months are a
+    single total. Returns (title, days, labels, stacked) where days is
+    [(key, {"workouts": [[minutes, note], ...]}), ...] oldest first.
+    """
+    daily = data["daily"]
+    if range_name == "Week":
+        days = [(d, daily[d]) for d in sorted(daily)[-7:]]
+        return "Daily Activity", days, [d[5:] for d, _ in days], True
+
+    span = RANGE_DAYS[range_name]
+    if span is None:
+        start = datetime.date.fromisoformat(min(daily)) if daily else today
+    else:
+        start = today - datetime.timedelta(days=span - 1)
+    start = min(start, today)
+
+    if (today - start).days + 1 <= MAX_BARS:
+        keys = _bucket_keys(start, today, lambda d: d.isoformat())
+        days = [(k, daily.get(k, {"workouts": []})) for k in keys]
+        return "Daily Activity", days, [k[5:] for k in keys], True # MM-DD
+
+    keys = _bucket_keys(start, today, lambda d: d.strftime("%G-W%V"))
+    if len(keys) <= MAX_BARS:
+        return "Weekly Activity", _totals(keys, data["weekly"]), [k[2:] for k in keys], False # YY-Www
+
+    keys = _bucket_keys(start, today, lambda d: d.strftime("%Y-%m"))
+    if len(keys) <= MAX_BARS:
+        return "Monthly Activity", _totals(keys, data["monthly"]), keys, False
+
+    keys = _bucket_keys(start, today, lambda d: str(d.year))
+    return "Yearly Activity", _totals(keys, _yearly(data["monthly"])), keys, False
+
+class BarIndex:
+    """Hit-testing for a stacked bar chart.
+
+    Built alongside the bars: the slot under the cursor is found by bisecting
+    the bar centers, then the stack level by bisecting that slot's cumulative
+    heights, so a mouse-motion event never walks the artists.
+    """
+
+    def __init__(self, centers, stacks, width):
+        # centers: sorted x of each slot; stacks[slot]: segment heights bottom to top
+        self.centers = list(centers)
+        self.tops = [list(itertools.accumulate(heights)) for heights in stacks]
+        self.half_width = width / 2.0
+
+    def push(self, slot, height):
+        """Records one more segment on top of `slot`."""
+        tops = self.tops[slot]
+        tops.append((tops[-1] if tops else 0) + height)
+
+    def find(self, x, y):
+        """Returns (layer, slot) of the segment containing (x, y), or None."""
+        if x is None or y is None or y < 0:
+            return None
+
+        i = bisect.bisect_left(self.centers, x)
+        slot = None
+        for j in (i - 1, i): # Only the neighbours on each side can contain x
+            if 0 <= j < len(self.centers) and abs(x - self.centers[j]) <= self.half_width:
+                slot = j
+                break
+        if slot is None:
+            return None
+
+        tops = self.tops[slot]
+        # First segment whose top is above y; zero-height segments are skipped
+        layer = bisect.bisect_right(tops, y)
+        if layer >= len(tops):
+            return None
+        return layer, slot
@@ -0,0 +1,173 @@
+import datetime
+import time
+from dataclasses import dataclass, field
+import hr_zones
+from workout import Workout, WorkoutState
+
+# Class mode: one EMOM timer per station or athlete, all driven by one clock.
+# A ClassSession owns N Workouts. The UI calls `advance()` from a single
+# after() loop; every athlete whose tick is due is ticked once per elapsed
+# second (staggered starts are offsets on the shared clock), and finished
+# sessions are written through one history writer.
+
+RUNNING_STATES = (WorkoutState.PREP, WorkoutState.WORK, WorkoutState.REST)
+
+@dataclass
+class Athlete:
+    profile: str
+    workout: Workout
+    offset: float = 0.0 # Seconds after the class start that this athlete's prep begins
+    device_address: str = None # HR strap for this athlete, if any
+    notes: str = ""
+    max_hr: int = None # For time-in-zone columns
+    bpm: int = None # Latest HR, written from the BLE thread
+    zone_time: hr_zones.ZoneAccumulator = field(default=None, repr=False)
+    next_tick: float = None # Clock time this athlete's next tick is due
+    started_at: datetime.datetime = None
+    saved: bool = field(default=False, repr=False)
+
+    @property
+    def waiting(self):
+        """Staggered start not reached yet."""
+        return self.workout.state == WorkoutState.IDLE
+
+class ClassSession:
+    """Drives every athlete's Workout from one shared monotonic tick source.
+
+    `clock()` returns seconds (time.perf_counter by default; tests pass a fake).
+    `writer` has HistoryWriter's `submit(row, profile_name, on_done)`; `on_saved`
+    is passed as `on_done`. `on_event(athlete, event)` is called for every tick
+    that produced a sound or phase change.
+    """
+
+    def __init__(self, athletes, writer, clock=time.perf_counter, on_event=None, on_saved=None):
+        self.athletes = list(athletes)
+        self.writer = writer
+        self.on_saved = on_saved
+        self.clock = clock
+        self.on_event = on_event
+        self.started = None
+        self.paused_at = None
+
+    def start(self):
+        self.started = self.clock()
+        for athlete in self.athletes:
+            athlete.next_tick = self.started + athlete.offset
+
+    @property
+    def running(self):
+        return self.started is not None and self.paused_at is None and not self.finished
+
+    @property
+    def finished(self):
+        return all(a.workout.state == WorkoutState.FINISHED or a.saved for a in self.athletes)
+
+    def set_bpm(self, index, bpm):
+        """HR update for one athlete (safe from the BLE thread)."""
+        self.athletes[index].bpm = bpm
+
+    def set_hr_status(self, index, status):
+        """HeartRateMonitor status for one athlete; a lost strap clears the stale HR."""
+        if status == "Disconnected" or status.startswith("Error"):
+            self.athletes[index].bpm = None
+
+    def advance(self):
+        """Ticks every athlete that is due. Returns the indexes of the athletes that changed."""
+        if not self.running:
+            return []
+        now = self.clock()
+        changed = []
+        for index, athlete in enumerate(self.athletes):
+            ticked = False
+            # Catch up if the UI loop stalled; each tick is one second of workout
+            while athlete.next_tick is not None and athlete.next_tick <= now:
+                self._tick(athlete)
+                ticked = True
+            if ticked:
+                changed.append(index)
+        return changed
+
+    def _tick(self, athlete):
+        workout = athlete.workout
+        if workout.state == WorkoutState.IDLE:
+            workout.start()
+            athlete.started_at = datetime.datetime.now().replace(microsecond=0)
+            athlete.zone_time = hr_zones.ZoneAccumulator(workout.total_rounds)
+        if athlete.bpm and athlete.max_hr:
+            # One HR sample per athlete tick is plenty for time-in-zone
+            phase = "work" if workout.state == WorkoutState.WORK else "rest"
+            athlete.zone_time.add(athlete.next_tick, hr_zones.zone_for(athlete.bpm, athlete.max_hr),
+                                  phase, workout.current_round)
+        elif athlete.bpm is None:
+            athlete.zone_time.pause() # Strap dropped out: don't count the gap
+        event = workout.tick(current_hr=athlete.bpm)
+        if event.sound_name or event.phase_changed:
+            if self.on_event:
+                self.on_event(athlete, event)
+        if event.finished:
+            athlete.next_tick = None
+            self._save(athlete, workout.total_rounds)
+        else:
+            athlete.next_tick += 1.0
+
+    def next_delay(self):
+        """Seconds until the earliest athlete tick is due (None when nothing is scheduled)."""
+        due = [a.next_tick for a in self.athletes if a.next_tick is not None]
+        if not due or not self.running:
+            return None
+        return max(0.0, min(due) - self.clock())
+
+    def pause(self):
+        if self.running:
+            self.paused_at = self.clock()
+            for athlete in self.athletes:
+                if athlete.workout.state in RUNNING_STATES:
+                    athlete.workout.pause()
+                if athlete.zone_time:
+                    athlete.zone_time.pause()
+
+    def resume(self):
+        if self.paused_at is None:
+            return
+        # Shift every schedule by the pause so no ticks are lost or doubled
+        paused_for = self.clock() - self.paused_at
+        for athlete in self.athletes:
+            if athlete.next_tick is not None:
+                athlete.next_tick += paused_for
+            if athlete.workout.state == WorkoutState.PAUSED:
+                athlete.workout.pause()
+        self.paused_at = None
+
+    def stop(self):
+        """Ends the class; athletes part-way through save their completed rounds."""
+        for athlete in self.athletes:
+            workout = athlete.workout
+            if not athlete.saved and workout.current_round > 0 and workout.state != WorkoutState.FINISHED:
+                self._save(athlete, max(0, workout.current_round - 1))
+            athlete.next_tick = None
+            workout.reset()
+        self.started = None
+        self.paused_at = None
+
+    def _save(self, athlete, completed_rounds):
+        if athlete.saved or athlete.started_at is None:
+            return
+        athlete.saved = True
+        self.writer.submit(history_row(athlete, completed_rounds), athlete.profile, on_done=self.on_saved)
+
+def history_row(athlete, completed_rounds, end_time=None):
+    """History record for one athlete's session, same columns as a solo workout."""
+    workout = athlete.workout
+    end_time = end_time or datetime.datetime.now().replace(microsecond=0)
+    row = {
+        "start_time": athlete.started_at.isoformat(),
+        "end_time": end_time.isoformat(),
+        "total_rounds_completed": completed_rounds,
+        "work_time_sec": workout.work_duration,
+        "rest_time_sec": workout.rest_duration,
+        "total_time_sec": completed_rounds * (workout.work_duration + workout.rest_duration),
+        "workout_notes": athlete.notes or "Class",
+    }
+    if athlete.zone_time:
+        row.update(athlete.zone_time.columns())
+    return row
@@ -0,0 +1,232 @@
+import customtkinter as ctk
+import storage
+import hr_zones
+import class_mode
+from workout import Workout, WorkoutState
+
+# --- Colors ---
+CARD_COLOR = "#1C1C1E"
+TEXT_COLOR = "#FFFFFF"
+TEXT_SECONDARY = "#8E8E93"
+ACCENT_BLUE = "#0A84FF"
+ACCENT_GREEN = "#30D158"
+ACCENT_ORANGE = "#FF9F0A"
+ACCENT_YELLOW = "#FFD60A"
+ACCENT_RED = "#FF453A"
+
+STATE_COLORS = {
+    WorkoutState.IDLE: TEXT_SECONDARY,
+    WorkoutState.PREP: ACCENT_YELLOW,
+    WorkoutState.WORK: ACCENT_GREEN,
+    WorkoutState.REST: ACCENT_ORANGE,
+    WorkoutState.PAUSED: TEXT_SECONDARY,
+    WorkoutState.FINISHED: ACCENT_BLUE,
+}
+CARD_COLUMNS = 4
+
+def parse_athletes(text):
+    """[(profile, device_address or None), ...] from lines of "Profile" or "Profile, AA:BB:..."."""
+    athletes = []
+    for line in text.splitlines():
+        parts = [p.strip() for p in line.split(",", 1)]
+        if parts[0]:
+            athletes.append((parts[0], parts[1] if len(parts) > 1 and parts[1] else None))
+    return athletes
+
+class StationCard(ctk.CTkFrame):
+    def __init__(self, master, athlete):
+        super().__init__(master, fg_color=CARD_COLOR, corner_radius=15)
+        self.lbl_name = ctk.CTkLabel(self, text=athlete.profile, font=("Arial", 16, "bold"), text_color=TEXT_COLOR)
+        self.lbl_name.pack(pady=(10, 0))
+        self.lbl_time = ctk.CTkLabel(self, text="--:--", font=("Arial", 40, "bold"), text_color=TEXT_SECONDARY)
+        self.lbl_time.pack()
+        self.lbl_round = ctk.CTkLabel(self, text="", font=("Arial", 14), text_color=TEXT_SECONDARY)
+        self.lbl_round.pack()
+        self.lbl_hr = ctk.CTkLabel(self, text="", font=("Arial", 14), text_color=ACCENT_RED)
+        self.lbl_hr.pack(pady=(0, 10))
+
+    @property
+    def rendered_labels(self):
+        """Labels updated through the Renderer."""
+        return (self.lbl_time, self.lbl_round, self.lbl_hr)
+
+class ClassModeFrame(ctk.CTkFrame):
+    """Class setup plus one card per station, all driven by one ClassSession."""
+
+    def __init__(self, master, history_writer, audio, render, on_history_saved=None, **kwargs):
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.history_writer = history_writer
+        self.on_history_saved = on_history_saved # HistoryWriter on_done, e.g. to refresh the History tab
+        self.audio = audio
+        self.render = render # Shared render.Renderer: card updates land in one batch per frame
+        self.session = None
+        self.cards = []
+        self.monitors = []
+        self.loop_job = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        setup = ctk.CTkFrame(self, fg_color=CARD_COLOR, corner_radius=15)
+        setup.grid(row=0, column=0, sticky="ew", padx=10, pady=10)
+        ctk.CTkLabel(setup, text="Athletes (one per line: profile[, HR strap address])",
+                     text_color=TEXT_SECONDARY).grid(row=0, column=0, columnspan=8, sticky="w", padx=10, pady=(10, 0))
+        self.txt_athletes = ctk.CTkTextbox(setup, height=80)
+        self.txt_athletes.grid(row=1, column=0, columnspan=8, sticky="ew", padx=10, pady=5)
+        setup.grid_columnconfigure(7, weight=1)
+
+        self.rounds_var = ctk.StringVar(value="10")
+        self.work_var = ctk.StringVar(value="60")
+        self.rest_var = ctk.StringVar(value="0")
+        self.stagger_var = ctk.StringVar(value="15")
+        for col, (label, var) in enumerate((("Rounds", self.rounds_var), ("Work (s)", self.work_var),
+                                            ("Rest (s)", self.rest_var), ("Stagger (s)", self.stagger_var))):
+            ctk.CTkLabel(setup, text=label, text_color=TEXT_SECONDARY).grid(row=2, column=col * 2, padx=(10, 4), pady=(0, 10))
+            ctk.CTkEntry(setup, textvariable=var, width=50).grid(row=2, column=col * 2 + 1, pady=(0, 10))
+
+        buttons = ctk.CTkFrame(setup, fg_color="transparent")
+        buttons.grid(row=3, column=0, columnspan=8, sticky="w", padx=10, pady=(0, 10))
+        self.btn_start = ctk.CTkButton(buttons, text="START CLASS", fg_color=ACCENT_GREEN, text_color="black",
+                                       command=self.start_class)
+        self.btn_start.pack(side="left", padx=(0, 10))
+        self.btn_stop = ctk.CTkButton(buttons, text="STOP", fg_color=ACCENT_RED, command=self.stop_class)
+        self.btn_stop.pack(side="left")
+        self.lbl_error = ctk.CTkLabel(buttons, text="", text_color=ACCENT_RED)
+        self.lbl_error.pack(side="left", padx=10)
+
+        self.stations = ctk.CTkScrollableFrame(self, fg_color="transparent")
+        self.stations.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        for col in range(CARD_COLUMNS):
+            self.stations.grid_columnconfigure(col, weight=1)
+
+    def start_class(self):
+        if self.session and self.session.started is not None and not self.session.finished:
+            return
+        try:
+            rounds, work, rest = int(self.rounds_var.get()), int(self.work_var.get()), int(self.rest_var.get() or 0)
+            stagger = float(self.stagger_var.get() or 0)
+        except ValueError:
+            self.lbl_error.configure(text="Invalid settings")
+            return
+        specs = parse_athletes(self.txt_athletes.get("1.0", "end"))
+        if not specs:
+            self.lbl_error.configure(text="Add at least one athlete")
+            return
+        self.lbl_error.configure(text="")
+
+        athletes = []
+        for i, (profile, address) in enumerate(specs):
+            details = storage.get_profile_details(profile)
+            max_prework_hr = details.get("max_prework_hr")
+            workout = Workout(rounds, work, rest, max_prework_hr=max_prework_hr,
+                              auto_regulation=bool(address and max_prework_hr))
+            try:
+                max_hr = int(details.get("max_hr"))
+            except (TypeError, ValueError):
+                max_hr = None
+            athletes.append(class_mode.Athlete(profile, workout, offset=i * stagger,
+                                               device_address=address, max_hr=max_hr))
+        self.session = class_mode.ClassSession(athletes, self.history_writer, on_event=self._on_event,
+                                               on_saved=self.on_history_saved)
+
+        self._build_cards()
+        self._connect_straps()
+        self.session.start()
+        self.btn_start.configure(text="PAUSE", fg_color=ACCENT_ORANGE, command=self.toggle_pause)
+        self._loop()
+
+    def _build_cards(self):
+        for card in self.cards:
+            # The Renderer is shared with the solo timer: drop only this card's labels
+            for label in card.rendered_labels:
+                self.render.discard(label)
+            card.destroy()
+        self.cards = []
+        for i, athlete in enumerate(self.session.athletes):
+            card = StationCard(self.stations, athlete)
+            card.grid(row=i // CARD_COLUMNS, column=i % CARD_COLUMNS, sticky="nsew", padx=5, pady=5)
+            self.cards.append(card)
+
+    def _connect_straps(self):
+        from heart_rate import HeartRateMonitor # Imports bleak lazily on connect
+        for i, athlete in enumerate(self.session.athletes):
+            if athlete.device_address:
+                monitor = HeartRateMonitor(on_hr_update=lambda bpm, i=i: self.session.set_bpm(i, bpm),
+                                           on_status_change=lambda status, i=i: self.session.set_hr_status(i, status),
+                                           device_address=athlete.device_address)
+                monitor.start()
+                self.monitors.append(monitor)
+
+    def _on_event(self, athlete, event):
+        if event.sound_name:
+            self.audio.play(event.sound_name, event.sound_count)
+
+    def _loop(self):
+        self.loop_job = None
+        session = self.session
+        for index in session.advance():
+            self._show(self.cards[index], session.athletes[index])
+        for card, athlete in zip(self.cards, session.athletes):
+            self._show_hr(card, athlete) # HR changes between ticks
+
+        delay = session.next_delay()
+        if delay is not None:
+            self.loop_job = self.after(max(1, round(delay * 1000)), self._loop)
+        elif session.finished:
+            self.btn_start.configure(text="START CLASS", fg_color=ACCENT_GREEN, command=self.start_class)
+            self._disconnect_straps()
+
+    def _show(self, card, athlete):
+        workout = athlete.workout
+        color = STATE_COLORS.get(workout.state, TEXT_SECONDARY)
+        self.render.set(card.lbl_time, text=workout.time_display, text_color=color)
+        self.render.set(card.lbl_round, text=f"{workout.status_text}  ·  {workout.round_display}")
+
+    def _show_hr(self, card, athlete):
+        if athlete.bpm is None:
+            self.render.set(card.lbl_hr, text="")
+            return
+        zone = f"  Z{hr_zones.zone_for(athlete.bpm, athlete.max_hr)}" if athlete.max_hr else ""
+        self.render.set(card.lbl_hr, text=f"♥ {athlete.bpm}{zone}")
+
+    def toggle_pause(self):
+        if not self.session:
+            return
+        if self.session.paused_at is None:
+            self.session.pause()
+            if self.loop_job:
+                self.after_cancel(self.loop_job)
+                self.loop_job = None
+            self.btn_start.configure(text="RESUME", fg_color=ACCENT_GREEN)
+        else:
+            self.session.resume()
+            self.btn_start.configure(text="PAUSE", fg_color=ACCENT_ORANGE)
+            self._loop()
+        for card, athlete in zip(self.cards, self.session.athletes):
+            self._show(card, athlete)
+
+    def stop_class(self):
+        if not self.session:
+            return
+        if self.loop_job:
+            self.after_cancel(self.loop_job)
+            self.loop_job = None
+        self.session.stop()
+        self._disconnect_straps()
+        for card, athlete in zip(self.cards, self.session.athletes):
+            self._show(card, athlete)
+        self.btn_start.configure(text="START CLASS", fg_color=ACCENT_GREEN, command=self.start_class)
+
+    def _disconnect_straps(self):
+        for monitor in self.monitors:
+            monitor.stop()
+        self.monitors = []
+
+    def close(self):
+        """Saves partial sessions and disconnects straps (on app exit)."""
+        if self.loop_job:
+            self.after_cancel(self.loop_job)
+            self.loop_job = None
+        if self.session:
+            self.session.stop()
+        self._disconnect_straps()
@@ -0,0 +1,38 @@
+import customtkinter as ctk
+import instrumentation
+
+# On-screen view of instrumentation.py metrics, toggled with F12 in main.py.
+
+REFRESH_MS = 500
+
+def format_table(summaries):
+    """Fixed-width text table of metric summaries (ms); "" with no metrics."""
+    if not summaries:
+        return ""
+    lines = [f"{'metric':<20}{'n':>7}{'p50':>8}{'p99':>8}{'max':>8}"]
+    for name, s in summaries.items():
+        lines.append(f"{name:<20}{s['count']:>7}{s['p50_ms']:>8.1f}{s['p99_ms']:>8.1f}{s['max_ms']:>8.1f}")
+    return "\n".join(lines)
+
+class DebugOverlay(ctk.CTkFrame):
+    """Metrics table floating over the top-right corner of `master`."""
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, fg_color="#1C1C1E", corner_radius=10, **kwargs)
+        self.label = ctk.CTkLabel(self, text="", font=("Courier", 12), justify="left", text_color="#8E8E93")
+        self.label.pack(padx=10, pady=8)
+        self.refresh_job = None
+
+    def toggle(self):
+        if self.refresh_job:
+            self.after_cancel(self.refresh_job)
+            self.refresh_job = None
+            self.place_forget()
+        else:
+            self.place(relx=1.0, y=10, x=-10, anchor="ne")
+            self.lift()
+            self._refresh()
+
+    def _refresh(self):
+        self.label.configure(text=format_table(instrumentation.snapshot()) or "No metrics yet.")
+        self.refresh_job = self.after(REFRESH_MS, self._refresh)
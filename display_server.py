@@ -0,0 +1,223 @@
+import os
+import json
+import asyncio
+import threading
+from workout import WorkoutState
+
+# Live timer display for a wall TV or phones on the local network.
+# An asyncio server on a background thread serves a small page and a
+# Server-Sent Events stream. The app publishes state fields (phase, round,
+# time_left, bpm, zone) from any thread; only fields that changed are sent,
+# so a tick is usually just {"time_left":41}. Each client has a bounded
+# queue: a client that falls behind is resynced with one full snapshot
+# instead of slowing anyone else down, and the timer loop never waits.
+#
+# Run with EMOM_DISPLAY_PORT=8765 (optionally EMOM_DISPLAY_HOST) to enable.
+
+QUEUE_SIZE = 32 # Messages buffered per client before it is resynced
+KEEPALIVE_SECONDS = 15 # Comment line so idle connections stay open
+WRITE_TIMEOUT = 10 # A client that can't take a write for this long is dropped
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width, initial-scale=1">
+<title>EMOM Timer</title>
+<style>
+body { margin: 0; background: #000; color: #fff; font-family: Arial, sans-serif; text-align: center; }
+#time { font-size: 30vw; font-weight: bold; line-height: 1; margin-top: 8vh; }
+#phase { font-size: 6vw; color: #8E8E93; }
+#info { font-size: 4vw; color: #8E8E93; }
+</style></head><body>
+<div id="phase">READY</div><div id="time">00:00</div><div id="info"></div>
+<script>
+const COLORS = {PREP: "#FFD60A", WORK: "#30D158", REST: "#FF9F0A", FINISHED: "#0A84FF"};
+let state = {};
+function show() {
+  const t = state.time_left || 0;
+  document.getElementById("time").textContent =
+    String(Math.floor(t / 60)).padStart(2, "0") + ":" + String(t % 60).padStart(2, "0");
+  document.getElementById("time").style.color = COLORS[state.phase] || "#fff";
+  document.getElementById("phase").textContent = state.phase || "READY";
+  let info = state.total_rounds ? "Round " + state.round + " / " + state.total_rounds : "";
+  if (state.bpm) info += "  \\u2665 " + state.bpm + (state.zone ? "  Z" + state.zone : "");
+  document.getElementById("info").textContent = info;
+}
+const source = new EventSource("/events");
+source.addEventListener("snapshot", e => { state = JSON.parse(e.data); show(); });
+source.addEventListener("delta", e => { Object.assign(state, JSON.parse(e.data)); show(); });
+</script></body></html>
+"""
+
+def workout_state(workout):
+    """Display fields for a Workout (None -> idle)."""
+    if workout is None:
+        return {"phase": WorkoutState.IDLE.name, "round": 0, "total_rounds": 0, "time_left": 0}
+    return {"phase": workout.state.name, "round": workout.current_round,
+            "total_rounds": workout.total_rounds, "time_left": workout.time_left}
+
+def encode(event, data):
+    """One SSE message with compact JSON."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode()
+
+class _Client:
+    def __init__(self, state, queue_size=QUEUE_SIZE):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.resyncs = 0
+        self.queue.put_nowait(encode("snapshot", state))
+
+    def offer(self, message, state):
+        """Queues a delta; if the client is behind, replaces its backlog with a snapshot."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(encode("snapshot", state))
+            self.resyncs += 1
+
+    def close(self):
+        """Ends the stream after nothing more (None is the end marker)."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+class DisplayServer:
+    """Serves the display page and state stream from a background asyncio loop.
+
+    `publish(**fields)` is safe from any thread and returns immediately.
+    Use port=0 to pick a free port (see `port` after `start()`).
+    """
+
+    def __init__(self, host="0.0.0.0", port=8765, queue_size=QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.state = workout_state(None)
+        self.state.update(bpm=None, zone=None)
+        self.clients = set()
+        self.handlers = set() # Connection tasks, ended on stop()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.ready = threading.Event()
+        self.error = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name="display-server", daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout=5)
+        if self.error:
+            print(f"Display server error: {self.error}")
+            return False
+        print(f"Display server on http://{self.host}:{self.port}/")
+        return True
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except OSError as e:
+            self.error = e
+            self.ready.set()
+            self.loop.close()
+            return
+        self.ready.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    def publish(self, **fields):
+        """Updates state fields and streams the ones that changed to every client."""
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self._publish, fields)
+
+    def publish_workout(self, workout):
+        self.publish(**workout_state(workout))
+
+    def _publish(self, fields):
+        delta = {k: v for k, v in fields.items() if self.state.get(k) != v}
+        if not delta:
+            return
+        self.state.update(delta)
+        message = encode("delta", delta)
+        for client in self.clients:
+            client.offer(message, self.state)
+
+    async def _handle(self, reader, writer):
+        self.handlers.add(asyncio.current_task())
+        try:
+            request = await asyncio.wait_for(reader.readline(), WRITE_TIMEOUT)
+            while (await asyncio.wait_for(reader.readline(), WRITE_TIMEOUT)).strip():
+                pass # Headers are not needed
+            parts = request.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path == "/events":
+                await self._stream(writer)
+            elif path == "/":
+                body = PAGE.encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                             b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+                await asyncio.wait_for(writer.drain(), WRITE_TIMEOUT)
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await asyncio.wait_for(writer.drain(), WRITE_TIMEOUT)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass # Client went away, or the server is shutting down
+        finally:
+            writer.close()
+            self.handlers.discard(asyncio.current_task())
+
+    async def _stream(self, writer):
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                     b"Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n")
+        client = _Client(self.state, self.queue_size)
+        self.clients.add(client)
+        try:
+            while True:
+                try:
+                    message = await asyncio.wait_for(client.queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    message = b": keepalive\n\n"
+                if message is None:
+                    break
+                writer.write(message)
+                await asyncio.wait_for(writer.drain(), WRITE_TIMEOUT)
+        finally:
+            self.clients.discard(client)
+
+    async def _shutdown(self):
+        self.server.close()
+        # Open streams never end by themselves; connections still sending a request are cancelled
+        for client in self.clients:
+            client.close()
+        handlers = set(self.handlers)
+        if handlers:
+            _, pending = await asyncio.wait(handlers, timeout=1)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending, timeout=1)
+        self.loop.stop()
+
+    def stop(self):
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop)
+        if self.thread:
+            self.thread.join(timeout=2)
+
+def from_env():
+    """Started DisplayServer if EMOM_DISPLAY_PORT is set, else None."""
+    port = os.environ.get("EMOM_DISPLAY_PORT")
+    if not port:
+        return None
+    try:
+        server = DisplayServer(os.environ.get("EMOM_DISPLAY_HOST", "0.0.0.0"), int(port))
+    except ValueError:
+        print(f"Invalid EMOM_DISPLAY_PORT: {port}")
+        return None
+    return server if server.start() else None
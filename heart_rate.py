@@ -1,6 +1,8 @@
 import asyncio
 import threading
-from bleak import BleakClient, BleakScanner
+
+# bleak is imported when a connection is first attempted: it is slow to load
+# (platform BLE backends) and most launches never connect.
 
 # Standard Heart Rate Service UUID
 HR_SERVICE_UUID = "0000180d-0000-1000-8000-00805f9b34fb"
@@ -8,13 +10,14 @@ HR_SERVICE_UUID = "0000180d-0000-1000-8000-00805f9b34fb"
 HR_MEASUREMENT_UUID = "00002a37-0000-1000-8000-00805f9b34fb"
 
 class HeartRateMonitor:
-    def __init__(self, on_hr_update=None, on_status_change=None):
+    def __init__(self, on_hr_update=None, on_status_change=None, device_address=None):
         self.on_hr_update = on_hr_update
+        self.device_address = device_address # Connect to this strap only (class mode); None = first HR device found
         self.on_status_change = on_status_change
         self.client = None
         self.loop = None
         self.thread = None
-        self._stop_event = asyncio.Event()
+        self._stop_event = None # Created on the BLE loop for each connection
         self.is_connected = False
 
     def start(self):
@@ -29,16 +32,22 @@ class HeartRateMonitor:
         """Internal method to run the asyncio loop."""
         self.loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self.loop)
+        self._stop_event = asyncio.Event()
         self.loop.run_until_complete(self._connect_and_listen())
 
     async def _connect_and_listen(self):
         self._update_status("Scanning...")
         
         try:
-            # specifically look for devices with Heart Rate Service
-            device = await BleakScanner.find_device_by_filter(
-                lambda d, ad: HR_SERVICE_UUID.lower() in [s.lower() for s in ad.service_uuids]
-            )
+            from bleak import BleakClient, BleakScanner
+
+            if self.device_address:
+                device = await BleakScanner.find_device_by_address(self.device_address)
+            else:
+                # specifically look for devices with Heart Rate Service
+                device = await BleakScanner.find_device_by_filter(
+                    lambda d, ad: HR_SERVICE_UUID.lower() in [s.lower() for s in ad.service_uuids]
+                )
 
             if not device:
                 self._update_status("No HR Device Found")
@@ -69,7 +78,7 @@ class HeartRateMonitor:
 
     def stop(self):
         """Signals the loop to stop and disconnect."""
-        if self.loop:
+        if self.loop and self._stop_event:
             self.loop.call_soon_threadsafe(self._stop_event.set)
 
     def _notification_handler(self, sender, data):
@@ -0,0 +1,139 @@
+import os
+import json
+import datetime
+import numpy as np
+import storage
+
+# Columnar binary cache of workout history.
+# One raw little-endian file per column, appended in place and read back as
+# read-only memory maps, so analytics can run vectorized reductions instead of
+# re-parsing the CSV strings on every refresh.
+# meta.json is written last and its row count is what readers trust: a rebuild
+# replaces whole column files (never truncating one a live map points at), and
+# an interrupted append only leaves bytes past that count, which the next
+# append overwrites.
+
+# Start times are stored as seconds since 1970-01-01 in local wall-clock time
+# (naive), so `start // 86400` is directly the local day number.
+COLUMNS = (
+    ("start", np.dtype("<f8")),
+    ("duration", np.dtype("<f8")),  # total_time in seconds
+    ("rounds", np.dtype("<i4")),
+    ("work", np.dtype("<i4")),
+    ("rest", np.dtype("<i4")),
+)
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+def _meta_path(cache_dir):
+    return os.path.join(cache_dir, "meta.json")
+
+def _column_path(cache_dir, name):
+    return os.path.join(cache_dir, f"{name}.bin")
+
+def _read_meta(cache_dir):
+    try:
+        with open(_meta_path(cache_dir), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_meta(cache_dir, rows, source_size):
+    path = _meta_path(cache_dir)
+    with open(path + ".tmp", 'w') as f:
+        json.dump({"rows": rows, "source_size": source_size}, f)
+    os.replace(path + ".tmp", path)
+
+def _parse_record(record):
+    """Converts one history record into a tuple of column values, or None if unusable."""
+    try:
+        start = (datetime.datetime.fromisoformat(record["start_time"]) - _EPOCH).total_seconds()
+    except (ValueError, KeyError):
+        return None
+
+    def _num(key, cast):
+        try:
+            return cast(float(record[key]))
+        except (ValueError, KeyError):
+            return 0
+
+    return (start, _num("total_time_sec", float), _num("total_rounds_completed", int),
+            _num("work_time_sec", int), _num("rest_time_sec", int))
+
+def _build(profile_name):
+    """{column_name: read-only in-memory array} for a profile's full history."""
+    parsed = [p for p in (_parse_record(r) for r in storage.iter_history(profile_name)) if p]
+    columns = {}
+    for i, (name, dtype) in enumerate(COLUMNS):
+        columns[name] = np.array([p[i] for p in parsed], dtype=dtype)
+        columns[name].flags.writeable = False
+    return columns
+
+def rebuild(profile_name="Default"):
+    """Rebuilds the whole cache for a profile from its CSV history."""
+    cache_dir = storage.get_cache_dir(profile_name)
+
+    columns = _build(profile_name)
+    for name, _ in COLUMNS:
+        path = _column_path(cache_dir, name)
+        columns[name].tofile(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    _write_meta(cache_dir, len(columns["start"]), storage.get_history_size(profile_name))
+
+def is_current(profile_name="Default"):
+    meta = _read_meta(storage.get_cache_dir(profile_name))
+    return meta is not None and meta.get("source_size") == storage.get_history_size(profile_name)
+
+def append(profile_name, record, prev_source_size):
+    """Appends a freshly saved record.
+
+    `prev_source_size` is the CSV size before the record was written. If the cache
+    was not in sync with that state (missing, or the CSV was edited elsewhere)
+    the cache is rebuilt instead.
+    """
+    cache_dir = storage.get_cache_dir(profile_name)
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get("source_size") != prev_source_size:
+        rebuild(profile_name)
+        return
+
+    rows = meta["rows"]
+    parsed = _parse_record(record)
+    if parsed:
+        for i, (name, dtype) in enumerate(COLUMNS):
+            with open(_column_path(cache_dir, name), 'r+b') as f:
+                f.seek(rows * dtype.itemsize) # Past the committed rows, over any torn tail
+                np.array([parsed[i]], dtype=dtype).tofile(f)
+        rows += 1
+
+    _write_meta(cache_dir, rows, storage.get_history_size(profile_name))
+
+def load(profile_name="Default"):
+    """Returns {column_name: read-only array} for a profile.
+
+    Never writes: a stale cache is built in memory instead, and the HistoryWriter
+    thread persists it (storage.rebuild_derived).
+    """
+    cache_dir = storage.get_cache_dir(profile_name)
+    meta = _read_meta(cache_dir)
+    if meta is None or meta.get("source_size") != storage.get_history_size(profile_name):
+        return _build(profile_name)
+
+    columns = {}
+    try:
+        for name, dtype in COLUMNS:
+            if meta["rows"] == 0:
+                # np.memmap refuses zero-length files
+                columns[name] = np.empty(0, dtype=dtype)
+            else:
+                columns[name] = np.memmap(_column_path(cache_dir, name), dtype=dtype, mode='r', shape=(meta["rows"],))
+    except (OSError, ValueError):
+        return _build(profile_name) # Column file missing or short
+    if _read_meta(cache_dir) != meta:
+        return _build(profile_name) # Rebuilt while we were mapping: columns may not line up
+    return columns
+
+def day_numbers(columns):
+    """Local day number (days since 1970-01-01) for every cached session."""
+    return (columns["start"] // 86400).astype(np.int64)
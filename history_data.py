@@ -0,0 +1,167 @@
+import time
+import datetime
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import storage
+import rollups
+import training_load
+import hr_zones
+import instrumentation
+
+# Loading and formatting for the History tab, kept off the Tk thread.
+# prepare_history is a plain function (picklable, no Tk), so it can run on a
+# worker thread or, for very large histories, in a worker process.
+
+PROCESS_THRESHOLD_BYTES = 8 * 1024 * 1024 # Above this, parse in a process to keep the GIL free for Tk
+
+def format_seconds(seconds_str):
+    try:
+        total_seconds = int(float(seconds_str))
+        hours = total_seconds // 3600
+        minutes = (total_seconds % 3600) // 60
+        seconds = total_seconds % 60
+        return f"{hours:02}:{minutes:02}:{seconds:02}"
+    except (ValueError, TypeError):
+        return seconds_str
+
+def format_cell(col, val):
+    """Display text for one history value."""
+    # Format Dates
+    if col in ("start_time", "end_time"):
+        try:
+            dt = datetime.datetime.fromisoformat(val)
+            if col == "start_time": # Start Time -> "Dec 06, 14:30"
+                return dt.strftime("%b %d, %H:%M")
+            return dt.strftime("%H:%M") # End Time -> "14:45" (Just time is usually enough if same day)
+        except (ValueError, TypeError):
+            return val
+
+    # Format Total Time
+    if col == "total_time_sec":
+        return format_seconds(val)
+    return val
+
+def format_record(record):
+    row = {col: format_cell(col, val) for col, val in record.items()}
+    # Display-only columns: the session's time-in-zone split, and the work phases' alone
+    zones = hr_zones.zone_seconds(record)
+    row["zones"] = hr_zones.distribution_text(zones) if zones else ""
+    work_zones = hr_zones.zone_seconds(record, hr_zones.WORK_ZONE_COLUMNS)
+    row["work_zones"] = hr_zones.distribution_text(work_zones) if work_zones else ""
+    return row
+
+def week_zones_text(rollup_data, today):
+    """Zone split for `today`'s ISO week from the rollups ("" without HR sessions)."""
+    week = rollup_data["weekly"].get(today.strftime("%G-W%V"))
+    text = hr_zones.distribution_text(week["zone_sec"]) if week else ""
+    return f"This week in zones: {text}" if text else ""
+
+def chart_entry(record):
+    """(date_str, minutes, notes) for one record, matching rollups' daily rows; None if undated."""
+    try:
+        start = datetime.datetime.fromisoformat(record["start_time"])
+    except (ValueError, KeyError, TypeError):
+        return None
+    try:
+        minutes = float(record.get("total_time_sec") or 0) / 60.0
+    except ValueError:
+        minutes = 0.0
+    return start.strftime("%Y-%m-%d"), minutes, record.get("workout_notes", "")
+
+def analytics_summary(profile_name="Default"):
+    """Dashboard line from analytics.py and training_load.py ("" if nothing can be computed)."""
+    parts = []
+    try:
+        import analytics # numpy; imported on first use to keep startup light
+        parts.append(analytics.summary(profile_name))
+    except Exception as e:
+        print(f"Error computing analytics: {e}")
+    try:
+        parts.append(training_load.summary(profile_name))
+    except Exception as e:
+        print(f"Error computing training load: {e}")
+    return "   ·   ".join(p for p in parts if p)
+
+def prepare_history(profile_name="Default"):
+    """Everything the History tab shows for a profile, ready to hand to the widgets.
+
+    Returns {"profile", "records": raw rows, "rows": display rows (same order),
+    "rollups": the profile's rollup tables, for the chart ranges,
+    "summary": analytics dashboard line}.
+    """
+    records = storage.load_history(profile_name)
+    return {
+        "profile": profile_name,
+        "records": records,
+        "rows": [format_record(r) for r in records],
+        "rollups": rollups.load(profile_name),
+        "summary": analytics_summary(profile_name) if records else "",
+    }
+
+class HistoryLoader:
+    """Runs prepare_history in the background; only the latest request is delivered.
+
+    `schedule(func)` must run `func` on the UI thread (e.g. `lambda f: widget.after(0, f)`).
+    Each `load` supersedes the previous one: a queued job is cancelled and a
+    running one has its result dropped, so a fast profile switch can't paint stale data.
+    """
+
+    def __init__(self, schedule, process_threshold=PROCESS_THRESHOLD_BYTES):
+        self.schedule = schedule
+        self.process_threshold = process_threshold
+        self.generation = 0
+        self.delivered = 0 # Generation whose result last reached the UI
+        self.future = None
+        self.threads = None
+        self.processes = None
+
+    def load(self, profile_name, on_ready):
+        """Prepares `profile_name` and calls `on_ready(data)` on the UI thread."""
+        self.generation += 1
+        generation = self.generation
+        requested = time.perf_counter()
+        if self.future:
+            self.future.cancel()
+
+        self.future = self._executor(profile_name).submit(prepare_history, profile_name)
+        self.future.add_done_callback(lambda f: self._done(f, generation, on_ready, requested))
+
+    def busy(self):
+        """True until the latest load's result has been handed to the UI."""
+        return self.delivered != self.generation
+
+    def _executor(self, profile_name):
+        if storage.get_history_size(profile_name) > self.process_threshold:
+            if self.processes is None:
+                self.processes = ProcessPoolExecutor(max_workers=1)
+            return self.processes
+        if self.threads is None:
+            self.threads = ThreadPoolExecutor(max_workers=1)
+        return self.threads
+
+    def _done(self, future, generation, on_ready, requested):
+        # Runs on the worker side; hand over to the UI thread only if still current
+        if future.cancelled() or generation != self.generation:
+            return
+        try:
+            data = future.result()
+        except Exception as e:
+            print(f"Error loading history: {e}")
+            return
+
+        def deliver():
+            if generation == self.generation:
+                self.delivered = generation
+                on_ready(data)
+                instrumentation.record("history.load", time.perf_counter() - requested)
+        try:
+            self.schedule(deliver)
+        except Exception as e: # UI already gone
+            print(f"Error delivering history: {e}")
+
+    def shutdown(self):
+        """Drops pending work without waiting for a running job."""
+        self.generation += 1
+        for executor in (self.threads, self.processes):
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+        self.threads = self.processes = None
@@ -0,0 +1,84 @@
+import queue
+import threading
+import time
+import storage
+
+# Sentinel telling the writer thread to drain and exit
+_STOP = object()
+
+class HistoryWriter:
+    """Persists history rows on a background thread so the Tk loop never waits on disk.
+
+    Rows are queued with `submit` and written in order by a single worker;
+    other storage jobs can be queued behind them with `run`.
+    Transient I/O errors are retried with a growing delay; `on_done` is called
+    from the worker thread once the row is on disk (or finally failed).
+    """
+
+    def __init__(self, max_pending=32, retries=3, retry_delay=0.5, save_func=None):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.save_func = save_func or storage.append_workout
+        self.thread = None
+
+    def start(self):
+        """Starts the writer thread."""
+        if self.thread and self.thread.is_alive():
+            return
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, row, profile_name="Default", on_done=None):
+        """Queues a row for writing.
+
+        Blocks only if `max_pending` rows are already waiting, which means the
+        disk is stalled; losing a finished workout would be worse than a pause.
+        """
+        self.run(self.save_func, row, profile_name, on_done=on_done)
+
+    def run(self, func, *args, on_done=None):
+        """Queues any storage job (e.g. compaction) to run in order with the writes.
+
+        `on_done(*args, ok)` is called from the worker thread when it finishes.
+        """
+        self.start()
+        self.queue.put((func, args, on_done))
+
+    def close(self, timeout=None):
+        """Flushes every queued row to disk and stops the thread."""
+        if not self.thread or not self.thread.is_alive():
+            return
+
+        self.queue.put(_STOP)
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+
+            func, args, on_done = item
+            ok = self._call(func, args)
+            if on_done:
+                try:
+                    on_done(*args, ok)
+                except Exception as e:
+                    print(f"Error in history save callback: {e}")
+
+    def _call(self, func, args):
+        for attempt in range(self.retries + 1):
+            try:
+                func(*args)
+                return True
+            except OSError as e:
+                if attempt == self.retries:
+                    print(f"Error writing history ({func.__name__}), giving up: {e}")
+                    return False
+                print(f"Error writing history ({func.__name__}, attempt {attempt + 1}), retrying: {e}")
+                time.sleep(self.retry_delay * (2 ** attempt))
+            except Exception as e:
+                print(f"Error writing history ({func.__name__}): {e}")
+                return False
@@ -0,0 +1,88 @@
+import bisect
+
+# Heart rate zones and time-in-zone accounting.
+# Zone 0 is the warm-up band below 50% of max HR; zones 1-5 are 10% bands up
+# to 90%+, matching the live zone indicator.
+
+ZONE_BOUNDS = (50, 60, 70, 80, 90) # % of max HR where zones 1..5 start
+ZONE_COUNT = len(ZONE_BOUNDS) + 1
+ZONE_COLUMNS = [f"zone{z}_sec" for z in range(ZONE_COUNT)]
+WORK_ZONE_COLUMNS = [f"zone{z}_work_sec" for z in range(ZONE_COUNT)] # Work-phase part; rest is the remainder
+
+PHASES = ("work", "rest") # Prep counts as rest before round 1
+
+def zone_for(bpm, max_hr):
+    """Zone index 0-5 for a heart rate."""
+    return bisect.bisect_right(ZONE_BOUNDS, bpm * 100.0 / max_hr)
+
+class ZoneAccumulator:
+    """Seconds spent in each (zone, work/rest phase, round) during one session.
+
+    The table is sized from the workout's round count up front (round 0 is
+    prep). Each HR sample adds the time since the previous one to the
+    previous sample's slot, so the cost per sample is constant.
+    `pause()` drops the open interval.
+    """
+
+    def __init__(self, rounds=0, max_gap=30.0):
+        self.rounds = rounds
+        self.max_gap = max_gap # Longer gaps (sensor dropouts) count as this long
+        # seconds[zone][phase][round]
+        self.seconds = [[[0.0] * (rounds + 1) for _ in PHASES] for _ in range(ZONE_COUNT)]
+        self.last = None # (time_sec, zone, phase_index, round)
+
+    def add(self, time_sec, zone, phase, round_no=0):
+        if self.last is not None:
+            last_time, last_zone, last_phase, last_round = self.last
+            seconds = min(time_sec - last_time, self.max_gap)
+            if seconds > 0:
+                self.seconds[last_zone][last_phase][last_round] += seconds
+        self.last = (time_sec, zone, PHASES.index(phase), min(max(round_no, 0), self.rounds))
+
+    def pause(self):
+        self.last = None
+
+    def zone_totals(self, phase=None):
+        """Seconds per zone, over the whole session or one phase."""
+        phases = range(len(PHASES)) if phase is None else [PHASES.index(phase)]
+        return [sum(sum(self.seconds[z][p]) for p in phases) for z in range(ZONE_COUNT)]
+
+    def round_totals(self, round_no, phase=None):
+        """Seconds per zone in one round (0 is prep), optionally for one phase."""
+        phases = range(len(PHASES)) if phase is None else [PHASES.index(phase)]
+        return [sum(self.seconds[z][p][round_no] for p in phases) for z in range(ZONE_COUNT)]
+
+    def columns(self):
+        """History columns (session and work-phase seconds per zone); empty if no HR was recorded."""
+        totals = self.zone_totals()
+        if not any(totals):
+            return {}
+        columns = {col: str(round(sec)) for col, sec in zip(ZONE_COLUMNS, totals)}
+        columns.update((col, str(round(sec))) for col, sec in zip(WORK_ZONE_COLUMNS, self.zone_totals("work")))
+        return columns
+
+def session_columns(samples, max_hr, max_gap=30.0):
+    """Session zone columns for a trace of (offset_sec, bpm) samples (imports).
+
+    Imported traces have no phase info, so the work-phase columns stay blank.
+    """
+    acc = ZoneAccumulator(max_gap=max_gap)
+    for t, bpm in samples:
+        acc.add(t, zone_for(bpm, max_hr), "work")
+    return {col: value for col, value in acc.columns().items() if col in ZONE_COLUMNS}
+
+def zone_seconds(record, columns=ZONE_COLUMNS):
+    """Zone totals from a history record (or its WORK_ZONE_COLUMNS), or None if it has none."""
+    try:
+        values = [float(record.get(col) or 0) for col in columns]
+    except ValueError:
+        return None
+    return values if any(values) else None
+
+def distribution_text(seconds, top=3):
+    """Short share summary of the busiest zones, e.g. "Z3 45% · Z4 30% · Z2 25%"."""
+    total = sum(seconds)
+    if not total:
+        return ""
+    ranked = sorted(range(ZONE_COUNT), key=lambda z: seconds[z], reverse=True)[:top]
+    return " · ".join(f"Z{z} {seconds[z] * 100 / total:.0f}%" for z in ranked if seconds[z])
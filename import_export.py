@@ -0,0 +1,361 @@
+import os
+import csv
+import sys
+import json
+import math
+import multiprocessing
+import datetime
+import argparse
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+import storage
+import training_load
+import hr_zones
+
+# Bulk import/export of workout history.
+# Files are parsed in worker processes (one file per task, a bounded number in
+# flight) and stream validated records back in chunks through a bounded queue,
+# so memory stays bounded however large a file is. New sessions are
+# deduplicated on start time and appended in chunks.
+
+CHUNK_SIZE = 500 # Records per parsed chunk and per append
+
+# Column names used by other apps (lower-cased) -> our history columns
+_IMPORT_ALIASES = {
+    "start": "start_time", "start time": "start_time", "date": "start_time", "started_at": "start_time",
+    "end": "end_time", "end time": "end_time", "ended_at": "end_time",
+    "rounds": "total_rounds_completed",
+    "work": "work_time_sec", "work duration": "work_time_sec",
+    "rest": "rest_time_sec", "rest duration": "rest_time_sec",
+    "duration": "total_time_sec", "total time": "total_time_sec", "total_time": "total_time_sec",
+    "notes": "workout_notes", "note": "workout_notes", "comment": "workout_notes",
+}
+
+_NUMERIC_COLUMNS = ["total_rounds_completed", "work_time_sec", "rest_time_sec", "total_time_sec", "trimp",
+                    *hr_zones.ZONE_COLUMNS, *hr_zones.WORK_ZONE_COLUMNS]
+
+@dataclass
+class ImportResult:
+    files_done: int = 0
+    files_total: int = 0
+    parsed: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    errors: list = field(default_factory=list)
+
+# --- Parsing (runs in worker processes) ---
+
+def _normalize_time(value):
+    """ISO string in local wall-clock time without microseconds; raises ValueError."""
+    dt = datetime.datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if dt.tzinfo is not None:
+        dt = dt.astimezone().replace(tzinfo=None)
+    return dt.replace(microsecond=0).isoformat()
+
+def _from_columns(values):
+    """Maps a dict from a foreign CSV/JSON row onto HISTORY_COLUMNS."""
+    record = {}
+    for key, value in values.items():
+        if key is None:
+            continue
+        name = key.strip().lower()
+        name = _IMPORT_ALIASES.get(name, name)
+        if name in storage.HISTORY_COLUMNS and value not in (None, ""):
+            record[name] = value if isinstance(value, str) else str(value)
+    return record
+
+def _parse_csv(path):
+    with open(path, mode='r', newline='') as file:
+        first = file.readline()
+        if not first.startswith(storage.SCHEMA_MARKER):
+            file.seek(0)
+        for values in csv.DictReader(file):
+            yield _from_columns(values)
+
+def _parse_jsonl(path):
+    with open(path, mode='r') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                obj = json.loads(line)
+                # Valid JSON that isn't an object (e.g. [1, 2]) is an invalid record, not a file error
+                yield _from_columns(obj) if isinstance(obj, dict) else {}
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+def _hr_record(start, end, samples, source):
+    """Builds a record from a timestamped HR trace; samples are (datetime, bpm)."""
+    record = {
+        "start_time": start.isoformat(),
+        "end_time": end.isoformat(),
+        "total_time_sec": str(int((end - start).total_seconds())),
+        "workout_notes": f"Imported from {source}",
+    }
+    # Not a history column; kept so HR-derived metrics can be computed on import
+    record["hr_samples"] = [(int((t - start).total_seconds()), bpm) for t, bpm in samples]
+    return record
+
+def _parse_xml_time(text):
+    return datetime.datetime.fromisoformat(_normalize_time(text))
+
+def _parse_tcx(path):
+    """Garmin TCX: one record per Activity, HR from Trackpoint/HeartRateBpm."""
+    start = None
+    last_time = None
+    total = 0.0
+    samples = []
+    point_time = None
+    for event, elem in ET.iterparse(path, events=("start", "end")):
+        name = _local_name(elem.tag)
+        if event == "start":
+            if name == "Activity":
+                start, last_time, total, samples = None, None, 0.0, []
+            elif name == "Lap" and start is None and elem.get("StartTime"):
+                start = _parse_xml_time(elem.get("StartTime"))
+            continue
+
+        if name == "TotalTimeSeconds":
+            total += float(elem.text or 0)
+        elif name == "Time":
+            point_time = _parse_xml_time(elem.text)
+            last_time = point_time
+        elif name == "Value" and point_time is not None:
+            samples.append((point_time, int(float(elem.text))))
+        elif name == "Trackpoint":
+            point_time = None
+            elem.clear()
+        elif name == "Activity" and start is not None:
+            end = start + datetime.timedelta(seconds=total) if total else (last_time or start)
+            yield _hr_record(start, end, samples, "TCX")
+            elem.clear()
+
+def _parse_gpx(path):
+    """GPX: one record per track, HR from the Garmin TrackPointExtension."""
+    samples = []
+    first_time = None
+    last_time = None
+    point_time = None
+    point_hr = None
+    for event, elem in ET.iterparse(path, events=("end",)):
+        name = _local_name(elem.tag)
+        if name == "time":
+            point_time = _parse_xml_time(elem.text)
+        elif name == "hr":
+            point_hr = int(float(elem.text))
+        elif name == "trkpt":
+            if point_time is not None:
+                first_time = first_time or point_time
+                last_time = point_time
+                if point_hr is not None:
+                    samples.append((point_time, point_hr))
+            point_time, point_hr = None, None
+            elem.clear()
+        elif name == "trk" and first_time is not None:
+            yield _hr_record(first_time, last_time, samples, "GPX")
+            samples, first_time, last_time = [], None, None
+            elem.clear()
+
+_PARSERS = {
+    ".csv": _parse_csv,
+    ".jsonl": _parse_jsonl,
+    ".json": _parse_jsonl,
+    ".tcx": _parse_tcx,
+    ".gpx": _parse_gpx,
+}
+
+def _validate(record):
+    """Normalizes a record in place. Returns an error message, or None if valid."""
+    if "start_time" not in record:
+        return "missing start time"
+    try:
+        record["start_time"] = _normalize_time(record["start_time"])
+        if record.get("end_time"):
+            record["end_time"] = _normalize_time(record["end_time"])
+            if record["end_time"] < record["start_time"]:
+                return "ends before it starts"
+    except ValueError:
+        return "unreadable date"
+    for col in _NUMERIC_COLUMNS:
+        if record.get(col):
+            try:
+                value = float(record[col])
+            except ValueError:
+                return f"non-numeric {col}"
+            if not math.isfinite(value):
+                return f"non-finite {col}"
+            if value < 0:
+                return f"negative {col}"
+    return None
+
+def parse_file(path, chunk_size=CHUNK_SIZE):
+    """Parses and validates one file.
+
+    Yields (valid_records, invalid_count, error_or_None) chunks of at most
+    chunk_size records; an error ends the file.
+    """
+    parser = _PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser is None:
+        yield [], 0, f"{path}: unsupported file type"
+        return
+
+    records = []
+    invalid = 0
+    try:
+        for record in parser(path):
+            if _validate(record) is None:
+                records.append(record)
+                if len(records) >= chunk_size:
+                    yield records, invalid, None
+                    records, invalid = [], 0
+            else:
+                invalid += 1
+    except (OSError, ValueError, ET.ParseError) as e:
+        yield records, invalid, f"{path}: {e}"
+        return
+    if records or invalid:
+        yield records, invalid, None
+
+# --- Import ---
+
+def _parse_to_queue(path, queue):
+    """Worker task: streams parse_file chunks to the queue, then (path, None) when done."""
+    try:
+        for chunk in parse_file(path):
+            queue.put((path, chunk))
+    finally:
+        queue.put((path, None))
+
+def _parsed_files(paths, workers):
+    """Yields (records, invalid, error, file_done) as chunks arrive.
+
+    At most `workers` files are parsed at once and at most 2 * workers chunks
+    wait in the queue, so memory doesn't grow with file size.
+    """
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            for records, invalid, error in parse_file(path):
+                yield records, invalid, error, False
+            yield [], 0, None, True
+        return
+
+    with multiprocessing.Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+        queue = manager.Queue(maxsize=workers * 2)
+        running = {}
+        remaining = iter(paths)
+        for path in remaining:
+            running[path] = pool.submit(_parse_to_queue, path, queue)
+            if len(running) >= workers:
+                break
+        while running:
+            path, chunk = queue.get()
+            if chunk is not None:
+                yield (*chunk, False)
+                continue
+            running.pop(path).result() # Re-raises anything the worker didn't handle
+            next_path = next(remaining, None)
+            if next_path is not None:
+                running[next_path] = pool.submit(_parse_to_queue, next_path, queue)
+            yield [], 0, None, True
+
+def import_files(paths, profile_name="Default", dry_run=False, progress=None, workers=None):
+    """Imports history files into a profile.
+
+    Sessions whose start time already exists are skipped. With dry_run nothing
+    is written; the result reports what would have been imported. `progress`
+    is called with the running ImportResult after each file.
+    """
+    result = ImportResult(files_total=len(paths))
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    seen = {r["start_time"] for r in storage.iter_history(profile_name)}
+    hr_range = training_load.hr_range(profile_name)
+    batch = []
+
+    for records, invalid, error, file_done in _parsed_files(paths, workers):
+        if file_done:
+            result.files_done += 1
+            if progress:
+                progress(result)
+            continue
+        result.parsed += len(records) + invalid
+        result.invalid += invalid
+        if error:
+            result.errors.append(error)
+
+        for record in records:
+            if record["start_time"] in seen:
+                result.duplicates += 1
+                continue
+            seen.add(record["start_time"])
+            if hr_range and record.get("hr_samples") and not record.get("trimp"):
+                record["trimp"] = f"{training_load.session_trimp(record['hr_samples'], *hr_range):.1f}"
+                record.update(hr_zones.session_columns(record["hr_samples"], hr_range[0], training_load.MAX_SAMPLE_GAP))
+            result.imported += 1
+            if not dry_run:
+                batch.append(record)
+                if len(batch) >= CHUNK_SIZE:
+                    storage.append_workouts(batch, profile_name)
+                    batch = []
+
+    if not dry_run:
+        if batch:
+            storage.append_workouts(batch, profile_name)
+        if result.imported:
+            storage.rebuild_derived(profile_name)
+
+    return result
+
+# --- Export ---
+
+def export_history(profile_name, path):
+    """Streams a profile's history to .csv or .jsonl. Returns the number of sessions written."""
+    fmt = os.path.splitext(path)[1].lower()
+    if fmt not in (".csv", ".jsonl"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    count = 0
+    with open(path, mode='w', newline='') as file:
+        if fmt == ".csv":
+            writer = csv.DictWriter(file, fieldnames=storage.HISTORY_COLUMNS, extrasaction='ignore')
+            writer.writeheader()
+        for record in storage.iter_history(profile_name):
+            if fmt == ".csv":
+                writer.writerow(record)
+            else:
+                file.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import or export EMOM Timer history.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_import = sub.add_parser("import", help="Import .csv/.jsonl/.tcx/.gpx files")
+    p_import.add_argument("profile")
+    p_import.add_argument("files", nargs="+")
+    p_import.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+
+    p_export = sub.add_parser("export", help="Export history to .csv or .jsonl")
+    p_export.add_argument("profile")
+    p_export.add_argument("path")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        def report(r):
+            print(f"\r{r.files_done}/{r.files_total} files, {r.imported} new, {r.duplicates} duplicates, "
+                  f"{r.invalid} invalid", end="", flush=True)
+        result = import_files(args.files, args.profile, dry_run=args.dry_run, progress=report)
+        print()
+        for error in result.errors:
+            print(f"Error: {error}")
+        return 1 if result.errors else 0
+
+    count = export_history(args.profile, args.path)
+    print(f"Exported {count} sessions to {args.path}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
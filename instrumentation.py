@@ -0,0 +1,120 @@
+import json
+import time
+import datetime
+import threading
+from contextlib import contextmanager
+
+# In-process timing metrics.
+# Durations (tick lateness, tick and render cost, audio cue error, HR-to-UI
+# delay, history loads) are kept as HDR-style histograms: log-linear buckets
+# with about 1% precision from 1 µs to a minute, so recording is O(1), memory
+# is fixed, and p99 / p99.9 can be read at any time. See debug_overlay.py for
+# the on-screen view; `dump` writes everything to JSON.
+
+SUB_BUCKET_BITS = 7 # 128 linear sub-buckets per power of two -> < 1% error
+MAX_SECONDS = 60.0 # Longer values are counted as this
+PERCENTILES = (50, 90, 99, 99.9)
+
+class Histogram:
+    """Log-linear histogram of durations, in integer microseconds internally."""
+
+    def __init__(self, max_seconds=MAX_SECONDS, sub_bucket_bits=SUB_BUCKET_BITS):
+        self.sub_bits = sub_bucket_bits
+        self.sub_count = 1 << sub_bucket_bits
+        self.half = self.sub_count // 2
+        self.max_value = int(max_seconds * 1e6)
+        self.counts = [0] * (self._index(self.max_value) + 1)
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+        self.lock = threading.Lock()
+
+    def _index(self, value):
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return shift * self.half + (value >> shift)
+
+    def _highest_equivalent(self, index):
+        if index < self.sub_count:
+            return index
+        shift = (index - self.sub_count) // self.half + 1
+        return ((index - shift * self.half + 1) << shift) - 1
+
+    def record(self, seconds):
+        value = min(max(int(seconds * 1e6), 0), self.max_value)
+        with self.lock:
+            self.counts[self._index(value)] += 1
+            self.count += 1
+            self.total += value
+            self.max = max(self.max, value)
+            self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, p):
+        """Value in seconds at or below which `p` percent of samples fall (0 if empty)."""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            target = max(1, -(-self.count * p // 100)) # ceil
+            seen = 0
+            for index, n in enumerate(self.counts):
+                seen += n
+                if seen >= target:
+                    return min(self._highest_equivalent(index), self.max) / 1e6
+        return self.max / 1e6
+
+    def summary(self):
+        """{"count", "min_ms", "mean_ms", "p50_ms", ..., "max_ms"}."""
+        result = {"count": self.count,
+                  "min_ms": (self.min or 0) / 1e3,
+                  "mean_ms": self.total / self.count / 1e3 if self.count else 0.0}
+        for p in PERCENTILES:
+            result[f"p{p:g}_ms"] = self.percentile(p) * 1e3
+        result["max_ms"] = self.max / 1e3
+        return result
+
+    def buckets(self):
+        """Non-empty buckets as {upper bound in µs: count}, for offline analysis."""
+        with self.lock:
+            return {self._highest_equivalent(i): n for i, n in enumerate(self.counts) if n}
+
+_metrics = {} # name -> Histogram
+_metrics_lock = threading.Lock()
+
+def histogram(name):
+    hist = _metrics.get(name)
+    if hist is None:
+        with _metrics_lock:
+            hist = _metrics.setdefault(name, Histogram())
+    return hist
+
+def record(name, seconds):
+    """Adds one duration to metric `name` (safe from any thread)."""
+    histogram(name).record(seconds)
+
+@contextmanager
+def timer(name):
+    """Records how long the `with` block took."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+def snapshot():
+    """{name: summary} for every metric, sorted by name."""
+    return {name: _metrics[name].summary() for name in sorted(_metrics)}
+
+def dump(path):
+    """Writes summaries and raw buckets of every metric to a JSON file."""
+    data = {"created": datetime.datetime.now().replace(microsecond=0).isoformat(),
+            "metrics": {name: dict(summary, buckets_us=_metrics[name].buckets())
+                        for name, summary in snapshot().items()}}
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2)
+    return path
+
+def reset():
+    with _metrics_lock:
+        _metrics.clear()
@@ -0,0 +1,120 @@
+import os
+import glob
+import json
+import time
+import storage
+
+# Append-only journal of the workout in progress.
+# One file per session, one JSON object per line: a "begin" record with
+# everything needed to rebuild the Workout, then phase changes, pauses and
+# periodic checkpoints. Lines are flushed as written but fsynced in batches.
+# The file is removed once the session is safely in history, so a journal
+# found at launch means the app died mid-workout (or before the save landed).
+
+JOURNAL_DIR_NAME = "journal"
+FSYNC_INTERVAL = 5.0 # seconds between forced syncs for routine records
+
+def journal_dir():
+    return os.path.join(storage.DOCS_DIR, JOURNAL_DIR_NAME)
+
+def remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+class WorkoutJournal:
+    def __init__(self, directory=None, fsync_interval=FSYNC_INTERVAL, clock=time.monotonic):
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        self.clock = clock
+        self.path = None
+        self.file = None
+        self.last_sync = 0.0
+
+    def begin(self, profile_name, start_time, notes, workout):
+        """Starts the journal for a new workout session."""
+        self.close()
+        directory = self.directory or journal_dir()
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{start_time:%Y%m%dT%H%M%S}.journal")
+        self.file = open(self.path, 'w')
+        self._write({
+            "kind": "begin",
+            "profile": profile_name,
+            "start_time": start_time.replace(microsecond=0).isoformat(),
+            "notes": notes,
+            "config": workout.config(),
+            "workout": workout.snapshot(),
+        }, sync=True)
+
+    def reopen(self, path):
+        """Continues an existing journal (after resuming a crashed session)."""
+        self.close()
+        self.path = path
+        self.file = open(path, 'a')
+
+    def record(self, kind, workout, sync=False):
+        """Appends a state record ("phase", "pause", "resume", "checkpoint")."""
+        if self.file:
+            self._write({"kind": kind, "workout": workout.snapshot()}, sync=sync)
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        """Stops journaling. Returns the file path so it can be removed once the session is saved."""
+        self.close()
+        path, self.path = self.path, None
+        return path
+
+    def _write(self, entry, sync=False):
+        entry["ts"] = time.time()
+        try:
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            now = self.clock()
+            if sync or now - self.last_sync >= self.fsync_interval:
+                os.fsync(self.file.fileno())
+                self.last_sync = now
+        except (OSError, ValueError) as e:
+            print(f"Error writing workout journal: {e}")
+
+def load(path):
+    """Reads one journal file.
+
+    Returns {"path", "begin": <begin record>, "workout": <last snapshot>,
+    "ts": <wall time of last record>} or None if it holds nothing usable.
+    A torn last line (crash mid-write) is ignored.
+    """
+    begin = None
+    last = None
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                if entry.get("kind") == "begin":
+                    begin = entry
+                last = entry
+    except OSError:
+        return None
+
+    if begin is None:
+        return None
+    return {"path": path, "begin": begin, "workout": last["workout"], "ts": last["ts"]}
+
+def find_leftovers(directory=None):
+    """Journals left behind by earlier runs, oldest first. Unreadable ones are removed."""
+    leftovers = []
+    for path in sorted(glob.glob(os.path.join(directory or journal_dir(), "*.journal"))):
+        entry = load(path)
+        if entry:
+            leftovers.append(entry)
+        else:
+            remove(path)
+    return leftovers
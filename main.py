@@ -1,16 +1,27 @@
+import startup_timing # First, so the launch report covers every import below
 import customtkinter as ctk
+startup_timing.mark("import customtkinter")
 import threading
-from PIL import Image, ImageTk
+import multiprocessing
+import tkinter
 import os
 import sys
 import datetime
 import time
 import storage
-import subprocess
-from history_ui import HistoryFrame
-from heart_rate import HeartRateMonitor
+import journal
+import training_load
+import instrumentation
+import hr_zones
+import audio
+from tkinter import messagebox
+from heart_rate import HeartRateMonitor # bleak itself is imported on first connect
+from history_writer import HistoryWriter
+from render import Renderer
 from workout import Workout, WorkoutState
 
+startup_timing.mark("import app modules")
+
 # --- Modern "Liquid" / iOS Dark Mode Theme ---
 # Backgrounds
 BG_COLOR = "#000000"         # Pure black for OLED feel
@@ -26,10 +37,23 @@ ACCENT_ORANGE = "#FF9F0A"    # iOS System Orange
 ACCENT_PURPLE = "#BF5AF2"    # iOS System Purple
 ACCENT_YELLOW = "#FFD60A"    # iOS System Yellow
 
+# Live zone label and color, indexed by hr_zones.zone_for
+ZONE_STYLES = [("WARM UP", TEXT_SECONDARY), ("ZONE 1", ACCENT_BLUE), ("ZONE 2", ACCENT_GREEN),
+               ("ZONE 3", ACCENT_YELLOW), ("ZONE 4", ACCENT_ORANGE), ("ZONE 5", ACCENT_RED)]
+
+# Timer display colors per phase: (status label, main timer)
+PHASE_COLORS = {
+    WorkoutState.PREP: (ACCENT_YELLOW, ACCENT_YELLOW),
+    WorkoutState.WORK: (ACCENT_GREEN, TEXT_COLOR),
+    WorkoutState.REST: (ACCENT_ORANGE, ACCENT_ORANGE),
+}
+
 # Config
 CORNER_RADIUS = 20
 BUTTON_HEIGHT = 55
 FONT_FAMILY = "Arial"        # Fallback to Arial, ideally SF Pro on Mac
+CHECKPOINT_TICKS = 5         # Journal a checkpoint every N ticks between phase changes
+CUE_HORIZON = 5              # Seconds ahead that sounds are queued with the audio engine
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("Dark")
@@ -84,10 +108,16 @@ class EMOMApp(ctk.CTk):
             
             icon_path = os.path.join(base_path, "icon.png")
             if os.path.exists(icon_path):
-                image = Image.open(icon_path)
-                self.iconphoto(True, ImageTk.PhotoImage(image))
+                # Tk 8.6 reads PNG itself; PIL only as a fallback for older Tk
+                try:
+                    self.icon_image = tkinter.PhotoImage(file=icon_path)
+                except tkinter.TclError:
+                    from PIL import Image, ImageTk
+                    self.icon_image = ImageTk.PhotoImage(Image.open(icon_path))
+                self.iconphoto(True, self.icon_image)
         except Exception as e:
             print(f"Warning: Could not load icon: {e}")
+        startup_timing.mark("window and icon")
 
         # --- Variables ---
         self.total_rounds_var = ctk.StringVar(value="10")
@@ -112,8 +142,23 @@ class EMOMApp(ctk.CTk):
         # Logic Delegation
         self.workout = None
         self.timer_job = None
+        self.next_tick = None # perf_counter time the running tick is due (see update_timer)
         self.start_time = None
         self.history_frame = None
+        self.class_frame = None # class_mode_ui.ClassModeFrame, built on first visit
+        self.history_writer = HistoryWriter()
+        self.render = Renderer(self.after_idle) # Timer display labels are only updated through this
+        self.audio = audio.AudioEngine()
+        self.audio.start() # Decodes the cues and opens the output on a worker thread
+        self.is_closing = False
+        self.journal = journal.WorkoutJournal()
+        self.trimp = None # TrimpAccumulator for the session in progress (needs a Max HR)
+        self.zone_time = None # hr_zones.ZoneAccumulator for the session in progress
+        self.ticks_since_checkpoint = 0
+        self.display = None # display_server.DisplayServer, when EMOM_DISPLAY_PORT is set
+        if os.environ.get("EMOM_DISPLAY_PORT"):
+            import display_server # asyncio is only loaded when the display is enabled
+            self.display = display_server.from_env()
         
         # --- Heart Rate Variables ---
         self.hr_monitor = HeartRateMonitor(on_hr_update=self.on_hr_update, on_status_change=self.on_hr_status_change)
@@ -125,14 +170,28 @@ class EMOMApp(ctk.CTk):
         self.current_max_prework_hr = None
         self.hr_status = ctk.StringVar(value="Disconnected")
         self.is_hr_connecting = False
+        startup_timing.mark("state, audio and HR setup")
         
         # --- UI Layout ---
         self._create_widgets()
+        startup_timing.mark("widgets built")
         self.load_profiles()
+        startup_timing.mark("profiles loaded")
+        
+        # First idle moment = window is up and usable
+        self.after_idle(self._on_first_idle)
+        
+        # Offer to recover a workout interrupted by a crash
+        self.after(500, self.check_for_crashed_workout)
         
         # Clean up on exit
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+        # Timing metrics: F12 shows the overlay, Shift+F12 dumps them to JSON
+        self.debug_overlay = None
+        self.bind("<F12>", lambda event: self.toggle_debug_overlay())
+        self.bind("<Shift-F12>", lambda event: self.dump_metrics())
+
     def load_profiles(self):
         self.available_profiles = storage.load_profiles()
         if self.available_profiles:
@@ -160,6 +219,11 @@ class EMOMApp(ctk.CTk):
         if self.history_frame:
             self.history_frame.refresh(choice)
 
+        # Roll closed years into archived segments and persist stale derived
+        # stores (readers rebuild them in memory only), queued behind any pending saves
+        self.history_writer.run(storage.compact_history, choice)
+        self.history_writer.run(storage.rebuild_derived, choice, True)
+
     def add_profile(self):
         dialog = ctk.CTkInputDialog(text="Enter Profile Name:", title="New Profile")
         new_name = dialog.get_input()
@@ -209,10 +273,12 @@ class EMOMApp(ctk.CTk):
         btn_add_profile.pack(side="left")
 
         # Tab View
-        self.tabview = ctk.CTkTabview(self, fg_color="transparent", corner_radius=15, width=460)
+        self.tabview = ctk.CTkTabview(self, fg_color="transparent", corner_radius=15, width=460,
+                                      command=self.on_tab_changed)
         self.tabview.grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
         self.tabview.add("Workout")
         self.tabview.add("History")
+        self.tabview.add("Class")
         
         # --- WORKOUT TAB ---
         workout_tab = self.tabview.tab("Workout")
@@ -376,12 +442,54 @@ class EMOMApp(ctk.CTk):
         self.chk_history.grid(row=0, column=0, sticky="w")
         
         # --- HISTORY TAB ---
+        # Built on first visit (see on_tab_changed); most sessions never open it
         history_tab = self.tabview.tab("History")
         history_tab.grid_columnconfigure(0, weight=1)
         history_tab.grid_rowconfigure(0, weight=1)
-        
-        self.history_frame = HistoryFrame(history_tab) # Embed new frame
-        self.history_frame.grid(row=0, column=0, sticky="nsew")
+
+        # --- CLASS TAB ---
+        class_tab = self.tabview.tab("Class")
+        class_tab.grid_columnconfigure(0, weight=1)
+        class_tab.grid_rowconfigure(0, weight=1)
+
+    def on_tab_changed(self):
+        if self.tabview.get() == "Class" and self.class_frame is None:
+            import class_mode_ui
+            # Shares the audio engine, renderer and history writer with the solo timer
+            self.class_frame = class_mode_ui.ClassModeFrame(self.tabview.tab("Class"), self.history_writer,
+                                                            self.audio, self.render,
+                                                            on_history_saved=self.on_history_saved)
+            self.class_frame.grid(row=0, column=0, sticky="nsew")
+        if self.tabview.get() == "History" and self.history_frame is None:
+            import history_ui
+            self.history_frame = history_ui.HistoryFrame(self.tabview.tab("History"), self.profile_var.get())
+            self.history_frame.grid(row=0, column=0, sticky="nsew")
+            startup_timing.mark("history tab built")
+            startup_timing.report("History tab")
+
+    def _on_first_idle(self):
+        startup_timing.mark("window ready")
+        startup_timing.report()
+        # Warm the History tab and charting imports in the background so it opens quickly
+        threading.Thread(target=self._preload_history, daemon=True).start()
+
+    def _preload_history(self):
+        import history_ui
+        history_ui.preload()
+
+    def toggle_debug_overlay(self):
+        if self.debug_overlay is None:
+            from debug_overlay import DebugOverlay
+            self.debug_overlay = DebugOverlay(self)
+        self.debug_overlay.toggle()
+
+    def dump_metrics(self):
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        try:
+            path = instrumentation.dump(os.path.join(storage.DOCS_DIR, f"metrics_{stamp}.json"))
+            print(f"Metrics written to {path}")
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
 
     def open_profile_settings(self):
         current_profile = self.profile_var.get()
@@ -474,43 +582,42 @@ class EMOMApp(ctk.CTk):
             self.btn_connect_hr.configure(text="Disconnect", fg_color=ACCENT_RED)
             
     def on_hr_update(self, valid_bpm):
-        self.after(0, lambda: self.current_hr.set(str(valid_bpm)))
+        # Called from the BLE thread on each notification
+        received = time.perf_counter()
+        def show():
+            self.current_hr.set(str(valid_bpm))
+            instrumentation.record("hr.to_ui", time.perf_counter() - received)
+        self.after(0, show)
+
+        # Training impulse, only while the clock runs
+        trimp, workout = self.trimp, self.workout
+        if trimp and workout and workout.state in (WorkoutState.PREP, WorkoutState.WORK, WorkoutState.REST):
+            trimp.add(time.monotonic(), valid_bpm)
         
         # Zone Calc
         if self.current_max_hr:
             try:
                 bpm = int(valid_bpm)
                 max_hr = int(self.current_max_hr)
-                pct = (bpm / max_hr) * 100
-                
-                zone = ""
-                color = TEXT_SECONDARY
-                
-                if pct < 50:
-                    zone = "WARM UP"
-                    color = TEXT_SECONDARY
-                elif 50 <= pct < 60:
-                    zone = "ZONE 1"
-                    color = ACCENT_BLUE 
-                elif 60 <= pct < 70:
-                    zone = "ZONE 2"
-                    color = ACCENT_GREEN
-                elif 70 <= pct < 80:
-                    zone = "ZONE 3"
-                    color = ACCENT_YELLOW
-                elif 80 <= pct < 90:
-                    zone = "ZONE 4"
-                    color = ACCENT_ORANGE
-                elif pct >= 90:
-                    zone = "ZONE 5"
-                    color = ACCENT_RED
-                
-                print(f"[DEBUG] BPM:{bpm} Max:{max_hr} Pct:{pct:.1f}% Zone:{zone}")
+                zone_index = hr_zones.zone_for(bpm, max_hr)
+                zone, color = ZONE_STYLES[zone_index]
+                if self.display:
+                    self.display.publish(bpm=bpm, zone=zone_index)
+
+                # Time in zone per phase and round, only while the clock runs
+                zone_time = self.zone_time
+                if zone_time and workout and workout.state in (WorkoutState.PREP, WorkoutState.WORK, WorkoutState.REST):
+                    phase = "work" if workout.state == WorkoutState.WORK else "rest"
+                    zone_time.add(time.monotonic(), zone_index, phase, workout.current_round)
+
+                print(f"[DEBUG] BPM:{bpm} Max:{max_hr} Pct:{bpm * 100 / max_hr:.1f}% Zone:{zone}")
                 self.after(0, lambda z=zone, c=color: self._update_zone_ui(z, c))
             except Exception as e:
                 print(f"Error calcing zone: {e}")
         else:
              print(f"[DEBUG] No Max HR set (BPM: {valid_bpm})")
+             if self.display:
+                 self.display.publish(bpm=valid_bpm, zone=None)
              self.after(0, lambda: self._update_zone_ui("", TEXT_SECONDARY))
 
     def _update_zone_ui(self, text, color):
@@ -535,24 +642,50 @@ class EMOMApp(ctk.CTk):
     def on_close(self):
         if self.hr_monitor:
             self.hr_monitor.stop()
+        # Make sure a just-finished workout reaches the disk before exiting.
+        # is_closing stops the save callback from calling into Tk while we wait.
+        self.is_closing = True
+        if self.history_frame:
+            self.history_frame.close()
+        if self.class_frame:
+            self.class_frame.close()
+        self.history_writer.close(timeout=10)
+        self.audio.close()
+        if self.display:
+            self.display.stop()
         self.destroy()
 
     def toggle_pause(self):
         if not self.workout: return
         
         self.workout.pause()
+        if self.display:
+            self.display.publish_workout(self.workout)
         
         if self.workout.state == WorkoutState.PAUSED:
+             self.journal.record("pause", self.workout, sync=True)
+             if self.trimp:
+                 self.trimp.pause()
+             if self.zone_time:
+                 self.zone_time.pause()
+             self.audio.cancel()
              self.btn_start.configure(text="RESUME", fg_color=ACCENT_GREEN, text_color="black")
              if self.timer_job:
                 self.after_cancel(self.timer_job)
                 self.timer_job = None
         else:
+             self.journal.record("resume", self.workout)
              self.btn_start.configure(text="PAUSE", fg_color=ACCENT_ORANGE, text_color="black")
+             self.next_tick = None
              self.update_timer()
 
     def update_timer(self):
         if not self.workout: return
+        tick_started = time.perf_counter()
+        if self.next_tick is None: # First tick after start / resume
+            self.next_tick = tick_started
+        else:
+            instrumentation.record("tick.late", tick_started - self.next_tick)
 
         # 1. Tick Logic
         # print("Ticking...") # Debug
@@ -565,77 +698,60 @@ class EMOMApp(ctk.CTk):
         except:
              pass
              
-        events = self.workout.tick(current_hr=current_hr_val)
+        with instrumentation.timer("tick.workout"):
+            events = self.workout.tick(current_hr=current_hr_val)
+        if self.display:
+            self.display.publish_workout(self.workout) # Non-blocking; only changed fields are sent
+        
+        # Crash journal: every phase change, plus a periodic checkpoint
+        self.ticks_since_checkpoint += 1
+        if events.phase_changed:
+             self.journal.record("phase", self.workout)
+             self.ticks_since_checkpoint = 0
+        elif self.ticks_since_checkpoint >= CHECKPOINT_TICKS:
+             self.journal.record("checkpoint", self.workout)
+             self.ticks_since_checkpoint = 0
         
         # 2. Handle Events
+        # Cues for the rest of this phase are queued ahead against the tick clock,
+        # so the boundary sound lands on time; keyed cues already queued are skipped
         if events.sound_name:
-             self.play_sound(events.sound_name, events.sound_count)
+             self.audio.play(events.sound_name, events.sound_count, key=events.cue_key)
+        self.audio.schedule(self.workout.upcoming_cues(CUE_HORIZON), self.next_tick)
 
         if events.finished:
              self.finish_workout()
              return
 
-        # 3. Update UI
-        self.lbl_main_timer.configure(text=self.workout.time_display)
-        self.lbl_current_round.configure(text=self.workout.round_display)
-        self.lbl_status.configure(text=self.workout.status_text)
-        
-        # Update Colors based on state
-        if self.workout.state == WorkoutState.PREP:
-             self.lbl_status.configure(text_color=ACCENT_YELLOW)
-             self.lbl_main_timer.configure(text_color=ACCENT_YELLOW)
-        elif self.workout.state == WorkoutState.WORK:
-             self.lbl_status.configure(text_color=ACCENT_GREEN)
-             self.lbl_main_timer.configure(text_color=TEXT_COLOR)
-        elif self.workout.state == WorkoutState.REST:
-             self.lbl_status.configure(text_color=ACCENT_ORANGE)
-             self.lbl_main_timer.configure(text_color=ACCENT_ORANGE)
+        # 3. Update UI (only what changed, applied once per frame; see render.py)
+        status_color, timer_color = PHASE_COLORS.get(self.workout.state, (None, None))
+        self.render.set(self.lbl_main_timer, text=self.workout.time_display)
+        self.render.set(self.lbl_current_round, text=self.workout.round_display)
+        self.render.set(self.lbl_status, text=self.workout.status_text)
+        if status_color:
+             self.render.set(self.lbl_status, text_color=status_color)
+             self.render.set(self.lbl_main_timer, text_color=timer_color)
 
         # 4. Schedule next tick if still running/active
         if self.workout.state not in [WorkoutState.IDLE, WorkoutState.FINISHED, WorkoutState.PAUSED]:
-            self.timer_job = self.after(1000, self.update_timer)
+            # Anchored to the first tick, so after() jitter doesn't accumulate
+            self.next_tick += 1.0
+            now = time.perf_counter()
+            instrumentation.record("tick.total", now - tick_started)
+            delay_ms = max(0, round((self.next_tick - now) * 1000))
+            self.timer_job = self.after(delay_ms, self.update_timer)
 
     def play_sound(self, sound_name="Glass", count=1):
-        def _play():
-            try:
-                # Default to .wav for everyone (cross-platform standard)
-                is_windows = sys.platform == 'win32'
-                
-                if hasattr(sys, '_MEIPASS'):
-                    base_path = sys._MEIPASS
-                else:
-                    base_path = os.path.dirname(os.path.abspath(__file__))
-                
-                # 1. Try target .wav
-                sound_file = os.path.join(base_path, "sounds", f"{sound_name}.wav")
-                
-                # 2. Play if found
-                if os.path.exists(sound_file):
-                    for i in range(count):
-                        if is_windows:
-                            import winsound
-                            winsound.PlaySound(sound_file, winsound.SND_FILENAME | winsound.SND_ASYNC)
-                        else:
-                            # Use Popen to avoid blocking, so we can control timing manually
-                            subprocess.Popen(["afplay", sound_file])
-                        
-                        if i < count - 1:
-                            time.sleep(0.4) # Short delay between dings
-                else:
-                    print(f"Sound file not found: {sound_file}")
-
-            except Exception as e:
-                print(f"Error playing sound: {e}")
-
-        # Run in a separate thread to not block UI
-        threading.Thread(target=_play, daemon=True).start()
+        # Preloaded and mixed in-process (audio.py); never blocks the UI
+        self.audio.play(sound_name, count)
 
     def finish_workout(self):
         # UI Updates for Finished
-        self.lbl_status.configure(text="COMPLETED!", text_color=ACCENT_BLUE)
-        self.lbl_main_timer.configure(text="00:00", text_color=TEXT_COLOR)
+        self.render.set(self.lbl_status, text="COMPLETED!", text_color=ACCENT_BLUE)
+        self.render.set(self.lbl_main_timer, text="00:00", text_color=TEXT_COLOR)
         
         self.save_history(self.workout.total_rounds) # Use workout attribute directly
+        self._end_journal()
         
         self.btn_start.configure(state="normal", text="START", fg_color=ACCENT_GREEN, text_color="black", command=self.start_workout)
         self.entry_rounds.configure(state="normal")
@@ -660,16 +776,20 @@ class EMOMApp(ctk.CTk):
                  self.save_history(completed_rounds)
                  
              self.workout.reset()
+             self._end_journal()
+             if self.display:
+                 self.display.publish_workout(self.workout)
 
         if self.timer_job:
             self.after_cancel(self.timer_job)
             self.timer_job = None
+        self.audio.cancel()
             
         self.start_time = None
         
-        self.lbl_main_timer.configure(text="00:00", text_color=TEXT_COLOR)
-        self.lbl_current_round.configure(text="0 / 0")
-        self.lbl_status.configure(text="READY", text_color=ACCENT_BLUE)
+        self.render.set(self.lbl_main_timer, text="00:00", text_color=TEXT_COLOR)
+        self.render.set(self.lbl_current_round, text="0 / 0")
+        self.render.set(self.lbl_status, text="READY", text_color=ACCENT_BLUE)
         
         self.btn_start.configure(state="normal", text="START", fg_color=ACCENT_GREEN, text_color="black", command=self.start_workout)
         self.entry_rounds.configure(state="normal")
@@ -711,13 +831,14 @@ class EMOMApp(ctk.CTk):
             auto_reg = self.auto_regulation_var.get()
 
         except ValueError:
-            self.lbl_status.configure(text="INVALID INPUT", text_color=ACCENT_RED)
+            self.render.set(self.lbl_status, text="INVALID INPUT", text_color=ACCENT_RED)
             return
 
         # Instantiate Logic
         self.workout = Workout(total_rounds, work_duration, rest_duration, rest_inc, rest_interval, rest_start,
                                max_prework_hr=max_pre_hr, auto_regulation=auto_reg)
         self.start_time = datetime.datetime.now()
+        self._begin_hr_tracking()
         
         # Prep UI
         self.btn_start.configure(text="PAUSE", fg_color=ACCENT_ORANGE, text_color="black", command=self.toggle_pause)
@@ -731,6 +852,10 @@ class EMOMApp(ctk.CTk):
         
         # Start Logic
         self.workout.start()
+        self.journal.begin(self.profile_var.get(), self.start_time, self.notes_var.get(), self.workout)
+        self.ticks_since_checkpoint = 0
+        self.audio.cancel() # Forget the last session's cue keys
+        self.next_tick = None
         
         # Start Loop
         self.update_timer()
@@ -754,8 +879,6 @@ class EMOMApp(ctk.CTk):
                 duration = int(self.work_time_var.get())
                 rest = int(self.rest_time_var.get() or 0)
                 
-            total_time = completed_rounds * (duration + rest)
-            
             if self.start_time:
                 start_str = self.start_time.replace(microsecond=0).isoformat()
             else:
@@ -766,27 +889,145 @@ class EMOMApp(ctk.CTk):
             # Clear notes after saving
             self.entry_notes.delete(0, 'end')
 
-            row = [
-                start_str,
-                end_time.isoformat(),
-                completed_rounds,
-                duration,
-                rest,
-                total_time,
-                notes
-            ]
+            trimp = f"{self.trimp.total:.1f}" if self.trimp and self.trimp.total > 0 else ""
+            row = self._history_row(start_str, end_time.isoformat(), completed_rounds, duration, rest, notes, trimp)
+            if self.zone_time:
+                row.update(self.zone_time.columns())
             
             current_profile = self.profile_var.get()
-            storage.save_workout(row, current_profile)
-            print(f"History saved for {current_profile}")
-            
-            # Refresh history tab logic
-            if self.history_frame:
-                self.history_frame.refresh(current_profile)
+            # Written on a background thread; the UI hears back in on_history_saved
+            self.history_writer.submit(row, current_profile, on_done=self.on_history_saved)
             
         except Exception as e:
             print(f"Error saving history: {e}")
 
+    def _begin_hr_tracking(self):
+        # HR-derived session metrics need a Max HR on the profile
+        hr_range = training_load.hr_range(self.profile_var.get())
+        self.trimp = training_load.TrimpAccumulator(*hr_range) if hr_range else None
+        self.zone_time = hr_zones.ZoneAccumulator(self.workout.total_rounds) if self.workout else None
+
+    def _history_row(self, start_str, end_str, completed_rounds, duration, rest, notes, trimp=""):
+        return {
+            "start_time": start_str,
+            "end_time": end_str,
+            "total_rounds_completed": completed_rounds,
+            "work_time_sec": duration,
+            "rest_time_sec": rest,
+            "total_time_sec": completed_rounds * (duration + rest),
+            "workout_notes": notes,
+            "trimp": trimp
+        }
+
+    def _end_journal(self):
+        # The crash journal is removed once the session is in history. Queued
+        # behind the save on the writer thread, so a crash in between keeps it.
+        path = self.journal.finish()
+        if path:
+            self.history_writer.run(journal.remove, path)
+
+    def check_for_crashed_workout(self):
+        leftovers = journal.find_leftovers()
+        resumed = False
+        
+        # Newest first; only one session can be resumed
+        for entry in reversed(leftovers):
+            begin = entry["begin"]
+            start_dt = datetime.datetime.fromisoformat(begin["start_time"])
+            
+            # Crashed after the save landed but before the journal was removed
+            if storage.load_history(begin["profile"], start=start_dt, end=start_dt + datetime.timedelta(seconds=1)):
+                journal.remove(entry["path"])
+                continue
+            
+            snapshot = entry["workout"]
+            if resumed or snapshot["state"] in ("FINISHED", "IDLE"):
+                self._commit_recovered_workout(entry)
+                continue
+            
+            answer = messagebox.askyesnocancel(
+                "Unfinished Workout",
+                f"A workout for {begin['profile']} started {start_dt:%b %d, %H:%M} was interrupted "
+                f"in round {snapshot['current_round']} / {begin['config']['total_rounds']}.\n\n"
+                "Yes: resume where it stopped\n"
+                "No: save the completed rounds to history\n"
+                "Cancel: discard it",
+                parent=self)
+            if answer is None:
+                journal.remove(entry["path"])
+            elif answer:
+                self._resume_recovered_workout(entry)
+                resumed = True
+            else:
+                self._commit_recovered_workout(entry)
+
+    def _commit_recovered_workout(self, entry):
+        begin = entry["begin"]
+        config = begin["config"]
+        snapshot = entry["workout"]
+        
+        if snapshot["state"] == "FINISHED":
+            completed_rounds = config["total_rounds"]
+        else:
+            completed_rounds = max(0, snapshot["current_round"] - 1)
+        
+        # The last journal record is the closest we have to when it stopped
+        end_time = datetime.datetime.fromtimestamp(entry["ts"]).replace(microsecond=0)
+        row = self._history_row(begin["start_time"], end_time.isoformat(), completed_rounds,
+                                config["work_duration"], config["rest_duration"], begin["notes"])
+        self.history_writer.submit(row, begin["profile"], on_done=self.on_history_saved)
+        self.history_writer.run(journal.remove, entry["path"])
+
+    def _resume_recovered_workout(self, entry):
+        begin = entry["begin"]
+        
+        if begin["profile"] in self.available_profiles and begin["profile"] != self.profile_var.get():
+            self.profile_var.set(begin["profile"])
+            self.change_profile(begin["profile"])
+        
+        self.workout = Workout(**begin["config"])
+        self.workout.restore(entry["workout"])
+        self.start_time = datetime.datetime.fromisoformat(begin["start_time"])
+        self.notes_var.set(begin["notes"])
+        self._begin_hr_tracking() # HR load before the crash is lost; the rest of the session counts
+        
+        # Keep recording into the same journal; come back paused so the athlete can get ready
+        self.journal.reopen(entry["path"])
+        if self.workout.state != WorkoutState.PAUSED:
+            self.workout.pause()
+        self.journal.record("pause", self.workout, sync=True)
+        
+        self.btn_start.configure(text="RESUME", fg_color=ACCENT_GREEN, text_color="black", command=self.toggle_pause)
+        self.entry_rounds.configure(state="disabled")
+        self.entry_timer.configure(state="disabled")
+        self.entry_rest.configure(state="disabled")
+        self.switch_inc.configure(state="disabled")
+        self.entry_inc_time.configure(state="disabled")
+        self.entry_inc_int.configure(state="disabled")
+        self.entry_inc_start.configure(state="disabled")
+        
+        self.render.set(self.lbl_main_timer, text=self.workout.time_display)
+        self.render.set(self.lbl_current_round, text=self.workout.round_display)
+        self.render.set(self.lbl_status, text=self.workout.status_text, text_color=ACCENT_YELLOW)
+
+    def on_history_saved(self, row, profile_name, ok):
+        # Called from the writer thread
+        if not ok:
+            return
+        print(f"History saved for {profile_name}")
+        if self.is_closing or not self.history_frame:
+            return
+        # The derived stores already include the row; the analytics stay off the Tk thread
+        import history_data
+        summary = history_data.analytics_summary(profile_name)
+        self.after(0, lambda: self._refresh_history_after_save(row, profile_name, summary))
+
+    def _refresh_history_after_save(self, row, profile_name, summary):
+        # Push just the new session to the history tab
+        if self.history_frame and profile_name == self.profile_var.get():
+            self.history_frame.add_record(row, summary)
+
 if __name__ == "__main__":
+    multiprocessing.freeze_support() # Large histories are parsed in a worker process (history_data.py)
     app = EMOMApp()
     app.mainloop()
\ No newline at end of file
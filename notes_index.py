@@ -0,0 +1,107 @@
+import os
+import re
+import json
+import bisect
+import storage
+
+# Inverted index over workout notes, one per profile.
+# Maintained on every save like the other derived stores; queries match every
+# term as a prefix ("burp vest" finds "Burpees with a 10kg vest").
+#
+# notes_index.json layout:
+#   {"source_size": <history bytes>,
+#    "docs": [start_time, ...],             # doc id = position
+#    "postings": {term: [doc_id, ...]}}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# profile_name -> (source_size, data, sorted_terms); avoids re-reading JSON per keystroke
+_loaded = {}
+
+def tokenize(text):
+    return _TOKEN.findall((text or "").lower())
+
+def _index_path(profile_name):
+    return os.path.join(storage.get_cache_dir(profile_name), "notes_index.json")
+
+def _read(profile_name):
+    try:
+        with open(_index_path(profile_name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(profile_name, data):
+    path = _index_path(profile_name)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+    _loaded.pop(profile_name, None)
+
+def _add_record(data, record):
+    doc_id = len(data["docs"])
+    data["docs"].append(record.get("start_time", ""))
+    for term in set(tokenize(record.get("workout_notes"))):
+        data["postings"].setdefault(term, []).append(doc_id)
+
+def rebuild(profile_name="Default", save=True):
+    """Re-indexes every note in a profile's history (saved unless save=False)."""
+    data = {"source_size": 0, "docs": [], "postings": {}}
+    for record in storage.iter_history(profile_name):
+        _add_record(data, record)
+    data["source_size"] = storage.get_history_size(profile_name)
+    if save:
+        _write(profile_name, data)
+    return data
+
+def is_current(profile_name="Default"):
+    data = _read(profile_name)
+    return data is not None and data.get("source_size") == storage.get_history_size(profile_name)
+
+def append(profile_name, record, prev_source_size):
+    """Indexes a freshly saved record; rebuilds instead if the index was out of step."""
+    data = _read(profile_name)
+    if data is None or data.get("source_size") != prev_source_size:
+        rebuild(profile_name)
+        return
+
+    _add_record(data, record)
+    data["source_size"] = storage.get_history_size(profile_name)
+    _write(profile_name, data)
+
+def _load(profile_name):
+    size = storage.get_history_size(profile_name)
+    cached = _loaded.get(profile_name)
+    if cached and cached[0] == size:
+        return cached
+
+    data = _read(profile_name)
+    if data is None or data.get("source_size") != size:
+        data = rebuild(profile_name, save=False) # The HistoryWriter thread persists it
+    cached = (size, data, sorted(data["postings"]))
+    _loaded[profile_name] = cached
+    return cached
+
+def _prefix_docs(data, terms, prefix):
+    docs = set()
+    i = bisect.bisect_left(terms, prefix)
+    while i < len(terms) and terms[i].startswith(prefix):
+        docs.update(data["postings"][terms[i]])
+        i += 1
+    return docs
+
+def search(profile_name, query):
+    """Returns the start times of sessions whose notes match every query term, newest first."""
+    words = tokenize(query)
+    if not words:
+        return []
+
+    _, data, terms = _load(profile_name)
+    matches = None
+    # Rarest-looking (longest) terms first keeps the running intersection small
+    for word in sorted(words, key=len, reverse=True):
+        docs = _prefix_docs(data, terms, word)
+        matches = docs if matches is None else matches & docs
+        if not matches:
+            return []
+    return [data["docs"][i] for i in sorted(matches, reverse=True)]
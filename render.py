@@ -0,0 +1,59 @@
+import instrumentation
+
+# Diff-based widget updates.
+# CustomTkinter redraws a widget on every configure(), even when the value is
+# the same. The Renderer remembers what each widget property was last set to,
+# collects real changes, and applies them once per frame with a single
+# configure() per widget.
+
+class Renderer:
+    """Batches widget property changes and drops the ones that change nothing.
+
+    `schedule(func)` must run `func` once on the UI thread soon, e.g.
+    `widget.after_idle`. Any widget updated through a Renderer should only be
+    updated through it, or the cache must be told with `forget`.
+    """
+
+    def __init__(self, schedule):
+        self.schedule = schedule
+        self.applied = {} # widget -> {prop: value} as last configured
+        self.pending = {} # widget -> {prop: value} waiting for flush
+        self.flush_scheduled = False
+
+    def set(self, widget, **props):
+        """Queues property values for `widget`; unchanged ones are ignored."""
+        applied = self.applied.get(widget, {})
+        pending = self.pending.get(widget, {})
+        for prop, value in props.items():
+            if prop in applied and applied[prop] == value:
+                pending.pop(prop, None) # Changed and changed back within a frame
+            else:
+                pending[prop] = value
+        if pending:
+            self.pending[widget] = pending
+            if not self.flush_scheduled:
+                self.flush_scheduled = True
+                self.schedule(self.flush)
+        else:
+            self.pending.pop(widget, None)
+
+    def flush(self):
+        """Applies the queued changes now (one configure() per widget)."""
+        self.flush_scheduled = False
+        pending, self.pending = self.pending, {}
+        with instrumentation.timer("render.flush"):
+            for widget, props in pending.items():
+                widget.configure(**props)
+                self.applied.setdefault(widget, {}).update(props)
+
+    def forget(self, widget=None):
+        """Drops cached values (all widgets if None), e.g. after a direct configure()."""
+        if widget is None:
+            self.applied.clear()
+        else:
+            self.applied.pop(widget, None)
+
+    def discard(self, widget):
+        """Forgets a widget about to be destroyed, dropping its queued changes too."""
+        self.applied.pop(widget, None)
+        self.pending.pop(widget, None)
@@ -0,0 +1,120 @@
+import os
+import json
+import datetime
+import storage
+import hr_zones
+
+# Materialized daily and weekly totals per profile.
+# Updated incrementally on every save_workout, so charts and summaries read a
+# handful of pre-aggregated rows instead of scanning the full history.
+#
+# rollups.json layout:
+#   {"version": VERSION, "source_size": <history bytes>,
+#    "daily":  {"2024-01-31": {"sessions", "minutes", "rounds", "zone_sec", "workouts": [[minutes, notes], ...]}},
+#    "weekly":  {"2024-W05":   {"sessions", "minutes", "rounds", "zone_sec"}},
+#    "monthly": {"2024-01":    {"sessions", "minutes", "rounds", "zone_sec"}}}
+#
+# zone_sec holds seconds per HR zone (hr_zones.py), summed over sessions with HR.
+
+VERSION = 2 # Bumped when bucket fields change, so older files are rebuilt
+
+def _rollups_path(profile_name):
+    return os.path.join(storage.get_cache_dir(profile_name), "rollups.json")
+
+def _empty():
+    return {"version": VERSION, "source_size": 0, "daily": {}, "weekly": {}, "monthly": {}}
+
+def _read(profile_name):
+    try:
+        with open(_rollups_path(profile_name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(profile_name, data):
+    path = _rollups_path(profile_name)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def _is_current(data, source_size):
+    # Files written by an older layout are treated as stale and rebuilt
+    return (data is not None and data.get("version") == VERSION and data.get("source_size") == source_size
+            and all(k in data for k in _empty()))
+
+def _bucket(**extra):
+    return {"sessions": 0, "minutes": 0.0, "rounds": 0, "zone_sec": [0.0] * hr_zones.ZONE_COUNT, **extra}
+
+def add_record(data, record):
+    """Folds one history record into the daily, weekly and monthly tables."""
+    try:
+        start = datetime.datetime.fromisoformat(record["start_time"])
+    except (ValueError, KeyError):
+        return
+
+    try:
+        minutes = float(record.get("total_time_sec") or 0) / 60.0
+    except ValueError:
+        minutes = 0.0
+    try:
+        rounds = int(float(record.get("total_rounds_completed") or 0))
+    except ValueError:
+        rounds = 0
+
+    zones = hr_zones.zone_seconds(record)
+
+    day = data["daily"].setdefault(start.strftime("%Y-%m-%d"), _bucket(workouts=[]))
+    week = data["weekly"].setdefault(start.strftime("%G-W%V"), _bucket())
+    month = data["monthly"].setdefault(start.strftime("%Y-%m"), _bucket())
+    for bucket in (day, week, month):
+        bucket["sessions"] += 1
+        bucket["minutes"] += minutes
+        bucket["rounds"] += rounds
+        if zones:
+            bucket["zone_sec"] = [a + b for a, b in zip(bucket["zone_sec"], zones)]
+    day["workouts"].append([minutes, record.get("workout_notes", "")])
+
+def rebuild(profile_name="Default", save=True):
+    """Recomputes all rollups for a profile from its full history (saved unless save=False)."""
+    data = _empty()
+    for record in storage.iter_history(profile_name):
+        add_record(data, record)
+    data["source_size"] = storage.get_history_size(profile_name)
+    if save:
+        _write(profile_name, data)
+    return data
+
+def is_current(profile_name="Default"):
+    return _is_current(_read(profile_name), storage.get_history_size(profile_name))
+
+def append(profile_name, record, prev_source_size):
+    """Adds a freshly saved record; rebuilds instead if the rollups were out of step."""
+    data = _read(profile_name)
+    if not _is_current(data, prev_source_size):
+        rebuild(profile_name)
+        return
+
+    add_record(data, record)
+    data["source_size"] = storage.get_history_size(profile_name)
+    _write(profile_name, data)
+
+def load(profile_name="Default"):
+    """Returns the rollup tables for a profile, recomputed in memory if the file is stale.
+
+    Never writes: only the HistoryWriter thread updates the file (storage.rebuild_derived).
+    """
+    data = _read(profile_name)
+    if not _is_current(data, storage.get_history_size(profile_name)):
+        data = rebuild(profile_name, save=False)
+    return data
+
+def recent_days(profile_name="Default", count=7):
+    """Last `count` days that have workouts, oldest first, as (date_str, daily_row)."""
+    daily = load(profile_name)["daily"]
+    return [(d, daily[d]) for d in sorted(daily)[-count:]]
+
+def weekly(profile_name="Default"):
+    """All weekly rows, oldest first, as (iso_week_str, weekly_row)."""
+    weeks = load(profile_name)["weekly"]
+    return [(w, weeks[w]) for w in sorted(weeks)]
@@ -0,0 +1,37 @@
+import os
+import sys
+import time
+
+# Lightweight launch profiler.
+# Run with EMOM_STARTUP_TIMING=1 to print how long each stage of startup took,
+# measured from the moment this module was imported (main.py imports it first).
+
+ENABLED = bool(os.environ.get("EMOM_STARTUP_TIMING"))
+
+# Slow imports that should only load on first use; the report lists any already in
+HEAVY_MODULES = ("bleak", "matplotlib", "numpy", "PIL")
+
+_T0 = time.perf_counter()
+_marks = [] # [(label, perf_counter), ...] not yet reported
+_last_reported = _T0
+
+def mark(label):
+    """Records that a stage finished now."""
+    if ENABLED:
+        _marks.append((label, time.perf_counter()))
+
+def report(title="Startup timing"):
+    """Prints the stages recorded since the last report."""
+    global _last_reported
+    if not ENABLED or not _marks:
+        return
+
+    print(f"{title}:")
+    prev = _last_reported
+    for label, t in _marks:
+        print(f"  {label:<30} +{(t - prev) * 1000:8.1f} ms   (at {(t - _T0) * 1000:8.1f} ms)")
+        prev = t
+    _last_reported = prev
+    _marks.clear()
+    loaded = [name for name in HEAVY_MODULES if name in sys.modules]
+    print(f"  heavy modules loaded: {', '.join(loaded) or 'none'}")
@@ -1,9 +1,14 @@
 import csv
 import os
+import io
+import gzip
+import hashlib
 import glob
 import sys
 import json
 import datetime
+import copy
+import importlib
 
 # Define base path (User Documents)
 DOCS_DIR = os.path.expanduser("~/Documents/EMOM Timer")
@@ -15,6 +20,25 @@ def _ensure_dir():
 
 LEGACY_FILE = os.path.join(DOCS_DIR, "workout_history.csv")
 
+# Parsed profiles.json, reused until the file changes: (path, mtime_ns, size, data)
+_profiles_cache = None
+
+def _read_profiles():
+    """Contents of profiles.json (a copy callers may modify). Raises OSError/ValueError like open + json.load."""
+    global _profiles_cache
+    st = os.stat(PROFILES_FILE)
+    key = (PROFILES_FILE, st.st_mtime_ns, st.st_size)
+    if _profiles_cache is None or _profiles_cache[:3] != key:
+        with open(PROFILES_FILE, 'r') as f:
+            _profiles_cache = key + (json.load(f),)
+    return copy.deepcopy(_profiles_cache[3])
+
+def _write_profiles(data):
+    global _profiles_cache
+    with open(PROFILES_FILE, 'w') as f:
+        json.dump(data, f, indent=4)
+    _profiles_cache = None
+
 def _generate_filename(profile_name):
     safe_name = profile_name.lower().replace(" ", "_")
     return os.path.join(DOCS_DIR, f"{safe_name}_workout_history.csv")
@@ -25,14 +49,12 @@ def get_filename(profile_name="Default"):
     # Try to get from JSON
     if os.path.exists(PROFILES_FILE):
         try:
-            with open(PROFILES_FILE, 'r') as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                if profile_name in profiles:
-                    # Return absolute path assuming filename in JSON is relative or absolute
-                    # Let's verify if we store relative. Plan says "default_workout_history.csv".
-                    fname = profiles[profile_name]["filename"]
-                    return os.path.join(DOCS_DIR, fname)
+            profiles = _read_profiles().get("profiles", {})
+            if profile_name in profiles:
+                # Return absolute path assuming filename in JSON is relative or absolute
+                # Let's verify if we store relative. Plan says "default_workout_history.csv".
+                fname = profiles[profile_name]["filename"]
+                return os.path.join(DOCS_DIR, fname)
         except Exception as e:
             print(f"Error reading profiles.json: {e}")
             
@@ -45,9 +67,7 @@ def load_profiles():
     # Check for profiles.json
     if os.path.exists(PROFILES_FILE):
         try:
-            with open(PROFILES_FILE, 'r') as f:
-                data = json.load(f)
-                return sorted(list(data.get("profiles", {}).keys()))
+            return sorted(list(_read_profiles().get("profiles", {}).keys()))
         except Exception as e:
             print(f"Error loading profiles.json: {e}")
             return ["Default"]
@@ -103,8 +123,7 @@ def load_profiles():
         
     # Save JSON
     try:
-        with open(PROFILES_FILE, 'w') as f:
-            json.dump(profiles_data, f, indent=4)
+        _write_profiles(profiles_data)
     except Exception as e:
         print(f"Error creating profiles.json: {e}")
         
@@ -118,8 +137,7 @@ def add_profile(profile_name, max_hr=None, max_prework_hr=None):
     data = {"profiles": {}, "last_used_profile": "Default"}
     if os.path.exists(PROFILES_FILE):
         try:
-            with open(PROFILES_FILE, 'r') as f:
-                data = json.load(f)
+            data = _read_profiles()
         except:
             pass
 
@@ -133,8 +151,7 @@ def add_profile(profile_name, max_hr=None, max_prework_hr=None):
             "max_prework_hr": max_prework_hr
         }
         
-        with open(PROFILES_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        _write_profiles(data)
             
     return data["profiles"][profile_name]["filename"]
 
@@ -144,8 +161,7 @@ def update_profile(profile_name, max_hr=None, max_prework_hr=None):
         return
         
     try:
-        with open(PROFILES_FILE, 'r') as f:
-            data = json.load(f)
+        data = _read_profiles()
             
         if profile_name in data["profiles"]:
             # Update fields if provided
@@ -154,9 +170,8 @@ def update_profile(profile_name, max_hr=None, max_prework_hr=None):
             if max_prework_hr is not None:
                 data["profiles"][profile_name]["max_prework_hr"] = max_prework_hr
                 
-            with open(PROFILES_FILE, 'w') as f:
-                json.dump(data, f, indent=4)
-                print(f"Updated profile {profile_name}: max_hr={max_hr}, max_prework_hr={max_prework_hr}")
+            _write_profiles(data)
+            print(f"Updated profile {profile_name}: max_hr={max_hr}, max_prework_hr={max_prework_hr}")
                 
     except Exception as e:
         print(f"Error updating profile: {e}")
@@ -167,18 +182,14 @@ def get_profile_details(profile_name):
         return {}
         
     try:
-        with open(PROFILES_FILE, 'r') as f:
-            data = json.load(f)
-            return data.get("profiles", {}).get(profile_name, {})
+        return _read_profiles().get("profiles", {}).get(profile_name, {})
     except Exception:
         return {}
 
 def get_last_used_profile():
     if os.path.exists(PROFILES_FILE):
             try:
-                with open(PROFILES_FILE, 'r') as f:
-                    data = json.load(f)
-                    return data.get("last_used_profile", "Default")
+                return _read_profiles().get("last_used_profile", "Default")
             except:
                 pass
     return "Default"
@@ -186,13 +197,13 @@ def get_last_used_profile():
 def update_last_used_profile(profile_name):
     if os.path.exists(PROFILES_FILE):
             try:
-                with open(PROFILES_FILE, 'r') as f:
-                    data = json.load(f)
+                data = _read_profiles()
+                if data.get("last_used_profile") == profile_name:
+                    return # Unchanged; skip the rewrite
                 
                 data["last_used_profile"] = profile_name
                 
-                with open(PROFILES_FILE, 'w') as f:
-                    json.dump(data, f, indent=4)
+                _write_profiles(data)
             except Exception as e:
                 print(f"Error updating last profile: {e}")
 
@@ -200,32 +211,458 @@ def update_last_used_profile(profile_name):
 def get_available_profiles():
     return load_profiles()
 
-def save_workout(row, profile_name="Default"):
+# --- History Schema ---
+# Every history file starts with a version marker line, then the header row.
+# Files written before versioning (no marker) are schema 1.
+SCHEMA_VERSION = 5
+SCHEMA_MARKER = "# emom_history schema="
+
+HISTORY_COLUMNS = [
+    "start_time",
+    "end_time",
+    "total_rounds_completed",
+    "work_time_sec",
+    "rest_time_sec",
+    "total_time_sec",
+    "workout_notes",
+    "trimp", # Banister training impulse from the HR trace, blank without HR (see training_load.py)
+    # Seconds spent in each HR zone (hr_zones.py), blank without HR
+    "zone0_sec", "zone1_sec", "zone2_sec", "zone3_sec", "zone4_sec", "zone5_sec",
+    # Work-phase part of the above; the rest phase (and prep) is the remainder
+    "zone0_work_sec", "zone1_work_sec", "zone2_work_sec", "zone3_work_sec", "zone4_work_sec", "zone5_work_sec",
+]
+
+# from_version -> migration(header) returning (new_header, convert(row) -> row)
+_MIGRATIONS = {}
+
+def migration(from_version):
+    """Registers a migration from `from_version` to `from_version + 1`."""
+    def register(func):
+        _MIGRATIONS[from_version] = func
+        return func
+    return register
+
+def _add_columns(*names):
+    """Builds a migration that appends empty columns, the common case for new fields."""
+    def migrate(header):
+        return header + list(names), lambda row: row + [""] * len(names)
+    return migrate
+
+# Columns as of schema 2, the target of the unversioned-file migration
+_SCHEMA_2_COLUMNS = HISTORY_COLUMNS[:7]
+
+# Header spellings seen in unversioned files
+_LEGACY_HEADER_NAMES = {
+    "start time": "start_time",
+    "end time": "end_time",
+    "rounds": "total_rounds_completed",
+    "work duration": "work_time_sec",
+    "rest duration": "rest_time_sec",
+    "total time": "total_time_sec",
+    "notes": "workout_notes",
+}
+
+@migration(1)
+def _migrate_unversioned(header):
+    """Maps legacy Title Case / snake_case headers onto the schema 2 columns.
+
+    Old files gained columns without their header being updated. Unnamed
+    trailing values are treated as notes first (what the History tab used to
+    assume), then as the remaining missing columns in order.
+    """
+    names = [_LEGACY_HEADER_NAMES.get(h.strip().lower(), h.strip().lower()) for h in header]
+    missing = [c for c in _SCHEMA_2_COLUMNS if c not in names]
+    if "workout_notes" in missing:
+        missing.remove("workout_notes")
+        missing.insert(0, "workout_notes")
+
+    def convert(row):
+        values = dict(zip(names, row))
+        for col, value in zip(missing, row[len(names):]):
+            values[col] = value
+        return [values.get(c, "") for c in _SCHEMA_2_COLUMNS]
+
+    return list(_SCHEMA_2_COLUMNS), convert
+
+migration(2)(_add_columns("trimp"))
+migration(3)(_add_columns("zone0_sec", "zone1_sec", "zone2_sec", "zone3_sec", "zone4_sec", "zone5_sec"))
+migration(4)(_add_columns("zone0_work_sec", "zone1_work_sec", "zone2_work_sec",
+                          "zone3_work_sec", "zone4_work_sec", "zone5_work_sec"))
+
+def _read_schema(file):
+    """Reads the marker and header from an open history file. Returns (version, header)."""
+    reader = csv.reader(file)
+    first = next(reader, None)
+    if first and first[0].startswith(SCHEMA_MARKER):
+        return int(first[0][len(SCHEMA_MARKER):]), next(reader, [])
+    return 1, first or []
+
+def _write_schema(writer, header):
+    writer.writerow([f"{SCHEMA_MARKER}{SCHEMA_VERSION}"])
+    writer.writerow(header)
+
+def _read_history_rows(file):
+    """Reads an open history file of any schema version.
+
+    Returns (version, header, rows); rows are migrated to SCHEMA_VERSION on the fly.
+    """
+    version, header = _read_schema(file)
+    converters = []
+    for v in range(version, SCHEMA_VERSION):
+        header, convert = _MIGRATIONS[v](header)
+        converters.append(convert)
+
+    def rows():
+        for row in csv.reader(file):
+            if not row:
+                continue
+            for convert in converters:
+                row = convert(row)
+            yield row
+
+    return version, header, rows()
+
+def migrate_history_file(filename):
+    """Brings a history file up to SCHEMA_VERSION in a single streaming pass.
+
+    Returns True if the file was rewritten.
+    """
+    if not os.path.exists(filename):
+        return False
+
+    with open(filename, mode='r', newline='') as file:
+        version, header, rows = _read_history_rows(file)
+        if version >= SCHEMA_VERSION:
+            return False
+
+        tmp_name = filename + ".migrating"
+        with open(tmp_name, mode='w', newline='') as out:
+            writer = csv.writer(out)
+            _write_schema(writer, header)
+            writer.writerows(rows)
+            out.flush()
+            os.fsync(out.fileno())
+
+    os.replace(tmp_name, filename)
+    print(f"Migrated {os.path.basename(filename)} from schema {version} to {SCHEMA_VERSION}")
+    return True
+
+# --- Archived Segments ---
+# Closed years are moved out of the live CSV into gzip-compressed, read-only
+# yearly segments ("<history>_<year>.csv.gz", same layout as the live file).
+# "<history>_segments.json" indexes them with date range, row count and checksum
+# so reads can skip segments outside the requested dates.
+
+def _history_base(profile_name):
+    return os.path.splitext(get_filename(profile_name))[0]
+
+def _segment_index_path(profile_name):
+    return _history_base(profile_name) + "_segments.json"
+
+def _read_segment_index(profile_name):
+    try:
+        with open(_segment_index_path(profile_name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def get_segments(profile_name="Default"):
+    """Returns the archived segment index entries for a profile, oldest first."""
+    return sorted(_read_segment_index(profile_name).get("segments", []), key=lambda s: s["year"])
+
+def _write_segment_index(profile_name, segments, checked=None):
+    """`checked` records the year and live file size of the last compaction check."""
+    path = _segment_index_path(profile_name)
+    index = {"segments": sorted(segments, key=lambda s: s["year"])}
+    if checked:
+        index["checked"] = checked
+    with open(path + ".tmp", 'w') as f:
+        json.dump(index, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(path + ".tmp", path)
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _SegmentWriter:
+    """Writes one yearly segment to a temp file, tracking its index entry."""
+
+    def __init__(self, path, year):
+        self.path = path
+        self.year = year
+        self.raw = open(path + ".tmp", 'wb')
+        self.gz = gzip.GzipFile(fileobj=self.raw, mode='wb')
+        self.text = io.TextIOWrapper(self.gz, newline='')
+        self.writer = csv.writer(self.text)
+        _write_schema(self.writer, HISTORY_COLUMNS)
+        self.starts = set()
+        self.first = None
+        self.last = None
+
+    def write(self, row):
+        start = row[0]
+        if start in self.starts:
+            return
+        self.starts.add(start)
+        self.first = start if self.first is None else min(self.first, start)
+        self.last = start if self.last is None else max(self.last, start)
+        self.writer.writerow(row)
+
+    def commit(self):
+        """Closes and durably swaps the segment in. Returns its index entry."""
+        self.text.flush()
+        self.gz.close()
+        self.raw.flush()
+        os.fsync(self.raw.fileno())
+        self.raw.close()
+
+        if os.path.exists(self.path):
+            os.chmod(self.path, 0o644)
+        os.replace(self.path + ".tmp", self.path)
+        os.chmod(self.path, 0o444)
+
+        return {
+            "year": self.year,
+            "file": os.path.basename(self.path),
+            "first": self.first,
+            "last": self.last,
+            "rows": len(self.starts),
+            "sha256": _sha256(self.path),
+        }
+
+def compact_history(profile_name="Default", today=None):
+    """Moves sessions from closed years out of the live history into yearly segments.
+
+    Rows landing in a year that already has a segment are merged into it
+    (deduplicated on start time). Returns the number of rows archived.
+    Nothing is written unless there is something to archive, and the live
+    file is only scanned again once it has grown or the year has turned.
+    """
     filename = get_filename(profile_name)
+    if not os.path.exists(filename):
+        return 0
+    current_year = (today or datetime.date.today()).year
+    migrate_history_file(filename)
+
+    index = _read_segment_index(profile_name)
+    checked = {"year": current_year, "size": os.path.getsize(filename)}
+    if index.get("checked") == checked:
+        return 0
+    segments = {s["year"]: s for s in get_segments(profile_name)}
+    if not _has_closed_year_rows(filename, current_year):
+        _write_segment_index(profile_name, segments.values(), checked)
+        return 0
+    writers = {}
+    archived = 0
+    live_tmp = filename + ".compacting"
+
+    with open(filename, mode='r', newline='') as file, open(live_tmp, mode='w', newline='') as live:
+        _, header, rows = _read_history_rows(file)
+        live_writer = csv.writer(live)
+        _write_schema(live_writer, header)
+        for row in rows:
+            year = _row_year(row, current_year)
+            if year >= current_year:
+                live_writer.writerow(row)
+                continue
+
+            if year not in writers:
+                writers[year] = _SegmentWriter(f"{_history_base(profile_name)}_{year}.csv.gz", year)
+                if year in segments:
+                    for old in _iter_segment_rows(profile_name, segments[year]):
+                        writers[year].write(old)
+            writers[year].write(row)
+            archived += 1
+        live.flush()
+        os.fsync(live.fileno())
+
+    # Segments and index first, live file last: a crash in between leaves
+    # duplicates (dropped on the next compaction) rather than losing rows.
+    for year, writer in writers.items():
+        segments[year] = writer.commit()
+    checked["size"] = os.path.getsize(live_tmp)
+    _write_segment_index(profile_name, segments.values(), checked)
+    os.replace(live_tmp, filename)
+
+    print(f"Archived {archived} sessions for {profile_name} into {len(writers)} yearly segment(s)")
+    rebuild_derived(profile_name)
+    return archived
+
+def _row_year(row, default):
+    try:
+        return datetime.datetime.fromisoformat(row[0]).year
+    except (ValueError, IndexError):
+        return default # Keep unreadable rows where the user can see them
+
+def _has_closed_year_rows(filename, current_year):
+    """Read-only scan; history is mostly in date order, so archivable rows show up first."""
+    with open(filename, mode='r', newline='') as file:
+        _, _, rows = _read_history_rows(file)
+        return any(_row_year(row, current_year) < current_year for row in rows)
+
+def verify_segments(profile_name="Default"):
+    """Checks every archived segment against its index. Returns a list of problems."""
+    problems = []
+    for seg in get_segments(profile_name):
+        path = os.path.join(DOCS_DIR, seg["file"])
+        if not os.path.exists(path):
+            problems.append(f"{seg['file']}: missing")
+        elif _sha256(path) != seg["sha256"]:
+            problems.append(f"{seg['file']}: checksum mismatch")
+    return problems
+
+def _iter_segment_rows(profile_name, seg):
+    with gzip.open(os.path.join(DOCS_DIR, seg["file"]), mode='rt', newline='') as file:
+        _, _, rows = _read_history_rows(file)
+        yield from rows
+
+# --- Derived Data ---
+# Modules that keep per-profile data derived from history (caches, rollups, search index).
+# Each provides append(profile_name, record, prev_source_size) and rebuild(profile_name).
+# Imported on demand so e.g. numpy is only loaded once history is actually written.
+DERIVED_MODULES = ["history_cache", "rollups", "notes_index", "training_load"]
+CACHE_DIR_NAME = ".cache"
+
+def get_cache_dir(profile_name="Default"):
+    """Directory for a profile's derived, rebuildable data."""
+    base = os.path.splitext(os.path.basename(get_filename(profile_name)))[0]
+    path = os.path.join(DOCS_DIR, CACHE_DIR_NAME, base)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_history_size(profile_name="Default"):
+    """Total bytes of live history plus archived segments; derived data records it to detect staleness."""
+    paths = [get_filename(profile_name)] + [os.path.join(DOCS_DIR, s["file"]) for s in get_segments(profile_name)]
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+def _update_derived(profile_name, record, prev_size):
+    for name in DERIVED_MODULES:
+        try:
+            importlib.import_module(name).append(profile_name, record, prev_size)
+        except Exception as e:
+            print(f"Error updating {name}: {e}")
+
+def rebuild_derived(profile_name="Default", stale_only=False):
+    """Rebuilds every derived store (or only the stale ones) for a profile from its history.
+
+    Derived stores are only ever written here and in _update_derived, both run
+    on the HistoryWriter thread; their load() functions never write, so a
+    reader can't race a save.
+    """
+    for name in DERIVED_MODULES:
+        module = importlib.import_module(name)
+        try:
+            if not (stale_only and module.is_current(profile_name)):
+                module.rebuild(profile_name)
+        except Exception as e:
+            print(f"Error rebuilding {name}: {e}")
+
+def append_workout(record, profile_name="Default"):
+    """Appends a history record (dict keyed by HISTORY_COLUMNS) and fsyncs it. Raises OSError on failure.
+
+    A failed append is rolled back, so retrying it can't duplicate the session.
+    """
+    filename = get_filename(profile_name)
+    migrate_history_file(filename)
     file_exists = os.path.isfile(filename)
-    
+    file_size = os.path.getsize(filename) if file_exists else 0
+    prev_size = get_history_size(profile_name)
+
     try:
         with open(filename, mode='a', newline='') as file:
             writer = csv.writer(file)
             if not file_exists:
-                writer.writerow(["Start Time", "End Time", "Rounds", "Work Duration", "Rest Duration", "Total Time", "Notes"])
-            writer.writerow(row)
+                _write_schema(writer, HISTORY_COLUMNS)
+            writer.writerow([record.get(c, "") for c in HISTORY_COLUMNS])
+            file.flush()
+            os.fsync(file.fileno())
+    except OSError:
+        # The row may be on disk even though flush/fsync failed
+        try:
+            if file_exists:
+                os.truncate(filename, file_size)
+            elif os.path.exists(filename):
+                os.remove(filename)
+        except OSError as e:
+            print(f"Error rolling back history append: {e}")
+        raise
+
+    _update_derived(profile_name, record, prev_size)
+
+def append_workouts(records, profile_name="Default"):
+    """Appends a batch of records with one open/fsync. Raises OSError on failure.
+
+    Derived stores are not updated row by row; they notice the size change and
+    rebuild on next load (or call rebuild_derived once the batch is done).
+    """
+    filename = get_filename(profile_name)
+    migrate_history_file(filename)
+    file_exists = os.path.isfile(filename)
+
+    with open(filename, mode='a', newline='') as file:
+        writer = csv.writer(file)
+        if not file_exists:
+            _write_schema(writer, HISTORY_COLUMNS)
+        for record in records:
+            writer.writerow([record.get(c, "") for c in HISTORY_COLUMNS])
+        file.flush()
+        os.fsync(file.fileno())
+
+def save_workout(record, profile_name="Default"):
+    try:
+        append_workout(record, profile_name)
     except IOError as e:
         print(f"Error saving to CSV: {e}")
 
-def load_history(profile_name="Default"):
-    filename = get_filename(profile_name)
-    history = []
-    if not os.path.exists(filename):
-        return history
-        
+def _iso_bound(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+def iter_history(profile_name="Default", start=None, end=None):
+    """Yields history records as dicts keyed by HISTORY_COLUMNS.
+
+    Archived segments come first (oldest year first), then the live file.
+    `start` (inclusive) and `end` (exclusive) limit the sessions returned, by
+    datetime/date or ISO string; segments outside the range are not opened.
+    """
+    start_iso, end_iso = _iso_bound(start), _iso_bound(end)
+
+    def in_range(record):
+        return ((start_iso is None or record["start_time"] >= start_iso) and
+                (end_iso is None or record["start_time"] < end_iso))
+
+    def to_record(header, row):
+        record = dict.fromkeys(HISTORY_COLUMNS, "")
+        record.update(zip(header, row))
+        return record
+
     try:
-        with open(filename, mode='r') as file:
-            reader = csv.reader(file)
-            next(reader, None)  # Skip header
-            for row in reader:
-                history.append(row)
+        for seg in get_segments(profile_name):
+            if (end_iso is not None and seg["first"] >= end_iso) or (start_iso is not None and seg["last"] < start_iso):
+                continue
+            for row in _iter_segment_rows(profile_name, seg):
+                record = to_record(HISTORY_COLUMNS, row)
+                if in_range(record):
+                    yield record
+
+        filename = get_filename(profile_name)
+        if not os.path.exists(filename):
+            return
+        migrate_history_file(filename)
+        with open(filename, mode='r', newline='') as file:
+            _, header, rows = _read_history_rows(file)
+            for row in rows:
+                record = to_record(header, row)
+                if in_range(record):
+                    yield record
     except IOError as e:
         print(f"Error loading CSV: {e}")
-        
-    return history
+
+def load_history(profile_name="Default", start=None, end=None):
+    return list(iter_history(profile_name, start, end))
@@ -0,0 +1,18 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import storage
+
+class StorageTestCase(unittest.TestCase):
+    """Points storage at a fresh temporary folder (`self.tmp`) for each test."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name, value in [("DOCS_DIR", self.tmp.name),
+                            ("PROFILES_FILE", os.path.join(self.tmp.name, "profiles.json"))]:
+            patcher = mock.patch.object(storage, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
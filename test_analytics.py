@@ -0,0 +1,84 @@
+import datetime
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+
+try:
+    import numpy
+    import analytics
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestAnalytics(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        analytics._cached.clear()
+        self.today = datetime.date(2024, 3, 13) # Wednesday
+
+    def _save(self, start, rounds, work=60, rest=0, total=600):
+        storage.save_workout({"start_time": start, "end_time": start, "total_rounds_completed": rounds,
+                              "work_time_sec": work, "rest_time_sec": rest, "total_time_sec": total,
+                              "workout_notes": ""}, "Stats")
+
+    def test_empty_profile(self):
+        stats = analytics.compute("Stats", self.today)
+        self.assertEqual(stats["sessions"], 0)
+        self.assertEqual(analytics.summary("Stats", self.today), "")
+
+    def test_streaks(self):
+        for day in ("2024-03-01", "2024-03-02", "2024-03-03", "2024-03-03", "2024-03-11", "2024-03-12"):
+            self._save(f"{day}T07:00:00", 10)
+
+        streak = analytics.compute("Stats", self.today)["streak"]
+        self.assertEqual(streak, {"current": 2, "longest": 3})
+        # Two days later the run is broken
+        later = analytics.compute("Stats", datetime.date(2024, 3, 15))["streak"]
+        self.assertEqual(later["current"], 0)
+
+    def test_weekly_volume_and_rolling_load(self):
+        self._save("2024-02-19T07:00:00", 10, total=1200) # Week of Feb 19: 20 min
+        self._save("2024-03-11T07:00:00", 10, total=600)  # This week: 10 min
+        self._save("2024-03-13T07:00:00", 10, total=600)
+
+        stats = analytics.compute("Stats", self.today)
+        self.assertEqual(stats["weekly"][0], ("2024-02-19", 20.0, 1))
+        self.assertEqual(stats["weekly"][-1], ("2024-03-11", 20.0, 2))
+        self.assertEqual(len(stats["weekly"]), 4)
+        self.assertAlmostEqual(stats["rolling_load"][-1], 10.0) # (20 + 0 + 0 + 20) / 4
+        self.assertEqual(stats["consistency"], 50.0)
+
+    def test_future_sessions_ignored_in_series(self):
+        self._save("2024-03-12T07:00:00", 10, total=600)
+        self._save("2024-04-20T07:00:00", 10, total=600) # Clock was wrong / imported from the future
+
+        stats = analytics.compute("Stats", self.today)
+        self.assertEqual(stats["weekly"][-1], ("2024-03-11", 10.0, 1))
+        self.assertEqual(len(stats["weekly"]), 1)
+        self.assertEqual(stats["consistency"], 100.0)
+        self.assertEqual(stats["streak"], {"current": 1, "longest": 1})
+
+        analytics._cached.clear()
+        storage.save_workout({"start_time": "2024-05-01T07:00:00", "total_time_sec": 60}, "Future")
+        self.assertEqual(analytics.compute("Future", self.today)["weekly"], [("2024-03-11", 0.0, 0)])
+
+    def test_personal_bests(self):
+        self._save("2024-03-01T07:00:00", 10, work=60, rest=0)
+        self._save("2024-03-02T07:00:00", 14, work=60, rest=0, total=2400)
+        self._save("2024-03-03T07:00:00", 12, work=45, rest=15)
+        self._save("2024-03-04T07:00:00", 9, work=45, rest=15)
+
+        stats = analytics.compute("Stats", self.today)
+        self.assertEqual(stats["bests"]["60/0"], {"rounds": 14, "start_time": "2024-03-02T07:00:00"})
+        self.assertEqual(stats["bests"]["45/15"]["rounds"], 12)
+        self.assertEqual(stats["longest_session"], {"minutes": 40.0, "start_time": "2024-03-02T07:00:00"})
+
+    def test_cache_invalidated_on_save(self):
+        self._save("2024-03-12T07:00:00", 10)
+        self.assertEqual(analytics.compute("Stats", self.today)["sessions"], 1)
+        self._save("2024-03-13T07:00:00", 10)
+        self.assertEqual(analytics.compute("Stats", self.today)["sessions"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import os
+import struct
+import time
+import tempfile
+import threading
+import unittest
+import wave
+from unittest import mock
+
+import audio
+from workout import Cue
+
+try:
+    import numpy
+    import audio_mixer
+except ImportError:
+    numpy = None
+
+def _write_wav(path, frames, rate=48000, channels=2, value=16384):
+    with wave.open(path, 'wb') as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(struct.pack(f"<{frames * channels}h", *([value] * frames * channels)))
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestMixer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_load_wav(self):
+        path = os.path.join(self.tmp.name, "a.wav")
+        _write_wav(path, 100)
+        samples = audio_mixer.load_wav(path)
+        self.assertEqual(samples.shape, (100, 2))
+        self.assertAlmostEqual(float(samples[0, 0]), 0.5)
+
+    def test_load_wav_converts_mono_and_rate(self):
+        path = os.path.join(self.tmp.name, "mono.wav")
+        _write_wav(path, 100, rate=24000, channels=1)
+        samples = audio_mixer.load_wav(path)
+        self.assertEqual(samples.shape, (200, 2))
+
+    def test_overlapping_cues_are_summed_and_clipped(self):
+        mixer = audio_mixer.Mixer()
+        cue = numpy.full((100, 2), 0.6, dtype=numpy.float32)
+        mixer.add(cue)
+        mixer.add(cue)
+        out = mixer.mix(150)
+        self.assertEqual(float(out[0, 0]), 1.0) # 1.2 clipped
+        self.assertEqual(float(out[120, 0]), 0.0)
+        self.assertEqual(mixer.voices, [])
+        self.assertEqual(len(mixer.onsets), 2)
+
+    def test_cue_spans_blocks(self):
+        mixer = audio_mixer.Mixer()
+        mixer.add(numpy.full((100, 2), 0.5, dtype=numpy.float32))
+        self.assertEqual(float(mixer.mix(60)[59, 1]), 0.5)
+        second = mixer.mix(60)
+        self.assertEqual((float(second[39, 0]), float(second[40, 0])), (0.5, 0.0))
+        self.assertEqual(len(mixer.onsets), 1)
+
+    def test_delayed_cue_starts_later(self):
+        mixer = audio_mixer.Mixer(sample_rate=1000)
+        mixer.add(numpy.ones((10, 2), dtype=numpy.float32), delay=1.0)
+        self.assertFalse(mixer.mix(500).any())
+        self.assertEqual(len(mixer.onsets), 0)
+
+    def test_output_latency_compensated(self):
+        mixer = audio_mixer.Mixer(sample_rate=1000)
+        mixer.add(numpy.ones((10, 2), dtype=numpy.float32), delay=0.3)
+        out = mixer.mix(500, output_latency=0.1)
+        # Starts ~100 ms early so it is heard at the due time
+        self.assertAlmostEqual(int(numpy.argmax(out[:, 0] > 0)), 200, delta=5)
+        self.assertLess(abs(mixer.onsets[0]), 0.005)
+
+    def test_cancel_drops_unstarted_cues(self):
+        mixer = audio_mixer.Mixer(sample_rate=1000)
+        cue = numpy.ones((100, 2), dtype=numpy.float32)
+        mixer.add(cue, key="now")
+        mixer.add(cue, delay=1.0, key="later")
+        mixer.mix(50)
+        mixer.cancel("now") # Already playing: finishes
+        mixer.cancel("later")
+        self.assertTrue(mixer.mix(50).any())
+        self.assertEqual(mixer.voices, [])
+
+    def test_tone(self):
+        beep = audio_mixer.tone(880, 0.1)
+        self.assertEqual(beep.shape, (4800, 2))
+        self.assertEqual(float(beep[0, 0]), 0.0) # Faded in
+
+class TestCommandSink(unittest.TestCase):
+    def setUp(self):
+        self.sink = audio.CommandSink("sounds", ["true"])
+        self.sink.start(None)
+        self.played = threading.Semaphore(0)
+        patcher = mock.patch.object(self.sink, "_play", side_effect=lambda path: self.played.release())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fired_and_unkeyed_timers_not_kept(self):
+        self.sink.cue("Glass", 0)
+        self.sink.cue("Glass", 0, key="1:WORK:end")
+        self.sink.cue("Hero", 60, key="1:WORK:count1")
+        for _ in range(2):
+            self.assertTrue(self.played.acquire(timeout=5))
+        self.assertEqual(list(self.sink.timers), ["1:WORK:count1"])
+        self.sink.cancel("1:WORK:count1")
+        self.assertEqual(self.sink.timers, {})
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestAudioEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        for name in audio.CUE_NAMES:
+            _write_wav(os.path.join(self.tmp.name, f"{name}.wav"), 4800)
+        self.sink = audio.NullSink(clocked=False)
+        self.engine = audio.AudioEngine(self.tmp.name, sink=self.sink)
+        self.engine._open()
+
+    def test_repeated_cue_is_spaced(self):
+        self.engine.play("Hero", 2)
+        self.assertEqual(len(self.sink.mixer.commands), 2)
+        self.assertTrue(self.sink.pull(480).any())
+        self.assertEqual(len(self.sink.mixer.voices), 2) # Second ding waiting its turn
+
+    def test_onset_latency_measured(self):
+        self.engine.play("Glass")
+        self.sink.pull()
+        median, worst = self.engine.latency_ms()
+        self.assertLess(worst, 50)
+
+    def test_keyed_cue_plays_once_until_cancel(self):
+        self.engine.play("Glass", key="1:WORK:end")
+        self.engine.play("Glass", key="1:WORK:end")
+        self.assertEqual(len(self.sink.mixer.commands), 1)
+        self.engine.cancel()
+        self.engine.play("Glass", key="1:WORK:end")
+        self.assertEqual(len(self.sink.mixer.commands), 3) # add, cancel, add
+
+    def test_schedule_relative_to_tick(self):
+        cues = [Cue("0:PREP:count1", 9.0, "Beep"), Cue("0:PREP:end", 10.0, "Glass", 2)]
+        self.engine.schedule(cues, time.perf_counter())
+        dues = [command[2] for command in self.sink.mixer.commands]
+        self.assertEqual(len(dues), 3)
+        self.assertAlmostEqual(dues[1] - dues[0], 1.0, places=2)
+        self.assertAlmostEqual(dues[2] - dues[1], audio.REPEAT_GAP, places=2)
+
+    def test_unknown_cue_ignored(self):
+        self.engine.play("Missing")
+        self.assertEqual(len(self.sink.mixer.commands), 0)
+        self.assertIsNone(self.engine.latency_ms())
+
+    def test_not_ready_drops_cues(self):
+        engine = audio.AudioEngine(self.tmp.name, sink=audio.NullSink(clocked=False))
+        engine.play("Glass") # Before start(); must not raise
+        self.assertIsNone(engine.latency_ms())
+
+if __name__ == '__main__':
+    unittest.main()
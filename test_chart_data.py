@@ -0,0 +1,92 @@
+import datetime
+import unittest
+
+import chart_data
+from chart_data import BarIndex
+
+class TestBarIndex(unittest.TestCase):
+    def setUp(self):
+        # Three days: two workouts, none, one
+        self.index = BarIndex(range(3), [[10, 5], [], [20]], width=0.5)
+
+    def test_finds_stack_level(self):
+        self.assertEqual(self.index.find(0.0, 3), (0, 0))
+        self.assertEqual(self.index.find(0.1, 12), (1, 0))
+        self.assertEqual(self.index.find(2.2, 19.9), (0, 2))
+
+    def test_misses(self):
+        self.assertIsNone(self.index.find(0.5, 3)) # Between bars
+        self.assertIsNone(self.index.find(0.0, 15)) # Above the stack
+        self.assertIsNone(self.index.find(1.0, 1)) # Empty day
+        self.assertIsNone(self.index.find(-0.3, 1)) # Left of the first bar
+        self.assertIsNone(self.index.find(0.0, -1))
+        self.assertIsNone(self.index.find(None, None)) # Outside the axes data area
+
+    def test_zero_height_segments_skipped(self):
+        index = BarIndex([0], [[10, 0, 5]], width=0.5)
+        self.assertEqual(index.find(0, 10), (2, 0))
+        self.assertEqual(index.find(0, 9.9), (0, 0))
+
+    def test_push(self):
+        self.index.push(1, 8)
+        self.index.push(0, 2)
+        self.assertEqual(self.index.find(1.0, 1), (0, 1))
+        self.assertEqual(self.index.find(0.0, 16), (2, 0))
+
+class TestRangeSeries(unittest.TestCase):
+    def setUp(self):
+        self.today = datetime.date(2024, 6, 30)
+        daily = {}
+        weekly = {}
+        monthly = {}
+        day = datetime.date(2022, 1, 3)
+        while day <= self.today:
+            if day.weekday() == 0: # Every Monday, 10 minutes
+                daily[day.isoformat()] = {"sessions": 1, "minutes": 10.0, "rounds": 10, "workouts": [[10.0, "Mon"]]}
+                for table, key in ((weekly, day.strftime("%G-W%V")), (monthly, day.strftime("%Y-%m"))):
+                    row = table.setdefault(key, {"sessions": 0, "minutes": 0.0, "rounds": 0})
+                    row["sessions"] += 1
+                    row["minutes"] += 10.0
+            day += datetime.timedelta(days=1)
+        self.data = {"daily": daily, "weekly": weekly, "monthly": monthly}
+
+    def test_week_is_last_seven_workout_days(self):
+        title, days, labels, stacked = chart_data.range_series(self.data, "Week", self.today)
+        self.assertEqual(len(days), 7)
+        self.assertEqual(days[-1][0], "2024-06-24")
+        self.assertEqual(labels[-1], "06-24")
+        self.assertTrue(stacked)
+
+    def test_month_is_daily_with_empty_days(self):
+        title, days, labels, stacked = chart_data.range_series(self.data, "Month", self.today)
+        self.assertEqual(title, "Daily Activity")
+        self.assertEqual(len(days), 31)
+        self.assertEqual(days[-1], ("2024-06-30", {"workouts": []}))
+
+    def test_longer_ranges_bucket_within_max_bars(self):
+        title, days, _, stacked = chart_data.range_series(self.data, "Year", self.today)
+        self.assertEqual(title, "Weekly Activity")
+        self.assertFalse(stacked)
+        self.assertLessEqual(len(days), chart_data.MAX_BARS)
+        self.assertEqual(days[-2][1]["workouts"], [[10.0, "1 session, 10 min"]])
+
+        title, days, labels, _ = chart_data.range_series(self.data, "All", self.today)
+        self.assertEqual(title, "Monthly Activity")
+        self.assertEqual((labels[0], labels[-1], len(days)), ("2022-01", "2024-06", 30))
+
+    def test_long_history_is_yearly(self):
+        data = {"daily": {"2015-03-02": {"sessions": 1, "minutes": 10.0}},
+                "weekly": {}, "monthly": {"2015-03": {"sessions": 1, "minutes": 10.0},
+                                          "2015-04": {"sessions": 2, "minutes": 30.0}}}
+        title, days, labels, _ = chart_data.range_series(data, "All", self.today)
+        self.assertEqual(title, "Yearly Activity")
+        self.assertEqual((labels[0], labels[-1], len(days)), ("2015", "2024", 10))
+        self.assertEqual(days[0][1]["workouts"], [[40.0, "3 sessions, 40 min"]])
+
+    def test_all_with_no_history(self):
+        empty = {"daily": {}, "weekly": {}, "monthly": {}}
+        _, days, _, _ = chart_data.range_series(empty, "All", self.today)
+        self.assertEqual(days, [("2024-06-30", {"workouts": []})])
+
+if __name__ == '__main__':
+    unittest.main()
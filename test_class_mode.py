@@ -0,0 +1,162 @@
+import unittest
+from class_mode import Athlete, ClassSession
+from workout import Workout, WorkoutState
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+class FakeWriter:
+    def __init__(self):
+        self.rows = []
+
+    def submit(self, row, profile_name="Default", on_done=None):
+        self.rows.append((profile_name, row))
+        if on_done:
+            on_done(row, profile_name, True)
+
+def ticks_to_finish(rounds, work, rest):
+    workout = Workout(rounds, work, rest)
+    workout.start()
+    ticks = 0
+    while workout.state != WorkoutState.FINISHED:
+        workout.tick()
+        ticks += 1
+    return ticks
+
+class TestClassSession(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.writer = FakeWriter()
+
+    def make_session(self, offsets, rounds=2, work=5, rest=0, **kwargs):
+        athletes = [Athlete(f"A{i}", Workout(rounds, work, rest), offset=o, **kwargs) for i, o in enumerate(offsets)]
+        return ClassSession(athletes, self.writer, clock=self.clock)
+
+    def test_staggered_starts_share_one_clock(self):
+        session = self.make_session([0, 2.5])
+        session.start()
+        self.assertEqual(session.advance(), [0])
+        self.assertTrue(session.athletes[1].waiting)
+        self.assertEqual(session.next_delay(), 1.0)
+
+        self.clock.now += 2.5
+        changed = session.advance()
+        self.assertEqual(changed, [0, 1])
+        self.assertEqual(session.athletes[1].workout.state, WorkoutState.PREP)
+        self.assertEqual(session.next_delay(), 0.5) # Athlete 0 is due at +3.0
+
+    def test_catches_up_after_a_stall(self):
+        session = self.make_session([0])
+        session.start()
+        self.clock.now += 3.2
+        session.advance()
+        self.assertEqual(session.athletes[0].workout.time_left, 10 - 4)
+        self.assertAlmostEqual(session.next_delay(), 0.8)
+
+    def test_pause_shifts_schedule(self):
+        session = self.make_session([0, 5])
+        session.start()
+        session.advance()
+        session.pause()
+        self.assertEqual(session.athletes[0].workout.state, WorkoutState.PAUSED)
+        self.assertIsNone(session.next_delay())
+
+        self.clock.now += 30
+        self.assertEqual(session.advance(), [])
+        session.resume()
+        self.assertEqual(session.athletes[0].workout.state, WorkoutState.PREP)
+        self.assertEqual(session.advance(), []) # Nothing was due during the pause
+        self.assertEqual(session.next_delay(), 1.0)
+        self.assertEqual(session.athletes[1].next_tick, 100.0 + 5 + 30)
+
+    def test_finished_athletes_saved_once_each(self):
+        session = self.make_session([0, 1], rounds=2, work=5)
+        session.start()
+        ticks = ticks_to_finish(2, 5, 0)
+
+        self.clock.now += ticks - 1 # Athlete 0 finishes, athlete 1 is one tick behind
+        session.advance()
+        self.assertEqual([p for p, _ in self.writer.rows], ["A0"])
+        self.assertFalse(session.finished)
+
+        self.clock.now += 10
+        session.advance()
+        self.assertEqual([p for p, _ in self.writer.rows], ["A0", "A1"])
+        self.assertTrue(session.finished)
+        self.assertIsNone(session.next_delay())
+        row = self.writer.rows[0][1]
+        self.assertEqual(row["total_rounds_completed"], 2)
+        self.assertEqual(row["total_time_sec"], 10)
+
+    def test_saves_report_through_on_saved(self):
+        saved = []
+        athletes = [Athlete("A0", Workout(1, 5, 0))]
+        session = ClassSession(athletes, self.writer, clock=self.clock,
+                               on_saved=lambda row, profile, ok: saved.append((profile, ok)))
+        session.start()
+        self.clock.now += ticks_to_finish(1, 5, 0)
+        session.advance()
+        self.assertEqual(saved, [("A0", True)])
+
+    def test_stop_saves_completed_rounds(self):
+        session = self.make_session([0, 60], rounds=5, work=5)
+        session.start()
+        self.clock.now += 10 + 5 + 2 # Prep, round 1 and into round 2
+        session.advance()
+        self.assertEqual(session.athletes[0].workout.current_round, 2)
+
+        session.stop()
+        # Athlete 1 never started, so only athlete 0 has a session to save
+        self.assertEqual(len(self.writer.rows), 1)
+        profile, row = self.writer.rows[0]
+        self.assertEqual(profile, "A0")
+        self.assertEqual(row["total_rounds_completed"], 1)
+        self.assertEqual(session.athletes[0].workout.state, WorkoutState.IDLE)
+
+    def test_auto_regulation_per_athlete(self):
+        athletes = [Athlete(f"A{i}", Workout(3, 5, 2, max_prework_hr=120, auto_regulation=True)) for i in range(2)]
+        session = ClassSession(athletes, self.writer, clock=self.clock)
+        session.set_bpm(0, 150) # Still too high after the rest
+        session.set_bpm(1, 100)
+        session.start()
+        self.clock.now += 10 + 5 + 2 + 3
+        session.advance()
+        self.assertEqual(athletes[0].workout.state, WorkoutState.REST)
+        self.assertTrue(athletes[0].workout.waiting_for_hr)
+        self.assertEqual(athletes[1].workout.current_round, 2)
+
+    def test_strap_dropout_clears_stale_hr(self):
+        athletes = [Athlete("A0", Workout(3, 5, 2, max_prework_hr=120, auto_regulation=True), max_hr=200)]
+        session = ClassSession(athletes, self.writer, clock=self.clock)
+        session.set_bpm(0, 150)
+        session.start()
+        self.clock.now += 10 + 5 + 2 + 3
+        session.advance()
+        self.assertTrue(athletes[0].workout.waiting_for_hr)
+        zone_seconds = sum(athletes[0].zone_time.zone_totals())
+
+        session.set_hr_status(0, "Disconnected")
+        self.assertIsNone(athletes[0].bpm)
+        self.clock.now += 5
+        session.advance()
+        # No HR to regulate on: the rest ends and the gap adds no zone time
+        self.assertEqual(athletes[0].workout.state, WorkoutState.WORK)
+        self.assertEqual(athletes[0].workout.current_round, 2)
+        self.assertEqual(sum(athletes[0].zone_time.zone_totals()), zone_seconds)
+
+    def test_zone_time_in_history_row(self):
+        session = self.make_session([0], rounds=1, work=5, max_hr=200)
+        session.set_bpm(0, 150) # 75% -> zone 3
+        session.start()
+        self.clock.now += ticks_to_finish(1, 5, 0)
+        session.advance()
+        row = self.writer.rows[0][1]
+        self.assertGreater(int(row["zone3_sec"]), 0)
+        self.assertEqual(row["zone1_sec"], "0")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import socket
+import asyncio
+import unittest
+import urllib.request
+import display_server
+from display_server import DisplayServer, _Client, encode
+from workout import Workout
+
+def read_event(sock_file):
+    """(event, data) of the next SSE message, skipping comments."""
+    event, data = None, None
+    while True:
+        line = sock_file.readline().decode().rstrip("\n")
+        if line.startswith("event: "):
+            event = line[len("event: "):]
+        elif line.startswith("data: "):
+            data = json.loads(line[len("data: "):])
+        elif line == "" and event:
+            return event, data
+
+class TestDisplayServer(unittest.TestCase):
+    def setUp(self):
+        self.server = DisplayServer("127.0.0.1", 0)
+        self.assertTrue(self.server.start())
+        self.addCleanup(self.server.stop)
+
+    def connect(self):
+        sock = socket.create_connection(("127.0.0.1", self.server.port), timeout=5)
+        self.addCleanup(sock.close)
+        sock.sendall(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        sock_file = sock.makefile("rb")
+        self.addCleanup(sock_file.close)
+        status = sock_file.readline()
+        self.assertIn(b"200", status)
+        while sock_file.readline().strip():
+            pass
+        return sock_file
+
+    def test_serves_page(self):
+        with urllib.request.urlopen(f"http://127.0.0.1:{self.server.port}/", timeout=5) as response:
+            self.assertIn(b"EventSource", response.read())
+
+    def test_snapshot_then_deltas(self):
+        workout = Workout(3, 30, 10)
+        workout.start()
+        self.server.publish(**display_server.workout_state(workout))
+
+        client = self.connect()
+        event, data = read_event(client)
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(data["phase"], "PREP")
+        self.assertEqual(data["total_rounds"], 3)
+
+        workout.tick()
+        self.server.publish(**display_server.workout_state(workout))
+        self.assertEqual(read_event(client), ("delta", {"time_left": 9}))
+
+        self.server.publish(bpm=120, zone=2)
+        self.server.publish(bpm=120, zone=2) # Unchanged: nothing sent
+        self.server.publish(bpm=121)
+        self.assertEqual(read_event(client), ("delta", {"bpm": 120, "zone": 2}))
+        self.assertEqual(read_event(client), ("delta", {"bpm": 121}))
+
+    def test_many_clients(self):
+        clients = [self.connect() for _ in range(3)]
+        for client in clients:
+            self.assertEqual(read_event(client)[0], "snapshot")
+        self.server.publish(time_left=42)
+        for client in clients:
+            self.assertEqual(read_event(client), ("delta", {"time_left": 42}))
+
+class TestSlowClient(unittest.TestCase):
+    def test_full_queue_resyncs_with_snapshot(self):
+        async def run():
+            state = {"time_left": 0}
+            client = _Client(state, queue_size=3)
+            for t in range(1, 6):
+                state["time_left"] = t
+                client.offer(encode("delta", {"time_left": t}), state)
+            messages = []
+            while not client.queue.empty():
+                messages.append(client.queue.get_nowait())
+            return client, messages
+
+        client, messages = asyncio.run(run())
+        # Backlog replaced by the latest full state; never more than the queue holds
+        self.assertEqual(client.resyncs, 1)
+        self.assertEqual(messages, [encode("snapshot", {"time_left": 3}),
+                                    encode("delta", {"time_left": 4}),
+                                    encode("delta", {"time_left": 5})])
+
+if __name__ == "__main__":
+    unittest.main()
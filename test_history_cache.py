@@ -0,0 +1,68 @@
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+
+try:
+    import numpy
+    import history_cache
+except ImportError:
+    numpy = None
+
+@unittest.skipIf(numpy is None, "numpy not installed")
+class TestHistoryCache(StorageTestCase):
+    def _record(self, start, rounds, work, rest, total):
+        return {"start_time": start, "end_time": start, "total_rounds_completed": rounds,
+                "work_time_sec": work, "rest_time_sec": rest, "total_time_sec": total, "workout_notes": ""}
+
+    def test_append_matches_rebuild(self):
+        storage.save_workout(self._record("2024-01-01T10:00:00", 10, 60, 0, 600), "Cache")
+        storage.save_workout(self._record("2024-01-02T10:00:00", 5, 40, 20, 300), "Cache")
+
+        cols = history_cache.load("Cache")
+        self.assertEqual(list(cols["rounds"]), [10, 5])
+        self.assertEqual(list(cols["duration"]), [600.0, 300.0])
+        self.assertEqual(list(history_cache.day_numbers(cols)), [19723, 19724])
+
+        history_cache.rebuild("Cache")
+        rebuilt = history_cache.load("Cache")
+        for name, _ in history_cache.COLUMNS:
+            self.assertEqual(list(rebuilt[name]), list(cols[name]))
+
+    def test_torn_append_is_overwritten(self):
+        storage.save_workout(self._record("2024-01-01T10:00:00", 10, 60, 0, 600), "Cache")
+        cache_dir = storage.get_cache_dir("Cache")
+        # A crash mid-append: one column got a value, meta was never updated
+        with open(history_cache._column_path(cache_dir, "rounds"), 'ab') as f:
+            numpy.array([99], dtype="<i4").tofile(f)
+
+        storage.save_workout(self._record("2024-01-02T10:00:00", 5, 40, 20, 300), "Cache")
+
+        cols = history_cache.load("Cache")
+        self.assertEqual(list(cols["rounds"]), [10, 5])
+        self.assertEqual(list(cols["work"]), [60, 40])
+
+    def test_rebuild_keeps_live_maps_readable(self):
+        for day in (1, 2):
+            storage.save_workout(self._record(f"2024-01-0{day}T10:00:00", day, 60, 0, 600), "Cache")
+        cols = history_cache.load("Cache")
+
+        with open(storage.get_filename("Cache"), 'w') as f:
+            f.write("") # History emptied: the rebuilt columns are shorter
+        history_cache.rebuild("Cache")
+
+        self.assertEqual(list(cols["rounds"]), [1, 2]) # Old map still points at the old file
+        self.assertEqual(len(history_cache.load("Cache")["rounds"]), 0)
+
+    def test_external_edit_triggers_rebuild(self):
+        storage.save_workout(self._record("2024-01-01T10:00:00", 10, 60, 0, 600), "Cache")
+        history_cache.load("Cache")
+
+        # Append behind the cache's back
+        with open(storage.get_filename("Cache"), 'a') as f:
+            f.write("2024-01-03T10:00:00,2024-01-03T10:10:00,3,60,0,180,\n")
+
+        self.assertEqual(list(history_cache.load("Cache")["rounds"]), [10, 3])
+
+if __name__ == '__main__':
+    unittest.main()
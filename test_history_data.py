@@ -0,0 +1,84 @@
+import datetime
+import threading
+import unittest
+from unittest import mock
+
+import storage
+from storage_test_case import StorageTestCase
+import history_data
+
+class TestPrepareHistory(StorageTestCase):
+    def test_formats_rows_and_rollups(self):
+        storage.save_workout({"start_time": "2024-12-06T14:30:00", "end_time": "2024-12-06T14:45:10",
+                              "total_time_sec": 910, "total_rounds_completed": 15, "workout_notes": "Burpees"}, "Data")
+        data = history_data.prepare_history("Data")
+
+        self.assertEqual(data["profile"], "Data")
+        self.assertEqual(data["records"][0]["start_time"], "2024-12-06T14:30:00")
+        row = data["rows"][0]
+        self.assertEqual(row["start_time"], "Dec 06, 14:30")
+        self.assertEqual(row["end_time"], "14:45")
+        self.assertEqual(row["total_time_sec"], "00:15:10")
+        self.assertEqual(row["workout_notes"], "Burpees")
+        self.assertEqual(list(data["rollups"]["daily"]), ["2024-12-06"])
+
+    def test_empty_profile(self):
+        data = history_data.prepare_history("Nobody")
+        self.assertEqual((data["records"], data["rows"], data["rollups"]["daily"]), ([], [], {}))
+
+    def test_bad_values_pass_through(self):
+        self.assertEqual(history_data.format_cell("start_time", "garbage"), "garbage")
+        self.assertEqual(history_data.format_cell("total_time_sec", ""), "")
+
+    def test_zone_text(self):
+        record = {"start_time": "2024-12-06T14:30:00", "zone2_sec": "90", "zone4_sec": "30"}
+        self.assertEqual(history_data.format_record(record)["zones"], "Z2 75% · Z4 25%")
+        self.assertEqual(history_data.format_record(record)["work_zones"], "")
+        record["zone4_work_sec"] = "30"
+        self.assertEqual(history_data.format_record(record)["work_zones"], "Z4 100%")
+        self.assertEqual(history_data.format_record({"start_time": ""})["zones"], "")
+
+        rollup_data = {"weekly": {"2024-W49": {"zone_sec": [0, 0, 90, 0, 30, 0]}}}
+        self.assertEqual(history_data.week_zones_text(rollup_data, datetime.date(2024, 12, 6)),
+                         "This week in zones: Z2 75% · Z4 25%")
+        self.assertEqual(history_data.week_zones_text(rollup_data, datetime.date(2024, 12, 20)), "")
+
+    def test_chart_entry(self):
+        record = {"start_time": "2024-12-06T23:50:00", "total_time_sec": "90", "workout_notes": "Row"}
+        self.assertEqual(history_data.chart_entry(record), ("2024-12-06", 1.5, "Row"))
+        self.assertIsNone(history_data.chart_entry({"start_time": ""}))
+
+class TestHistoryLoader(unittest.TestCase):
+    def test_superseded_load_is_dropped(self):
+        release = threading.Event()
+        delivered = []
+
+        def slow_prepare(profile_name):
+            if profile_name == "Old":
+                release.wait(5)
+            return {"profile": profile_name}
+
+        loader = history_data.HistoryLoader(lambda func: func())
+        self.addCleanup(loader.shutdown)
+        with mock.patch.object(history_data, "prepare_history", slow_prepare):
+            loader.load("Old", delivered.append)
+            loader.load("New", delivered.append) # Queued behind Old, which is then stale
+            release.set()
+            loader.threads.shutdown(wait=True)
+
+        self.assertEqual(delivered, [{"profile": "New"}])
+        self.assertFalse(loader.busy())
+
+    def test_busy_until_delivered(self):
+        scheduled = []
+        loader = history_data.HistoryLoader(scheduled.append)
+        self.addCleanup(loader.shutdown)
+        with mock.patch.object(history_data, "prepare_history", lambda name: {"profile": name}):
+            loader.load("P", lambda data: None)
+            loader.threads.shutdown(wait=True)
+        self.assertTrue(loader.busy()) # Result computed but not yet applied on the UI thread
+        scheduled[0]()
+        self.assertFalse(loader.busy())
+
+if __name__ == '__main__':
+    unittest.main()
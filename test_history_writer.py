@@ -0,0 +1,77 @@
+import os
+import threading
+import unittest
+from unittest import mock
+
+import storage
+from storage_test_case import StorageTestCase
+from history_writer import HistoryWriter
+
+class TestHistoryWriter(unittest.TestCase):
+    def test_close_flushes_in_order(self):
+        written = []
+        writer = HistoryWriter(save_func=lambda row, profile: written.append((profile, row)))
+
+        for i in range(5):
+            writer.submit([i], "P")
+        writer.close()
+
+        self.assertEqual(written, [("P", [i]) for i in range(5)])
+        self.assertFalse(writer.thread.is_alive())
+
+    def test_retries_transient_errors(self):
+        attempts = []
+
+        def flaky_save(row, profile):
+            attempts.append(row)
+            if len(attempts) < 3:
+                raise OSError("network folder unavailable")
+
+        results = []
+        done = threading.Event()
+
+        def on_done(row, profile, ok):
+            results.append(ok)
+            done.set()
+
+        writer = HistoryWriter(retry_delay=0, save_func=flaky_save)
+        writer.submit(["row"], "P", on_done=on_done)
+        self.assertTrue(done.wait(5))
+        writer.close()
+
+        self.assertEqual(len(attempts), 3)
+        self.assertEqual(results, [True])
+
+    def test_gives_up_after_retries(self):
+        def broken_save(row, profile):
+            raise OSError("disk full")
+
+        results = []
+        writer = HistoryWriter(retries=2, retry_delay=0, save_func=broken_save)
+        writer.submit(["row"], "P", on_done=lambda row, profile, ok: results.append(ok))
+        writer.close()
+
+        self.assertEqual(results, [False])
+
+class TestHistoryWriterStorage(StorageTestCase):
+    def test_retry_after_failed_fsync_writes_one_row(self):
+        storage.append_workout({"start_time": "2024-01-01T07:00:00"}, "P")
+        real_fsync = os.fsync
+        calls = []
+
+        def flaky_fsync(fd):
+            calls.append(fd)
+            if len(calls) == 1:
+                raise OSError("I/O error") # The row was already written
+            real_fsync(fd)
+
+        writer = HistoryWriter(retry_delay=0)
+        with mock.patch.object(storage.os, "fsync", flaky_fsync):
+            writer.submit({"start_time": "2024-01-02T07:00:00"}, "P")
+            writer.close()
+
+        starts = [r["start_time"] for r in storage.load_history("P")]
+        self.assertEqual(starts, ["2024-01-01T07:00:00", "2024-01-02T07:00:00"])
+
+if __name__ == '__main__':
+    unittest.main()
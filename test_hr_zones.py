@@ -0,0 +1,75 @@
+import unittest
+
+import storage
+import hr_zones
+
+class TestZones(unittest.TestCase):
+    def test_zone_for(self):
+        self.assertEqual(hr_zones.zone_for(80, 200), 0) # 40%, warm up
+        self.assertEqual(hr_zones.zone_for(100, 200), 1) # 50% starts zone 1
+        self.assertEqual(hr_zones.zone_for(150, 200), 3)
+        self.assertEqual(hr_zones.zone_for(210, 200), 5)
+
+    def test_columns_are_in_history(self):
+        for col in hr_zones.ZONE_COLUMNS + hr_zones.WORK_ZONE_COLUMNS:
+            self.assertIn(col, storage.HISTORY_COLUMNS)
+
+class TestZoneAccumulator(unittest.TestCase):
+    def test_attributes_intervals_to_previous_sample(self):
+        acc = hr_zones.ZoneAccumulator(rounds=2)
+        acc.add(0, 1, "rest", 0) # Prep
+        acc.add(10, 3, "work", 1)
+        acc.add(40, 2, "rest", 1)
+        acc.add(60, 4, "work", 2)
+        acc.add(70, 4, "work", 2)
+
+        self.assertEqual(acc.zone_totals(), [0, 10, 20, 30, 10, 0])
+        self.assertEqual(acc.zone_totals("work"), [0, 0, 0, 30, 10, 0])
+        columns = acc.columns()
+        self.assertEqual(columns["zone2_sec"], "20")
+        self.assertEqual(columns["zone2_work_sec"], "0")
+        self.assertEqual(columns["zone3_work_sec"], "30")
+
+    def test_per_round_attribution(self):
+        acc = hr_zones.ZoneAccumulator(rounds=2)
+        acc.add(0, 1, "rest", 0)
+        acc.add(10, 3, "work", 1)
+        acc.add(40, 2, "rest", 1)
+        acc.add(60, 4, "work", 2)
+        acc.add(70, 4, "work", 5) # Past the last round: clamped
+
+        self.assertEqual(acc.round_totals(0), [0, 10, 0, 0, 0, 0])
+        self.assertEqual(acc.round_totals(1), [0, 0, 20, 30, 0, 0])
+        self.assertEqual(acc.round_totals(1, "rest"), [0, 0, 20, 0, 0, 0])
+        self.assertEqual(acc.round_totals(2), [0, 0, 0, 0, 10, 0])
+
+    def test_gaps_capped_and_pauses_skipped(self):
+        acc = hr_zones.ZoneAccumulator(max_gap=30)
+        acc.add(0, 2, "work")
+        acc.add(100, 2, "work") # Dropout counts as 30 s
+        acc.pause()
+        acc.add(500, 2, "work")
+        acc.add(505, 2, "work")
+
+        self.assertEqual(acc.zone_totals()[2], 35)
+        self.assertEqual(acc.columns()["zone2_sec"], "35")
+
+    def test_no_samples_no_columns(self):
+        self.assertEqual(hr_zones.ZoneAccumulator().columns(), {})
+
+    def test_session_columns_have_no_phase_split(self):
+        columns = hr_zones.session_columns([(0, 150), (20, 150)], 200)
+        self.assertEqual(columns, {**dict.fromkeys(hr_zones.ZONE_COLUMNS, "0"), "zone3_sec": "20"})
+
+class TestRecords(unittest.TestCase):
+    def test_zone_seconds(self):
+        record = dict(zip(hr_zones.ZONE_COLUMNS, ["0", "30", "90", "", "", ""]))
+        self.assertEqual(hr_zones.zone_seconds(record), [0, 30, 90, 0, 0, 0])
+        self.assertIsNone(hr_zones.zone_seconds({"trimp": ""})) # No HR / older row
+
+    def test_distribution_text(self):
+        self.assertEqual(hr_zones.distribution_text([0, 30, 90, 0, 0, 0]), "Z2 75% · Z1 25%")
+        self.assertEqual(hr_zones.distribution_text([0] * 6), "")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import json
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+import import_export
+
+TCX = """<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2">
+  <Activities>
+    <Activity Sport="Other">
+      <Id>2024-01-05T10:00:00</Id>
+      <Lap StartTime="2024-01-05T10:00:00">
+        <TotalTimeSeconds>120</TotalTimeSeconds>
+        <Track>
+          <Trackpoint><Time>2024-01-05T10:00:00</Time><HeartRateBpm><Value>120</Value></HeartRateBpm></Trackpoint>
+          <Trackpoint><Time>2024-01-05T10:01:00</Time><HeartRateBpm><Value>150</Value></HeartRateBpm></Trackpoint>
+        </Track>
+      </Lap>
+    </Activity>
+  </Activities>
+</TrainingCenterDatabase>
+"""
+
+class TestImportExport(StorageTestCase):
+    def _file(self, name, text):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def test_import_dedupes_on_start_time(self):
+        storage.save_workout({"start_time": "2024-01-01T07:00:00", "total_time_sec": 60}, "Gym")
+        csv_path = self._file("other_app.csv", "Date,Duration,Rounds,Notes\n"
+                                               "2024-01-01T07:00:00,60,1,dup\n"
+                                               "2024-01-02T07:00:00,600,10,new\n"
+                                               "not a date,600,10,bad\n")
+        jsonl_path = self._file("more.jsonl", json.dumps({"start": "2024-01-03T07:00:00", "duration": 300}) + "\n"
+                                              + json.dumps({"start": "2024-01-02T07:00:00", "duration": 600}) + "\n")
+
+        result = import_export.import_files([csv_path, jsonl_path], "Gym", workers=1)
+
+        self.assertEqual((result.imported, result.duplicates, result.invalid), (2, 2, 1))
+        starts = [r["start_time"] for r in storage.load_history("Gym")]
+        self.assertEqual(starts, ["2024-01-01T07:00:00", "2024-01-02T07:00:00", "2024-01-03T07:00:00"])
+
+    def test_jsonl_non_object_lines_are_invalid(self):
+        jsonl_path = self._file("mixed.jsonl", "[1, 2]\n\"text\"\n"
+                                               + json.dumps({"start": "2024-01-03T07:00:00", "duration": 300}) + "\n")
+        csv_path = self._file("a.csv", "start_time,total_time_sec\n2024-01-02T07:00:00,600\n")
+
+        result = import_export.import_files([jsonl_path, csv_path], "Gym", workers=1)
+
+        self.assertEqual((result.imported, result.invalid), (2, 2))
+
+    def test_non_finite_numbers_are_invalid(self):
+        csv_path = self._file("a.csv", "start_time,total_time_sec\n2024-01-02T07:00:00,nan\n"
+                                       "2024-01-03T07:00:00,inf\n2024-01-04T07:00:00,60\n")
+
+        result = import_export.import_files([csv_path], "Gym", workers=1)
+
+        self.assertEqual((result.imported, result.invalid), (1, 2))
+
+    def test_parse_file_streams_chunks(self):
+        rows = "".join(f"2024-03-01T07:{m:02}:00,60\n" for m in range(5))
+        path = self._file("big.csv", "start_time,total_time_sec\n" + rows + "bad,60\n")
+
+        chunks = list(import_export.parse_file(path, chunk_size=2))
+
+        self.assertEqual([len(records) for records, _, _ in chunks], [2, 2, 1])
+        self.assertEqual(sum(invalid for _, invalid, _ in chunks), 1)
+
+    def test_dry_run_writes_nothing(self):
+        csv_path = self._file("a.csv", "start_time,total_time_sec\n2024-01-02T07:00:00,600\n")
+        progress = []
+
+        result = import_export.import_files([csv_path], "Gym", dry_run=True, progress=lambda r: progress.append(r.files_done))
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(progress, [1])
+        self.assertEqual(storage.load_history("Gym"), [])
+
+    def test_tcx_with_heart_rate(self):
+        [(records, invalid, error)] = import_export.parse_file(self._file("run.tcx", TCX))
+
+        self.assertIsNone(error)
+        self.assertEqual(invalid, 0)
+        self.assertEqual(records[0]["start_time"], "2024-01-05T10:00:00")
+        self.assertEqual(records[0]["total_time_sec"], "120")
+        self.assertEqual(records[0]["hr_samples"], [(0, 120), (60, 150)])
+
+    def test_tcx_import_computes_trimp(self):
+        storage.add_profile("Gym", max_hr=190, max_prework_hr=60)
+
+        import_export.import_files([self._file("run.tcx", TCX)], "Gym", workers=1)
+
+        # 120 bpm held for 30 s (gap capped), last sample has no duration
+        record = storage.load_history("Gym")[0]
+        self.assertEqual(record["trimp"], "0.4")
+        self.assertEqual(record["zone2_sec"], "30") # 120/190 = 63% of max
+
+    def test_parallel_parse(self):
+        paths = [self._file(f"f{i}.csv", f"start_time,total_time_sec\n2024-02-{i + 1:02}T07:00:00,60\n") for i in range(4)]
+        progress = []
+
+        result = import_export.import_files(paths, "Gym", workers=2, progress=lambda r: progress.append(r.files_done))
+
+        self.assertEqual(result.imported, 4)
+        self.assertEqual(progress, [1, 2, 3, 4])
+        self.assertEqual(len(storage.load_history("Gym")), 4)
+
+    def test_export_roundtrip(self):
+        storage.save_workout({"start_time": "2024-01-01T07:00:00", "total_time_sec": 60, "workout_notes": "a, b"}, "Gym")
+        out = os.path.join(self.tmp.name, "out.csv")
+
+        self.assertEqual(import_export.export_history("Gym", out), 1)
+        result = import_export.import_files([out], "Other", workers=1)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(storage.load_history("Other")[0]["workout_notes"], "a, b")
+
+if __name__ == '__main__':
+    unittest.main()
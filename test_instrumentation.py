@@ -0,0 +1,71 @@
+import json
+import os
+import tempfile
+import unittest
+
+import instrumentation
+from instrumentation import Histogram
+from debug_overlay import format_table
+
+class TestHistogram(unittest.TestCase):
+    def test_percentiles_within_precision(self):
+        hist = Histogram()
+        for ms in range(1, 1001): # 1..1000 ms, evenly
+            hist.record(ms / 1000)
+        for p, expected in ((50, 0.5), (99, 0.99), (99.9, 0.999)):
+            self.assertAlmostEqual(hist.percentile(p), expected, delta=expected * 0.01)
+        self.assertEqual(hist.percentile(100), 1.0)
+
+    def test_summary(self):
+        hist = Histogram()
+        self.assertEqual(hist.summary()["count"], 0)
+        for seconds in (0.002, 0.004, 0.006):
+            hist.record(seconds)
+        summary = hist.summary()
+        self.assertEqual(summary["count"], 3)
+        self.assertAlmostEqual(summary["mean_ms"], 4.0)
+        self.assertEqual((summary["min_ms"], summary["max_ms"]), (2.0, 6.0))
+
+    def test_out_of_range_clamped(self):
+        hist = Histogram(max_seconds=1.0)
+        hist.record(-0.5)
+        hist.record(5.0)
+        self.assertEqual(hist.summary()["min_ms"], 0.0)
+        self.assertEqual(hist.percentile(100), 1.0)
+
+    def test_fixed_memory(self):
+        hist = Histogram()
+        size = len(hist.counts)
+        for i in range(10000):
+            hist.record(i * 1e-4)
+        self.assertEqual(len(hist.counts), size)
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        instrumentation.reset()
+        self.addCleanup(instrumentation.reset)
+
+    def test_timer_and_dump(self):
+        with instrumentation.timer("tick.workout"):
+            pass
+        instrumentation.record("tick.late", 0.003)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = instrumentation.dump(os.path.join(tmp, "metrics.json"))
+            with open(path) as f:
+                data = json.load(f)
+
+        self.assertEqual(sorted(data["metrics"]), ["tick.late", "tick.workout"])
+        late = data["metrics"]["tick.late"]
+        self.assertEqual(late["count"], 1)
+        self.assertAlmostEqual(late["p99_ms"], 3.0, delta=0.03)
+        self.assertEqual(sum(late["buckets_us"].values()), 1)
+
+    def test_overlay_table(self):
+        instrumentation.record("hr.to_ui", 0.012)
+        table = format_table(instrumentation.snapshot())
+        self.assertIn("hr.to_ui", table.splitlines()[1])
+        self.assertIn("12.0", table)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import datetime
+import tempfile
+import unittest
+from unittest import mock
+
+import journal
+from workout import Workout, WorkoutState
+
+class TestWorkoutJournal(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.now = 0.0
+        self.journal = journal.WorkoutJournal(directory=self.tmp.name, clock=lambda: self.now)
+
+    def _advance_to_rest(self, w):
+        w.start()
+        w.time_left = 1
+        w.tick() # WORK R1
+        w.time_left = 1
+        w.tick() # REST R1
+        w.time_left = 7
+
+    def test_recovers_last_state(self):
+        w = Workout(10, 40, 20, rest_increment=5, rest_interval=2, rest_start_round=3)
+        self.journal.begin("Alice", datetime.datetime(2024, 1, 1, 7, 0, 0, 123), "vest", w)
+        self._advance_to_rest(w)
+        self.journal.record("phase", w)
+        # Simulate a crash: no finish(), file left behind
+
+        leftovers = journal.find_leftovers(self.tmp.name)
+
+        self.assertEqual(len(leftovers), 1)
+        entry = leftovers[0]
+        self.assertEqual(entry["begin"]["profile"], "Alice")
+        self.assertEqual(entry["begin"]["start_time"], "2024-01-01T07:00:00")
+
+        restored = Workout(**entry["begin"]["config"])
+        restored.restore(entry["workout"])
+        self.assertEqual(restored.config(), w.config())
+        self.assertEqual((restored.state, restored.current_round, restored.time_left), (WorkoutState.REST, 1, 7))
+
+    def test_torn_last_line_is_ignored(self):
+        w = Workout(5, 60, 0)
+        w.start()
+        self.journal.begin("Bob", datetime.datetime(2024, 1, 1, 7, 0), "", w)
+        self.journal.close()
+        with open(os.path.join(self.tmp.name, "20240101T070000.journal"), 'a') as f:
+            f.write('{"kind": "checkpoint", "workout": {"sta')
+
+        entry = journal.find_leftovers(self.tmp.name)[0]
+
+        self.assertEqual(entry["workout"]["state"], "PREP")
+
+    def test_finish_and_remove(self):
+        w = Workout(5, 60, 0)
+        self.journal.begin("Bob", datetime.datetime(2024, 1, 1, 7, 0), "", w)
+
+        journal.remove(self.journal.finish())
+
+        self.assertEqual(journal.find_leftovers(self.tmp.name), [])
+
+    def test_fsync_is_batched(self):
+        synced = []
+        w = Workout(5, 60, 0)
+        self.journal.begin("Bob", datetime.datetime(2024, 1, 1, 7, 0), "", w)
+        with mock.patch.object(journal.os, "fsync", lambda fd: synced.append(self.now)):
+            for second in range(12):
+                self.now = float(second)
+                self.journal.record("checkpoint", w)
+
+        self.assertEqual(synced, [5.0, 10.0])
+
+class TestWorkoutSnapshot(unittest.TestCase):
+    def test_paused_roundtrip(self):
+        w = Workout(3, 30, 10)
+        w.start()
+        w.pause()
+
+        restored = Workout(**w.config())
+        restored.restore(w.snapshot())
+        restored.pause() # Resume
+
+        self.assertEqual(restored.state, WorkoutState.PREP)
+
+if __name__ == '__main__':
+    unittest.main()
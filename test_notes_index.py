@@ -0,0 +1,29 @@
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+import notes_index
+
+class TestNotesIndex(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        notes = ["Burpees with a 10kg vest", "Kettlebell swings", "burpee box jumps, no vest", ""]
+        for day, note in enumerate(notes, start=1):
+            storage.save_workout({"start_time": f"2024-01-{day:02}T07:00:00", "workout_notes": note}, "Notes")
+
+    def test_prefix_and_multi_term(self):
+        self.assertEqual(notes_index.search("Notes", "burp"), ["2024-01-03T07:00:00", "2024-01-01T07:00:00"])
+        self.assertEqual(notes_index.search("Notes", "BURPEES vest"), ["2024-01-01T07:00:00"])
+        self.assertEqual(notes_index.search("Notes", "kettle swing"), ["2024-01-02T07:00:00"])
+        self.assertEqual(notes_index.search("Notes", "rowing"), [])
+        self.assertEqual(notes_index.search("Notes", "  "), [])
+
+    def test_new_saves_are_searchable(self):
+        notes_index.search("Notes", "vest")
+        storage.save_workout({"start_time": "2024-02-01T07:00:00", "workout_notes": "Vest run"}, "Notes")
+
+        self.assertEqual(notes_index.search("Notes", "vest")[0], "2024-02-01T07:00:00")
+        self.assertEqual(notes_index.rebuild("Notes"), notes_index._read("Notes"))
+
+if __name__ == '__main__':
+    unittest.main()
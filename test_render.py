@@ -0,0 +1,74 @@
+import unittest
+
+from render import Renderer
+
+class FakeWidget:
+    def __init__(self):
+        self.calls = []
+
+    def configure(self, **props):
+        self.calls.append(props)
+
+class TestRenderer(unittest.TestCase):
+    def setUp(self):
+        self.scheduled = []
+        self.render = Renderer(self.scheduled.append)
+        self.label = FakeWidget()
+
+    def _frame(self):
+        while self.scheduled:
+            self.scheduled.pop(0)()
+
+    def test_changes_batched_per_widget(self):
+        self.render.set(self.label, text="00:10")
+        self.render.set(self.label, text_color="yellow")
+        self.assertEqual(len(self.scheduled), 1) # One flush per frame
+        self.assertEqual(self.label.calls, []) # Nothing applied before the frame
+        self._frame()
+        self.assertEqual(self.label.calls, [{"text": "00:10", "text_color": "yellow"}])
+
+    def test_unchanged_values_skipped(self):
+        self.render.set(self.label, text="WORK", text_color="green")
+        self._frame()
+        self.render.set(self.label, text="WORK", text_color="green")
+        self.assertEqual(self.scheduled, [])
+        self.render.set(self.label, text="REST", text_color="green")
+        self._frame()
+        self.assertEqual(self.label.calls[-1], {"text": "REST"})
+
+    def test_change_reverted_within_frame(self):
+        self.render.set(self.label, text="A")
+        self._frame()
+        self.render.set(self.label, text="B")
+        self.render.set(self.label, text="A")
+        self._frame()
+        self.assertEqual(self.label.calls, [{"text": "A"}])
+
+    def test_forget(self):
+        self.render.set(self.label, text="A")
+        self._frame()
+        self.render.forget(self.label)
+        self.render.set(self.label, text="A")
+        self._frame()
+        self.assertEqual(len(self.label.calls), 2)
+
+    def test_discard_drops_queued_changes(self):
+        other = FakeWidget()
+        self.render.set(self.label, text="A")
+        self.render.set(other, text="B")
+        self.render.discard(self.label) # e.g. destroyed before the frame
+        self._frame()
+        self.assertEqual(self.label.calls, [])
+        self.assertEqual(other.calls, [{"text": "B"}])
+
+    def test_long_session_configures_only_changes(self):
+        status = FakeWidget()
+        for second in range(600, 0, -1): # Ten minutes of work ticks
+            self.render.set(self.label, text=f"{second // 60:02}:{second % 60:02}", text_color="white")
+            self.render.set(status, text="WORK", text_color="green")
+            self._frame()
+        self.assertEqual(len(self.label.calls), 600)
+        self.assertEqual(len(status.calls), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+import rollups
+import hr_zones
+
+class TestRollups(StorageTestCase):
+    def _save(self, start, total_sec, rounds, notes=""):
+        storage.save_workout({"start_time": start, "total_time_sec": total_sec,
+                              "total_rounds_completed": rounds, "workout_notes": notes}, "Roll")
+
+    def test_incremental_matches_rebuild(self):
+        self._save("2024-01-29T07:00:00", 600, 10, "am")
+        self._save("2024-01-29T18:00:00", 300, 5, "pm")
+        self._save("2024-02-05T07:00:00", 1200, 20)
+
+        incremental = rollups.load("Roll")
+        rebuilt = rollups.rebuild("Roll")
+
+        self.assertEqual(incremental, rebuilt)
+        day = incremental["daily"]["2024-01-29"]
+        self.assertEqual(day["sessions"], 2)
+        self.assertEqual(day["rounds"], 15)
+        self.assertAlmostEqual(day["minutes"], 15.0)
+        self.assertEqual(day["workouts"], [[10.0, "am"], [5.0, "pm"]])
+        self.assertEqual(sorted(incremental["weekly"]), ["2024-W05", "2024-W06"])
+
+    def test_recent_days_limits_and_orders(self):
+        for day in range(1, 10):
+            self._save(f"2024-03-{day:02}T07:00:00", 60, 1)
+
+        days = rollups.recent_days("Roll", 7)
+
+        self.assertEqual([d for d, _ in days][0], "2024-03-03")
+        self.assertEqual(len(days), 7)
+
+    def test_stale_rollups_rebuild(self):
+        self._save("2024-01-01T07:00:00", 60, 1)
+        with open(storage.get_filename("Roll"), 'a') as f:
+            f.write("2024-01-02T07:00:00,,2,,,120,\n")
+
+        self.assertIn("2024-01-02", rollups.load("Roll")["daily"])
+
+    def test_readers_never_write(self):
+        self._save("2024-01-01T07:00:00", 60, 1)
+        with open(storage.get_filename("Roll"), 'a') as f:
+            f.write("2024-01-02T07:00:00,,2,,,120,\n")
+
+        rollups.load("Roll")
+        self.assertFalse(rollups.is_current("Roll")) # Left for the writer thread
+
+        storage.rebuild_derived("Roll", stale_only=True)
+        self.assertTrue(rollups.is_current("Roll"))
+        self.assertIn("2024-01-02", rollups._read("Roll")["daily"])
+
+    def test_monthly_totals(self):
+        self._save("2024-01-31T07:00:00", 600, 10)
+        self._save("2024-02-01T07:00:00", 300, 5)
+        self._save("2024-02-20T07:00:00", 300, 5)
+
+        monthly = rollups.load("Roll")["monthly"]
+        self.assertEqual(monthly["2024-01"]["sessions"], 1)
+        self.assertEqual(monthly["2024-02"], {"sessions": 2, "minutes": 10.0, "rounds": 10,
+                                              "zone_sec": [0.0] * 6})
+
+    def test_older_layout_rebuilds(self):
+        self._save("2024-01-01T07:00:00", 60, 1)
+        data = rollups.load("Roll")
+        del data["monthly"]
+        rollups._write("Roll", data)
+
+        self.assertIn("2024-01", rollups.load("Roll")["monthly"])
+
+    def test_zone_seconds_summed(self):
+        for start, zones in (("2024-01-29T07:00:00", ["0", "60", "120", "0", "0", "0"]),
+                             ("2024-01-30T07:00:00", ["0", "0", "30", "90", "0", "0"])):
+            record = {"start_time": start, "total_time_sec": 180, "total_rounds_completed": 3}
+            record.update(zip(hr_zones.ZONE_COLUMNS, zones))
+            storage.save_workout(record, "Roll")
+        self._save("2024-01-31T07:00:00", 60, 1) # No HR
+
+        week = rollups.load("Roll")["weekly"]["2024-W05"]
+        self.assertEqual(week["sessions"], 3)
+        self.assertEqual(week["zone_sec"], [0.0, 60.0, 150.0, 90.0, 0.0, 0.0])
+
+    def test_previous_version_rebuilds(self):
+        self._save("2024-01-01T07:00:00", 60, 1)
+        data = rollups.load("Roll")
+        del data["version"]
+        for bucket in data["daily"].values():
+            del bucket["zone_sec"]
+        rollups._write("Roll", data)
+
+        self.assertIn("zone_sec", rollups.load("Roll")["daily"]["2024-01-01"])
+
+if __name__ == '__main__':
+    unittest.main()
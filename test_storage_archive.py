@@ -0,0 +1,80 @@
+import datetime
+import unittest
+from unittest import mock
+
+import storage
+from storage_test_case import StorageTestCase
+
+class TestHistoryArchive(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        for start in ["2022-03-01T07:00:00", "2023-06-01T07:00:00", "2023-07-01T07:00:00", "2024-01-02T07:00:00"]:
+            storage.save_workout({"start_time": start, "total_time_sec": 60}, "Arch")
+
+    def test_compaction_keeps_all_history(self):
+        before = storage.load_history("Arch")
+
+        archived = storage.compact_history("Arch", today=datetime.date(2024, 5, 1))
+
+        self.assertEqual(archived, 3)
+        self.assertEqual(storage.load_history("Arch"), before)
+        self.assertEqual([s["year"] for s in storage.get_segments("Arch")], [2022, 2023])
+        self.assertEqual(storage.get_segments("Arch")[1]["rows"], 2)
+        self.assertEqual(storage.verify_segments("Arch"), [])
+
+        with open(storage.get_filename("Arch")) as f:
+            live = f.read()
+        self.assertNotIn("2023-", live)
+        self.assertIn("2024-01-02", live)
+
+    def test_range_query_skips_segments(self):
+        storage.compact_history("Arch", today=datetime.date(2024, 5, 1))
+        opened = []
+        original = storage._iter_segment_rows
+
+        def spy(profile_name, seg):
+            opened.append(seg["year"])
+            return original(profile_name, seg)
+
+        with mock.patch.object(storage, "_iter_segment_rows", spy):
+            records = storage.load_history("Arch", start=datetime.date(2023, 7, 1), end="2024-01-01")
+
+        self.assertEqual([r["start_time"] for r in records], ["2023-07-01T07:00:00"])
+        self.assertEqual(opened, [2023])
+
+    def test_late_rows_merge_into_existing_segment(self):
+        storage.compact_history("Arch", today=datetime.date(2024, 5, 1))
+        storage.save_workout({"start_time": "2023-12-31T07:00:00", "total_time_sec": 60}, "Arch")
+
+        storage.compact_history("Arch", today=datetime.date(2024, 5, 1))
+
+        seg = storage.get_segments("Arch")[1]
+        self.assertEqual((seg["rows"], seg["last"]), (3, "2023-12-31T07:00:00"))
+        self.assertEqual(len(storage.load_history("Arch")), 5)
+
+    def test_nothing_to_compact(self):
+        with open(storage.get_filename("Arch"), 'rb') as f:
+            before = f.read()
+        with mock.patch.object(storage, "_SegmentWriter") as segment_writer:
+            self.assertEqual(storage.compact_history("Arch", today=datetime.date(2022, 5, 1)), 0)
+        segment_writer.assert_not_called()
+        self.assertEqual(storage.get_segments("Arch"), [])
+        with open(storage.get_filename("Arch"), 'rb') as f:
+            self.assertEqual(f.read(), before)
+
+    def test_rescans_only_after_growth_or_new_year(self):
+        storage.compact_history("Arch", today=datetime.date(2024, 5, 1))
+        with mock.patch.object(storage, "_has_closed_year_rows", return_value=False) as scan:
+            storage.compact_history("Arch", today=datetime.date(2024, 6, 1))
+            scan.assert_not_called()
+
+            storage.save_workout({"start_time": "2024-06-01T07:00:00", "total_time_sec": 60}, "Arch")
+            storage.compact_history("Arch", today=datetime.date(2024, 6, 1))
+            storage.compact_history("Arch", today=datetime.date(2024, 6, 2))
+            self.assertEqual(scan.call_count, 1)
+
+            storage.compact_history("Arch", today=datetime.date(2025, 1, 1))
+            self.assertEqual(scan.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import json
+import unittest
+from unittest import mock
+
+import storage
+from storage_test_case import StorageTestCase
+
+class TestProfilesCache(StorageTestCase):
+    def setUp(self):
+        super().setUp()
+        storage.add_profile("Gym", max_hr=190)
+
+    def test_repeated_reads_parse_once(self):
+        with mock.patch.object(storage.json, "load", wraps=json.load) as load:
+            storage.get_profile_details("Gym")
+            storage.get_last_used_profile()
+            storage.load_profiles()
+            storage.get_filename("Gym")
+        self.assertLessEqual(load.call_count, 1)
+
+    def test_sees_own_and_external_writes(self):
+        storage.update_profile("Gym", max_hr=180)
+        self.assertEqual(storage.get_profile_details("Gym")["max_hr"], 180)
+
+        with open(storage.PROFILES_FILE) as f:
+            data = json.load(f)
+        data["profiles"]["Gym"]["max_hr"] = 175.0 # Another process edits the file
+        with open(storage.PROFILES_FILE, 'w') as f:
+            json.dump(data, f, indent=2)
+        self.assertEqual(storage.get_profile_details("Gym")["max_hr"], 175.0)
+
+    def test_callers_get_copies(self):
+        storage.get_profile_details("Gym")["max_hr"] = 1
+        self.assertEqual(storage.get_profile_details("Gym")["max_hr"], 190)
+
+if __name__ == '__main__':
+    unittest.main()
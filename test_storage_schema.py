@@ -0,0 +1,68 @@
+import unittest
+from unittest import mock
+
+import storage
+from storage_test_case import StorageTestCase
+
+class TestHistorySchema(StorageTestCase):
+    def _write(self, text):
+        with open(storage.get_filename("Legacy"), 'w') as f:
+            f.write(text)
+
+    def test_title_case_header_migrates(self):
+        self._write("Start Time,End Time,Rounds,Work Duration,Rest Duration,Total Time,Notes\n"
+                    "2024-01-01T10:00:00,2024-01-01T10:10:00,10,60,0,600,burpees\n")
+
+        records = storage.load_history("Legacy")
+
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["total_time_sec"], "600")
+        self.assertEqual(records[0]["workout_notes"], "burpees")
+        with open(storage.get_filename("Legacy")) as f:
+            self.assertEqual(f.readline().strip(), f"{storage.SCHEMA_MARKER}{storage.SCHEMA_VERSION}")
+
+    def test_unnamed_trailing_column_is_notes(self):
+        # Notes were added before the header knew about them
+        self._write("start_time,end_time,total_rounds_completed,work_time_sec,rest_time_sec,total_time_sec\n"
+                    "2024-01-01T10:00:00,2024-01-01T10:10:00,10,60,0,600,vest\n")
+
+        record = storage.load_history("Legacy")[0]
+
+        self.assertEqual(record["rest_time_sec"], "0")
+        self.assertEqual(record["workout_notes"], "vest")
+
+    def test_first_row_is_data_not_header(self):
+        storage.save_workout({"start_time": "2024-01-01T10:00:00", "total_time_sec": 60}, "Fresh")
+        storage.save_workout({"start_time": "2024-01-02T10:00:00", "total_time_sec": 120}, "Fresh")
+
+        records = storage.load_history("Fresh")
+
+        self.assertEqual([r["start_time"] for r in records], ["2024-01-01T10:00:00", "2024-01-02T10:00:00"])
+        self.assertFalse(storage.migrate_history_file(storage.get_filename("Fresh")))
+
+    def test_schema_2_gains_trimp(self):
+        self._write(f"{storage.SCHEMA_MARKER}2\n"
+                    "start_time,end_time,total_rounds_completed,work_time_sec,rest_time_sec,total_time_sec,workout_notes\n"
+                    "2024-01-01T10:00:00,2024-01-01T10:10:00,10,60,0,600,row\n")
+
+        record = storage.load_history("Legacy")[0]
+
+        self.assertEqual(record["trimp"], "")
+        self.assertEqual(record["zone3_sec"], "")
+        self.assertEqual(record["workout_notes"], "row")
+
+    def test_registered_migration_runs_in_chain(self):
+        self._write("start_time,end_time,total_rounds_completed,work_time_sec,rest_time_sec,total_time_sec,workout_notes\n"
+                    "2024-01-01T10:00:00,2024-01-01T10:10:00,10,60,0,600,\n")
+
+        future = storage.SCHEMA_VERSION
+        with mock.patch.object(storage, "SCHEMA_VERSION", future + 1), \
+             mock.patch.object(storage, "HISTORY_COLUMNS", storage.HISTORY_COLUMNS + ["avg_hr"]), \
+             mock.patch.dict(storage._MIGRATIONS, {future: storage._add_columns("avg_hr")}):
+            record = storage.load_history("Legacy")[0]
+
+        self.assertEqual(record["avg_hr"], "")
+        self.assertEqual(record["total_rounds_completed"], "10")
+
+if __name__ == '__main__':
+    unittest.main()
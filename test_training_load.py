@@ -0,0 +1,68 @@
+import datetime
+import math
+import unittest
+
+import storage
+from storage_test_case import StorageTestCase
+import training_load
+
+class TestTrimp(unittest.TestCase):
+    def test_impulse(self):
+        # Full reserve for one minute: 0.64 * e^1.92
+        self.assertAlmostEqual(training_load.impulse(190, 60, 190, 60), 0.64 * math.exp(1.92))
+        self.assertEqual(training_load.impulse(50, 60, 190, 60), 0.0) # Below baseline
+        self.assertAlmostEqual(training_load.impulse(250, 60, 190, 60), 0.64 * math.exp(1.92)) # Clamped
+
+    def test_accumulator_caps_gaps_and_skips_pauses(self):
+        acc = training_load.TrimpAccumulator(190, 60)
+        acc.add(0, 190)
+        acc.add(10, 190)
+        acc.add(100, 190) # 90 s dropout counts as MAX_SAMPLE_GAP
+        acc.pause()
+        acc.add(500, 190) # First sample after a pause starts fresh
+        acc.add(510, 190)
+
+        per_sec = 0.64 * math.exp(1.92) / 60
+        self.assertAlmostEqual(acc.total, per_sec * (10 + training_load.MAX_SAMPLE_GAP + 10))
+
+class TestTrainingLoad(StorageTestCase):
+    def _save(self, start, trimp):
+        storage.save_workout({"start_time": start, "total_time_sec": 600, "trimp": trimp}, "Load")
+
+    def test_hr_range(self):
+        storage.add_profile("Load", max_hr=190, max_prework_hr=110)
+        storage.add_profile("NoMax")
+        self.assertEqual(training_load.hr_range("Load"), (190, 110))
+        self.assertIsNone(training_load.hr_range("NoMax"))
+
+    def test_incremental_matches_rebuild(self):
+        self._save("2024-03-01T07:00:00", "50")
+        self._save("2024-03-01T18:00:00", "30")
+        self._save("2024-03-04T07:00:00", "")
+        self._save("2024-03-10T07:00:00", "80")
+
+        incremental = training_load.current("Load", datetime.date(2024, 3, 12))
+        training_load.rebuild("Load")
+        rebuilt = training_load.current("Load", datetime.date(2024, 3, 12))
+        for key in ("acute", "chronic", "ratio"):
+            self.assertAlmostEqual(incremental[key], rebuilt[key])
+
+        # Day 1: 80 load; nine days later another 80
+        la = training_load.ACUTE_LAMBDA
+        expected_acute = (la * 80 * (1 - la) ** 9 + la * 80) * (1 - la) ** 2
+        self.assertAlmostEqual(incremental["acute"], expected_acute)
+
+    def test_backdated_session_rebuilds(self):
+        self._save("2024-03-10T07:00:00", "80")
+        self._save("2024-03-01T07:00:00", "50")
+
+        state = training_load.current("Load", datetime.date(2024, 3, 10))
+        la = training_load.ACUTE_LAMBDA
+        self.assertAlmostEqual(state["acute"], la * 50 * (1 - la) ** 9 + la * 80)
+
+    def test_no_hr_sessions(self):
+        self._save("2024-03-10T07:00:00", "")
+        self.assertEqual(training_load.summary("Load", datetime.date(2024, 3, 10)), "")
+
+if __name__ == '__main__':
+    unittest.main()
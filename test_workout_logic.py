@@ -1,5 +1,5 @@
 import unittest
-from workout import Workout
+from workout import Workout, WorkoutState
 
 class TestWorkoutIncrementalRest(unittest.TestCase):
     def test_incremental_rest_logic(self):
@@ -45,5 +45,55 @@ class TestWorkoutIncrementalRest(unittest.TestCase):
         workout.current_round = 7
         self.assertEqual(workout._calculate_rest_duration(), 40, "Round 7 should have 2 increments")
 
+class TestUpcomingCues(unittest.TestCase):
+    def _run(self, workout):
+        """Ticks a workout to the end; returns (cues keyed by due tick, sounds heard per tick)."""
+        workout.start()
+        scheduled, heard = {}, {}
+        tick = 0
+        while workout.state != WorkoutState.FINISHED:
+            event = workout.tick()
+            if event.sound_name:
+                heard[tick] = (event.cue_key, event.sound_name, event.sound_count)
+            for cue in workout.upcoming_cues():
+                scheduled.setdefault(cue.key, (tick + cue.offset, cue.sound_name, cue.sound_count))
+            tick += 1
+        return scheduled, heard
+
+    def test_boundaries_match_ticks(self):
+        scheduled, heard = self._run(Workout(total_rounds=3, work_duration=30, rest_duration=10))
+        for tick, (key, sound, count) in heard.items():
+            self.assertEqual(scheduled[key], (tick, sound, count))
+        self.assertEqual(scheduled["3:WORK:end"][1:], ("Glass", 3))
+        self.assertEqual(scheduled["2:WORK:end"][1:], ("Hero", 1))
+
+    def test_boundaries_match_ticks_for_every_layout(self):
+        for workout in (Workout(total_rounds=2, work_duration=5, rest_duration=0),
+                        Workout(total_rounds=4, work_duration=5, rest_duration=0, rest_increment=3, rest_start_round=2)):
+            scheduled, heard = self._run(workout)
+            for tick, (key, sound, count) in heard.items():
+                self.assertEqual(scheduled[key], (tick, sound, count))
+
+    def test_countdown_and_halfway(self):
+        scheduled, heard = self._run(Workout(total_rounds=1, work_duration=30, rest_duration=0))
+        end = scheduled["1:WORK:end"][0]
+        self.assertEqual([scheduled[f"1:WORK:count{n}"][0] for n in (3, 2, 1)], [end - 3, end - 2, end - 1])
+        self.assertEqual(scheduled["1:WORK:halfway"][0], end - 15)
+
+    def test_auto_regulated_rest_not_prescheduled(self):
+        workout = Workout(total_rounds=2, work_duration=10, rest_duration=10, max_prework_hr=120, auto_regulation=True)
+        scheduled, heard = self._run(workout)
+        self.assertNotIn("1:REST:end", scheduled)
+        self.assertIn("1:REST:count1", scheduled)
+
+    def test_horizon_and_paused(self):
+        workout = Workout(total_rounds=1, work_duration=60, rest_duration=0)
+        workout.start()
+        workout.tick()
+        self.assertEqual([c.key for c in workout.upcoming_cues(horizon=5)], [])
+        self.assertEqual(len(workout.upcoming_cues()), 4) # Countdown and "go"
+        workout.pause()
+        self.assertEqual(workout.upcoming_cues(), [])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,186 @@
+import os
+import json
+import math
+import datetime
+import storage
+
+# Training load from heart rate.
+# Each session gets a Banister TRIMP (training impulse) from its HR stream,
+# saved in the history row. Per profile, acute (7-day) and chronic (28-day)
+# exponentially weighted loads are folded forward one session at a time on
+# every save, so the acute:chronic workload ratio (ACWR) is read from a tiny
+# state file and never recomputed from raw history.
+#
+# training_load.json layout:
+#   {"source_size": <history bytes>, "day": <ordinal of last folded day>,
+#    "acute": <EWMA>, "chronic": <EWMA>}
+
+# Banister weighting, y = 0.64 * e^(1.92 * x) (the commonly used male coefficients)
+TRIMP_K = 0.64
+TRIMP_B = 1.92
+
+# Profiles don't record a resting HR. The closest we have is max_prework_hr,
+# the "recovered" HR work resumes at; without it, a typical resting HR.
+DEFAULT_REST_HR = 60
+
+MAX_SAMPLE_GAP = 30.0 # seconds; a longer gap (sensor dropout) counts as this long
+
+ACUTE_DAYS = 7
+CHRONIC_DAYS = 28
+ACUTE_LAMBDA = 2 / (ACUTE_DAYS + 1)
+CHRONIC_LAMBDA = 2 / (CHRONIC_DAYS + 1)
+
+def hr_range(profile_name):
+    """(max_hr, baseline_hr) for a profile from profiles.json, or None without a max HR."""
+    details = storage.get_profile_details(profile_name)
+    try:
+        max_hr = int(details.get("max_hr"))
+    except (TypeError, ValueError):
+        return None
+    try:
+        rest_hr = int(details.get("max_prework_hr"))
+    except (TypeError, ValueError):
+        rest_hr = DEFAULT_REST_HR
+    if rest_hr >= max_hr:
+        rest_hr = DEFAULT_REST_HR
+    return max_hr, rest_hr
+
+def impulse(bpm, seconds, max_hr, rest_hr):
+    """TRIMP for `seconds` spent at `bpm`."""
+    if max_hr <= rest_hr:
+        return 0.0
+    reserve = min(max((bpm - rest_hr) / (max_hr - rest_hr), 0.0), 1.0)
+    return seconds / 60.0 * reserve * TRIMP_K * math.exp(TRIMP_B * reserve)
+
+class TrimpAccumulator:
+    """Running TRIMP for one session, O(1) per HR sample.
+
+    Each sample's HR is held until the next sample arrives; call `pause()`
+    when the clock stops so the paused time isn't counted.
+    """
+
+    def __init__(self, max_hr, rest_hr=DEFAULT_REST_HR):
+        self.max_hr = max_hr
+        self.rest_hr = rest_hr
+        self.total = 0.0
+        self.last = None # (time_sec, bpm)
+
+    def add(self, time_sec, bpm):
+        if self.last is not None:
+            last_time, last_bpm = self.last
+            seconds = min(time_sec - last_time, MAX_SAMPLE_GAP)
+            if seconds > 0:
+                self.total += impulse(last_bpm, seconds, self.max_hr, self.rest_hr)
+        self.last = (time_sec, bpm)
+
+    def pause(self):
+        self.last = None
+
+def session_trimp(samples, max_hr, rest_hr=DEFAULT_REST_HR):
+    """TRIMP for a whole trace of (offset_sec, bpm) samples."""
+    acc = TrimpAccumulator(max_hr, rest_hr)
+    for t, bpm in samples:
+        acc.add(t, bpm)
+    return acc.total
+
+# --- Acute / chronic load ---
+
+def _state_path(profile_name):
+    return os.path.join(storage.get_cache_dir(profile_name), "training_load.json")
+
+def _read(profile_name):
+    try:
+        with open(_state_path(profile_name), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write(profile_name, state):
+    path = _state_path(profile_name)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+def _session(record):
+    """(day ordinal, trimp) for a history record; None if undated."""
+    try:
+        day = datetime.datetime.fromisoformat(record["start_time"]).toordinal()
+    except (ValueError, KeyError, TypeError):
+        return None
+    try:
+        trimp = float(record.get("trimp") or 0)
+    except ValueError:
+        trimp = 0.0
+    return day, trimp
+
+def _fold(state, day, load):
+    """Adds one session's load on `day`. Returns False if `day` is before the last folded day."""
+    if state["day"] is None:
+        state["day"] = day
+    elif day < state["day"]:
+        return False
+    elif day > state["day"]:
+        # ewma_d = lambda * load_d + (1 - lambda) * ewma_(d-1), with no load on the gap days
+        gap = day - state["day"]
+        state["acute"] *= (1 - ACUTE_LAMBDA) ** gap
+        state["chronic"] *= (1 - CHRONIC_LAMBDA) ** gap
+        state["day"] = day
+    # Same day: the update is linear, so extra load just adds lambda * load
+    state["acute"] += ACUTE_LAMBDA * load
+    state["chronic"] += CHRONIC_LAMBDA * load
+    return True
+
+def rebuild(profile_name="Default", save=True):
+    """Recomputes the load state from the full history (sessions in date order); saved unless save=False."""
+    daily = {}
+    for record in storage.iter_history(profile_name):
+        session = _session(record)
+        if session:
+            daily[session[0]] = daily.get(session[0], 0.0) + session[1]
+
+    state = {"source_size": 0, "day": None, "acute": 0.0, "chronic": 0.0}
+    for day in sorted(daily):
+        _fold(state, day, daily[day])
+    state["source_size"] = storage.get_history_size(profile_name)
+    if save:
+        _write(profile_name, state)
+    return state
+
+def is_current(profile_name="Default"):
+    state = _read(profile_name)
+    return state is not None and state.get("source_size") == storage.get_history_size(profile_name)
+
+def append(profile_name, record, prev_source_size):
+    """Folds a freshly saved session in; rebuilds if out of step or the session is back-dated."""
+    state = _read(profile_name)
+    session = _session(record)
+    if state is None or state.get("source_size") != prev_source_size:
+        rebuild(profile_name)
+        return
+    if session and not _fold(state, *session):
+        rebuild(profile_name)
+        return
+
+    state["source_size"] = storage.get_history_size(profile_name)
+    _write(profile_name, state)
+
+def current(profile_name="Default", today=None):
+    """{"acute", "chronic", "ratio"} as of `today` (ratio is None until there is chronic load)."""
+    state = _read(profile_name)
+    if state is None or state.get("source_size") != storage.get_history_size(profile_name):
+        state = rebuild(profile_name, save=False) # The HistoryWriter thread persists it
+
+    acute, chronic = state["acute"], state["chronic"]
+    day = (today or datetime.date.today()).toordinal()
+    if state["day"] is not None and day > state["day"]:
+        gap = day - state["day"]
+        acute *= (1 - ACUTE_LAMBDA) ** gap
+        chronic *= (1 - CHRONIC_LAMBDA) ** gap
+    return {"acute": acute, "chronic": chronic, "ratio": acute / chronic if chronic > 0 else None}
+
+def summary(profile_name="Default", today=None):
+    """One-line ACWR text for the History tab ("" before any HR-tracked session)."""
+    load = current(profile_name, today)
+    if load["ratio"] is None:
+        return ""
+    return f"ACWR: {load['ratio']:.2f} (acute {load['acute']:.0f} / chronic {load['chronic']:.0f})"
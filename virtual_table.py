@@ -0,0 +1,160 @@
+import customtkinter as ctk
+
+# --- Colors ---
+CARD_COLOR = "#1C1C1E"
+TEXT_COLOR = "#FFFFFF"
+TEXT_SECONDARY = "#8E8E93"
+
+class VirtualTable(ctk.CTkFrame):
+    """Scrollable table that only builds widgets for the rows on screen.
+
+    A fixed pool of row widgets (visible rows plus `overscan`) is placed inside
+    a clipping frame and re-labelled as the view scrolls, so building and
+    scrolling cost the same for 20 sessions or 20,000.
+    """
+
+    def __init__(self, master, columns, row_height=30, overscan=2,
+                 empty_text="No rows.", **kwargs):
+        super().__init__(master, **kwargs)
+        self.columns = columns # [(key, title), ...]; rows hold display-ready values
+        self.row_height = row_height
+        self.overscan = overscan
+        self.empty_text = empty_text
+
+        self.rows = []
+        self.offset = 0 # Scroll position in pixels
+        self.pool = [] # [(row_frame, [label, ...]), ...]
+        self.pool_texts = [] # Last text set on each pooled label, to skip no-op configures
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+
+        # Header
+        header = ctk.CTkFrame(self, fg_color="transparent")
+        header.grid(row=0, column=0, sticky="ew", padx=(10, 0), pady=(10, 0))
+        self._configure_columns(header)
+        for i, (_, title) in enumerate(columns):
+            lbl = ctk.CTkLabel(header, text=title, font=("Arial", 13, "bold"), text_color=TEXT_SECONDARY)
+            lbl.grid(row=0, column=i, padx=15, pady=5, sticky="ew")
+
+        # Body: rows are place()d inside, the frame clips them
+        self.body = ctk.CTkFrame(self, fg_color="transparent")
+        self.body.grid(row=1, column=0, sticky="nsew", padx=(10, 0), pady=(0, 10))
+        self.body.bind("<Configure>", self._on_resize)
+
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.grid(row=1, column=1, sticky="ns", pady=(0, 10))
+
+        self.lbl_empty = ctk.CTkLabel(self.body, text=empty_text, font=("Arial", 16))
+
+        self._bind_wheel(self.body)
+
+    def _configure_columns(self, frame):
+        for i in range(len(self.columns)):
+            frame.grid_columnconfigure(i, weight=1, uniform="col")
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", lambda e: self.scroll_by(-3 * self.row_height)) # Linux
+        widget.bind("<Button-5>", lambda e: self.scroll_by(3 * self.row_height))
+
+    # --- Data ---
+
+    def set_rows(self, rows, empty_text=None):
+        """Replaces all rows (list of dicts keyed by column) and scrolls to the top."""
+        self.rows = list(rows)
+        if empty_text is not None:
+            self.empty_text = empty_text
+        self.offset = 0
+        self._render()
+
+    def append_row(self, row):
+        """Adds one row at the end; only the visible window is redrawn."""
+        self.rows.append(row)
+        self._render()
+
+    # --- Scrolling ---
+
+    def _view_height(self):
+        # winfo sizes are in screen pixels; row geometry is in unscaled units like place()
+        return int(self.body.winfo_height() / self._get_widget_scaling())
+
+    def _max_offset(self):
+        return max(0, len(self.rows) * self.row_height - self._view_height())
+
+    def scroll_by(self, pixels):
+        self.scroll_to(self.offset + pixels)
+
+    def scroll_to(self, offset):
+        offset = int(min(max(0, offset), self._max_offset()))
+        if offset != self.offset:
+            self.offset = offset
+            self._render()
+
+    def _on_wheel(self, event):
+        # Windows reports multiples of 120, macOS small deltas
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_by(-steps * self.row_height)
+
+    def _on_scrollbar(self, *args):
+        total = len(self.rows) * self.row_height
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * total)
+        elif args[0] == "scroll":
+            unit = self._view_height() if args[2] == "pages" else self.row_height
+            self.scroll_by(int(args[1]) * unit)
+
+    # --- Rendering ---
+
+    def _on_resize(self, event=None):
+        needed = self._view_height() // self.row_height + 1 + self.overscan
+        while len(self.pool) < needed:
+            self._add_pool_row()
+        self.offset = min(self.offset, self._max_offset())
+        self._render()
+
+    def _add_pool_row(self):
+        frame = ctk.CTkFrame(self.body, fg_color="transparent", height=self.row_height, corner_radius=0)
+        frame.grid_propagate(False) # Keep the fixed row height whatever the labels want
+        frame.grid_rowconfigure(0, weight=1)
+        self._configure_columns(frame)
+        labels = []
+        for i in range(len(self.columns)):
+            lbl = ctk.CTkLabel(frame, text="", font=("Arial", 12), text_color=TEXT_COLOR, height=self.row_height - 4)
+            lbl.grid(row=0, column=i, padx=15, sticky="ew")
+            self._bind_wheel(lbl)
+            labels.append(lbl)
+        self._bind_wheel(frame)
+        self.pool.append((frame, labels))
+        self.pool_texts.append([None] * len(labels))
+
+    def _render(self):
+        if not self.rows:
+            for frame, _ in self.pool:
+                frame.place_forget()
+            self.lbl_empty.configure(text=self.empty_text)
+            self.lbl_empty.place(relx=0.5, y=20, anchor="n")
+            self.scrollbar.set(0, 1)
+            return
+        self.lbl_empty.place_forget()
+
+        first = self.offset // self.row_height
+        shift = self.offset % self.row_height
+        for i, (frame, labels) in enumerate(self.pool):
+            idx = first + i
+            if idx >= len(self.rows):
+                frame.place_forget()
+                continue
+
+            row = self.rows[idx]
+            texts = self.pool_texts[i]
+            for c, (key, _) in enumerate(self.columns):
+                text = str(row.get(key, ""))
+                if texts[c] != text:
+                    labels[c].configure(text=text)
+                    texts[c] = text
+            frame.place(x=0, y=i * self.row_height - shift, relwidth=1.0)
+
+        total = len(self.rows) * self.row_height
+        view = self._view_height()
+        self.scrollbar.set(self.offset / total, min(1.0, (self.offset + view) / total))
@@ -15,6 +15,26 @@ class WorkoutEvent:
     sound_count: int = 0
     phase_changed: bool = False
     finished: bool = False
+    cue_key: str = None # Same key as the pre-scheduled Cue for this boundary, if any
+
+@dataclass
+class Cue:
+    """A sound due `offset` seconds after the current tick."""
+    key: str # Unique per cue in a session, so re-scheduling every tick doesn't repeat it
+    offset: float
+    sound_name: str
+    sound_count: int = 1
+
+PREP_SECONDS = 10
+COUNTDOWN_SECONDS = 3 # Beeps in the last seconds of each phase
+HALFWAY_MIN_WORK = 20 # Work phases at least this long get a halfway cue
+
+# Sound played as a phase ends, by the phase it leads to
+BOUNDARY_SOUNDS = {
+    WorkoutState.WORK: ("Glass", 2), # Round start
+    WorkoutState.REST: ("Hero", 1),
+    WorkoutState.FINISHED: ("Glass", 3),
+}
 
 class Workout:
     def __init__(self, total_rounds: int, work_duration: int, rest_duration: int,
@@ -39,10 +59,42 @@ class Workout:
         self.state = WorkoutState.IDLE
         self.previous_state = None # To handle pause resume
         
+    def config(self) -> dict:
+        """Constructor arguments, so the same workout can be rebuilt (e.g. after a crash)."""
+        return {
+            "total_rounds": self.total_rounds,
+            "work_duration": self.work_duration,
+            "rest_duration": self.rest_duration,
+            "rest_increment": self.rest_increment,
+            "rest_interval": self.rest_interval,
+            "rest_start_round": self.rest_start_round,
+            "max_prework_hr": self.max_prework_hr,
+            "auto_regulation": self.auto_regulation,
+        }
+
+    def snapshot(self) -> dict:
+        """Current progress as plain values (JSON-safe)."""
+        return {
+            "state": self.state.name,
+            "previous_state": self.previous_state.name if self.previous_state else None,
+            "current_round": self.current_round,
+            "time_left": self.time_left,
+            "waiting_for_hr": self.waiting_for_hr,
+        }
+
+    def restore(self, snapshot: dict):
+        """Puts the workout back to a state captured by snapshot()."""
+        self.state = WorkoutState[snapshot["state"]]
+        prev = snapshot.get("previous_state")
+        self.previous_state = WorkoutState[prev] if prev else None
+        self.current_round = snapshot["current_round"]
+        self.time_left = snapshot["time_left"]
+        self.waiting_for_hr = snapshot.get("waiting_for_hr", False)
+
     def start(self):
         self.state = WorkoutState.PREP
         self.current_round = 0
-        self.time_left = 10 # Prep time
+        self.time_left = PREP_SECONDS
         
     def pause(self):
         if self.state != WorkoutState.PAUSED:
@@ -67,28 +119,13 @@ class Workout:
             self.time_left -= 1
         else:
             # Time is up, transition needed
+            event.cue_key = self._cue_key("end")
             self._handle_transition(event, current_hr)
             
         return event
 
     def _handle_transition(self, event: WorkoutEvent, current_hr: int = None):
-        if self.state == WorkoutState.PREP:
-            self._start_round(event)
-            
-        elif self.state == WorkoutState.WORK:
-            # Check if we should rest (always rest unless last round finished logic handled else where)
-            if self._calculate_rest_duration() > 0 and self.current_round < self.total_rounds: 
-                 if self.current_round < self.total_rounds:
-                     self._start_rest(event)
-                 else:
-                    self._finish(event)
-            else:
-                if self.current_round < self.total_rounds:
-                    self._start_round(event) # Next round immediately
-                else:
-                    self._finish(event)
-                    
-        elif self.state == WorkoutState.REST:
+        if self.state == WorkoutState.REST:
             # Check Auto-Regulation before starting next round
             if self.auto_regulation and self.max_prework_hr and current_hr is not None:
                 if current_hr > self.max_prework_hr:
@@ -97,12 +134,63 @@ class Workout:
                     return # Do not transition
             
             self.waiting_for_hr = False
-            
-            if self.current_round < self.total_rounds:
-                self._start_round(event)
-            else:
-                self._finish(event) # Should not really happen if logic above is correct
+
+        event.sound_name, event.sound_count = self._boundary_sound()
+        next_state = self._next_state()
+        if next_state == WorkoutState.WORK:
+            self._start_round(event)
+        elif next_state == WorkoutState.REST:
+            self._start_rest(event)
+        else:
+            self._finish(event)
+
+    def _next_state(self):
+        """Phase the current one hands over to (ignoring an auto-regulation hold)."""
+        if self.state == WorkoutState.PREP:
+            return WorkoutState.WORK
+        if self.current_round >= self.total_rounds:
+            return WorkoutState.FINISHED
+        if self.state == WorkoutState.WORK and self._calculate_rest_duration() > 0:
+            return WorkoutState.REST
+        return WorkoutState.WORK # Next round, straight after work when there's no rest
+
+    def _boundary_sound(self):
+        """(sound_name, count) for the end of the current phase; shared by tick() and upcoming_cues()."""
+        return BOUNDARY_SOUNDS[self._next_state()]
                 
+    def upcoming_cues(self, horizon=None):
+        """Cues still due in the current phase, as of the tick that just ran.
+
+        The phase ends `time_left` seconds after that tick. Covers the countdown
+        beeps, the halfway cue during work and the sound of the boundary itself,
+        unless auto-regulation may hold the rest open (then it comes from tick).
+        """
+        if self.state not in (WorkoutState.PREP, WorkoutState.WORK, WorkoutState.REST) or self.waiting_for_hr:
+            return []
+
+        boundary = self._boundary_sound()
+        if self.state == WorkoutState.PREP:
+            length = PREP_SECONDS
+        elif self.state == WorkoutState.WORK:
+            length = self.work_duration
+        else:
+            length = self._calculate_rest_duration()
+            if self.auto_regulation and self.max_prework_hr:
+                boundary = None # May be held open; the tick plays it
+
+        end = self.time_left
+        cues = []
+        if self.state == WorkoutState.WORK and length >= HALFWAY_MIN_WORK:
+            cues.append(Cue(self._cue_key("halfway"), end - length / 2, "Halfway"))
+        for n in range(min(COUNTDOWN_SECONDS, length - 1), 0, -1):
+            cues.append(Cue(self._cue_key(f"count{n}"), end - n, "Beep"))
+        if boundary:
+            cues.append(Cue(self._cue_key("end"), end, *boundary))
+        return [c for c in cues if c.offset >= 0 and (horizon is None or c.offset <= horizon)]
+
+    def _cue_key(self, kind):
+        return f"{self.current_round}:{self.state.name}:{kind}"
+
     def _start_round(self, event: WorkoutEvent):
         if self.state == WorkoutState.PREP:
              self.current_round = 1 # First round
@@ -116,8 +204,6 @@ class Workout:
         self.time_left = self.work_duration
         
         event.phase_changed = True
-        event.sound_name = "Glass"
-        event.sound_count = 2 # 2x Glass for Round Start
 
     def _calculate_rest_duration(self):
         """Calculates dynamic rest duration based on incremental settings."""
@@ -148,16 +234,12 @@ class Workout:
         self.time_left = self._calculate_rest_duration()
         
         event.phase_changed = True
-        event.sound_name = "Hero"
-        event.sound_count = 1
         
     def _finish(self, event: WorkoutEvent):
         self.state = WorkoutState.FINISHED
         self.time_left = 0
         
         event.finished = True
-        event.sound_name = "Glass"
-        event.sound_count = 3
 
     @property
     def status_text(self):